@@ -0,0 +1,151 @@
+import datetime
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import App.logic as logic
+from App import rw_lock as rw
+from DataStructures.List import array_list as al
+
+
+OFFENSES = ["Larceny", "Robbery", "Vandalism", "Towed"]
+
+# Numero de fechas distintas de los crimenes de prueba
+DAYS = 720
+
+
+def new_crime(i):
+    day = datetime.date(2018, 1, 1) + datetime.timedelta(days=(i * 7) % DAYS)
+    return {"OCCURRED_ON_DATE": day.isoformat() + " 10:00:00",
+            "OFFENSE_CODE_GROUP": OFFENSES[i % len(OFFENSES)]}
+
+
+def test_rw_lock():
+    lock = rw.new_lock()
+    events = []
+
+    rw.acquire_read(lock)
+    rw.acquire_read(lock)
+    assert lock["readers"] == 2
+
+    def write():
+        with rw.writing(lock):
+            events.append("write")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    writer.join(0.05)
+    # El escritor espera a que terminen los lectores
+    assert events == [] and lock["waiting_writers"] == 1
+    rw.release_read(lock)
+    rw.release_read(lock)
+    writer.join()
+    assert events == ["write"]
+    assert lock["readers"] == 0 and not lock["writer"]
+
+
+def check_queries_during_ingest(index_type):
+    analyzer = logic.new_logic(index_type, concurrent=True)
+    total = 3000
+    done = threading.Event()
+
+    def load():
+        for i in range(total):
+            logic.add_crime(analyzer, new_crime(i))
+        done.set()
+
+    def query(worker):
+        seen = 0
+        checks = 0
+        while not done.is_set() or checks == 0:
+            count = logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                              "2019-12-31")
+            # Nunca se ve el indice a medio actualizar ni se pierden datos
+            assert count >= seen
+            seen = count
+            by_code = logic.get_crimes_by_range_code(analyzer, "2018-01-08",
+                                                     OFFENSES[worker % 4])
+            assert by_code >= 0
+            first = logic.get_first_crimes(analyzer, "2018-01-01", 20)
+            dates = [al.get_element(first, i)["OCCURRED_ON_DATE"]
+                     for i in range(al.size(first))]
+            assert dates == sorted(dates)
+            assert logic.index_size(analyzer) <= DAYS
+            checks += 1
+        return checks
+
+    loader = threading.Thread(target=load)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loader.start()
+        results = list(executor.map(query, range(4)))
+    loader.join()
+
+    assert all(checks > 0 for checks in results)
+    assert logic.crimes_size(analyzer) == total
+    assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                     "2019-12-31") == total
+    assert logic.index_size(analyzer) == DAYS
+
+
+def test_queries_during_ingest():
+    # Las consultas de todos los indices son de solo lectura. Se cambia de
+    # hilo mas seguido para que las consultas se mezclen con la carga
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for index_type in ["RBT", "BST", "PERSISTENT", "SORTED_ARRAY"]:
+            check_queries_during_ingest(index_type)
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_queries_during_load_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(logic, "data_dir", str(tmp_path) + "/")
+    # Bloques pequeños para que la carga tenga muchos bloques
+    monkeypatch.setattr(logic, "_load_batch_size", 64)
+    total = 3000
+    lines = ["OFFENSE_CODE_GROUP,OCCURRED_ON_DATE\n"]
+    for i in range(total):
+        crime = new_crime(i)
+        lines.append("%s,%s\n" % (crime["OFFENSE_CODE_GROUP"],
+                                  crime["OCCURRED_ON_DATE"]))
+    (tmp_path / "crimes.csv").write_text("".join(lines))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for index_type in ["RBT", "SORTED_ARRAY"]:
+            analyzer = logic.new_logic(index_type, concurrent=True)
+            started = threading.Event()
+            done = threading.Event()
+
+            def load():
+                started.wait()
+                logic.load_data(analyzer, "crimes.csv")
+                done.set()
+
+            def query(worker):
+                checks = 0
+                while not done.is_set() or checks == 0:
+                    started.set()
+                    stored = logic.crimes_size(analyzer)
+                    count = logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                                      "2019-12-31")
+                    # Los crimenes guardados ya estan en el indice
+                    assert count >= stored
+                    assert count in (0, total)
+                    checks += 1
+                return checks
+
+            loader = threading.Thread(target=load)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                loader.start()
+                results = list(executor.map(query, range(4)))
+            loader.join()
+
+            assert all(checks > 0 for checks in results)
+            assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                             "2019-12-31") == total
+            assert logic.index_size(analyzer) == DAYS
+    finally:
+        sys.setswitchinterval(interval)
@@ -0,0 +1,263 @@
+import pytest
+
+from App import crime_store as cs
+
+
+FIELDS = ["INCIDENT_NUMBER", "OFFENSE_CODE_GROUP", "DISTRICT"]
+
+OFFENSES = ["Larceny", "Robbery", "Vandalism", "Towed"]
+
+
+def new_row(i):
+    return {"INCIDENT_NUMBER": "I%06d" % i,
+            "OFFENSE_CODE_GROUP": OFFENSES[i % len(OFFENSES)],
+            "DISTRICT": "D%d" % (i % 7)}
+
+
+def odd_row(i):
+    # Filas como las que produce csv.DictReader con campos de menos (None)
+    # o de mas (lista con la llave None)
+    row = new_row(i)
+    if i % 5 == 0:
+        row["DISTRICT"] = None
+    if i % 11 == 3:
+        row[None] = ["extra", str(i)]
+    return row
+
+
+def test_add_row_add_rows():
+    rows = [odd_row(i) for i in range(3000)]
+    single = cs.new_store()
+    for row in rows:
+        assert cs.add_row(single, row) == cs.size(single) - 1
+    bulk = cs.new_store()
+    start = 0
+    for chunk in (1, 500, 1023, 1476):
+        assert cs.add_rows(bulk, rows[start:start + chunk]) == start
+        start += chunk
+    assert cs.add_rows(bulk, []) == 3000
+
+    assert cs.size(single) == cs.size(bulk) == 3000
+    assert cs.fieldnames(single) == cs.fieldnames(bulk) == FIELDS
+    assert single["field_index"] == bulk["field_index"] == \
+        {field: i for i, field in enumerate(FIELDS)}
+    for i in range(3000):
+        assert cs.get_row(single, i) == rows[i]
+        assert cs.get_row(bulk, i) == rows[i]
+    for column, other in zip(single["columns"], bulk["columns"]):
+        assert column["kind"] == other["kind"]
+        assert column["others"] == other["others"]
+    assert single["extras"] == bulk["extras"]
+
+
+def test_text_columns():
+    rows = cs.CHECK_EVERY * (cs.MIN_DISTINCT // cs.CHECK_EVERY + 1)
+    for add in ("row", "rows"):
+        store = cs.new_store(FIELDS)
+        if add == "row":
+            for i in range(rows):
+                cs.add_row(store, odd_row(i))
+        else:
+            cs.add_rows(store, [odd_row(i) for i in range(rows)])
+        # Solo la columna con muchos valores distintos se convierte
+        kinds = [column["kind"] for column in store["columns"]]
+        assert kinds == ["text", "dict", "dict"]
+        text = store["columns"][0]
+        assert text["offsets"].typecode == "H"
+
+        # Valores largos hacen crecer el arreglo de posiciones
+        long_rows = []
+        for i in range(rows, rows + 70):
+            row = odd_row(i)
+            row["INCIDENT_NUMBER"] = str(i) * 200
+            long_rows.append(row)
+        if add == "row":
+            for row in long_rows:
+                cs.add_row(store, row)
+        else:
+            cs.add_rows(store, long_rows)
+        text = store["columns"][0]
+        assert text["kind"] == "text"
+        assert text["offsets"].typecode == "I"
+        for i in range(rows):
+            assert cs.get_row(store, i) == odd_row(i)
+        for i, row in enumerate(long_rows):
+            assert cs.get_row(store, rows + i) == row
+            assert cs.get_value(store, rows + i, "INCIDENT_NUMBER") == \
+                row["INCIDENT_NUMBER"]
+
+
+def test_dict_codes_widen():
+    # Codigos de 1 byte hasta 256 valores distintos
+    single = cs.new_store(["ID"])
+    for i in range(256):
+        cs.add_row(single, {"ID": str(i)})
+    bulk = cs.new_store(["ID"])
+    cs.add_rows(bulk, [{"ID": str(i)} for i in range(256)])
+    for store in (single, bulk):
+        assert store["columns"][0]["codes"].typecode == "B"
+    cs.add_row(single, {"ID": "256"})
+    cs.add_rows(bulk, [{"ID": "256"}, {"ID": "0"}])
+    for store in (single, bulk):
+        column = store["columns"][0]
+        assert column["kind"] == "dict"
+        assert column["codes"].typecode == "H"
+        for i in (0, 255, 256):
+            assert cs.get_value(store, i, "ID") == str(i)
+    assert cs.get_value(bulk, 257, "ID") == "0"
+
+
+def test_others_and_extras():
+    store = cs.new_store()
+    cs.add_row(store, new_row(0))
+    cs.add_row(store, {"INCIDENT_NUMBER": "I1",
+                       "OFFENSE_CODE_GROUP": None,
+                       "DISTRICT": None})
+    cs.add_rows(store, [new_row(2),
+                        {"INCIDENT_NUMBER": "I3",
+                         "OFFENSE_CODE_GROUP": "Towed",
+                         "DISTRICT": "B2",
+                         None: ["x", "y"]}])
+    # Una fila sin un campo lo guarda como None
+    cs.add_row(store, {"INCIDENT_NUMBER": "I4"})
+
+    assert cs.get_row(store, 1) == {"INCIDENT_NUMBER": "I1",
+                                    "OFFENSE_CODE_GROUP": None,
+                                    "DISTRICT": None}
+    assert cs.get_value(store, 1, "DISTRICT") is None
+    assert cs.get_row(store, 3)[None] == ["x", "y"]
+    assert cs.get_value(store, 3, None) == ["x", "y"]
+    assert cs.get_row(store, 4) == {"INCIDENT_NUMBER": "I4",
+                                    "OFFENSE_CODE_GROUP": None,
+                                    "DISTRICT": None}
+    # El valor vacio y None son distintos
+    cs.add_row(store, {"INCIDENT_NUMBER": "",
+                       "OFFENSE_CODE_GROUP": "",
+                       "DISTRICT": ""})
+    assert cs.get_row(store, 5) == {"INCIDENT_NUMBER": "",
+                                    "OFFENSE_CODE_GROUP": "",
+                                    "DISTRICT": ""}
+    with pytest.raises(KeyError):
+        cs.get_value(store, 0, "Location")
+
+
+def test_delete_row():
+    store = cs.new_store()
+    cs.add_rows(store, [odd_row(i) for i in range(12)])
+    assert cs.count(store) == 12
+
+    assert cs.delete_row(store, 0)
+    assert not cs.delete_row(store, 0)
+    assert cs.is_deleted(store, 0)
+    assert not cs.is_deleted(store, 1)
+    assert cs.size(store) == 12
+    assert cs.count(store) == 11
+    # Se liberan los valores guardados aparte
+    assert 3 in store["extras"]
+    assert cs.delete_row(store, 3)
+    assert 3 not in store["extras"]
+    assert 0 not in store["columns"][2]["others"]
+    assert 5 in store["columns"][2]["others"]
+
+    with pytest.raises(IndexError):
+        cs.get_row(store, 0)
+    with pytest.raises(IndexError):
+        cs.get_value(store, 0, "DISTRICT")
+    with pytest.raises(IndexError):
+        cs.get_row(store, 12)
+    with pytest.raises(IndexError):
+        cs.delete_row(store, 12)
+
+    # Las filas siguientes conservan su identificador
+    assert cs.add_row(store, new_row(12)) == 12
+    assert cs.get_row(store, 11) == odd_row(11)
+    assert cs.delete_row(store, 12)
+    assert cs.count(store) == 10
+
+
+def test_compact():
+    rows = cs.CHECK_EVERY * (cs.MIN_DISTINCT // cs.CHECK_EVERY + 1)
+    store = cs.new_store()
+    cs.add_rows(store, [odd_row(i) for i in range(rows)])
+    assert store["columns"][0]["kind"] == "text"
+    # Filas con valores que solo ellas usan en una columna por diccionario
+    for i in range(rows, rows + 10):
+        row = new_row(i)
+        row["DISTRICT"] = "old" + str(i)
+        cs.add_row(store, row)
+    cs.add_rows(store, [odd_row(i) for i in range(rows + 10, rows + 100)])
+    total = rows + 100
+
+    # Pocas filas eliminadas al inicio no se compactan
+    for row_id in range(10):
+        cs.delete_row(store, row_id)
+    assert cs.compact(store) == 0
+    assert cs.stored(store) == total
+
+    # La fila rows + 20 no se elimina: las siguientes no se pueden liberar
+    for row_id in range(10, rows + 50):
+        if row_id != rows + 20:
+            cs.delete_row(store, row_id)
+    assert cs.compact(store) == rows + 20
+    assert cs.stored(store) == 80
+    assert cs.size(store) == total
+    assert cs.count(store) == 51
+    assert len(store["columns"][0]["offsets"]) == 81
+    assert len(store["columns"][0]["data"]) == 7 * 80
+    district = store["columns"][2]
+    assert len(district["codes"]) == 80
+    assert not any(value.startswith("old") for value in district["values"])
+
+    # Los row_id no cambian
+    assert cs.get_row(store, rows + 20) == odd_row(rows + 20)
+    for row_id in range(rows + 50, total):
+        assert cs.get_row(store, row_id) == odd_row(row_id)
+        assert cs.get_value(store, row_id, "INCIDENT_NUMBER") == \
+            "I%06d" % row_id
+    for row_id in (0, rows + 19, rows + 21):
+        assert cs.is_deleted(store, row_id)
+        with pytest.raises(IndexError):
+            cs.get_row(store, row_id)
+        assert not cs.delete_row(store, row_id)
+    assert cs.add_row(store, new_row(total)) == total
+    assert cs.get_row(store, total) == new_row(total)
+
+    # Con ratio 0 se libera cualquier prefijo eliminado
+    assert cs.delete_row(store, rows + 20)
+    assert cs.compact(store, 0) == 30
+    assert cs.stored(store) == 51
+    assert cs.count(store) == 51
+    assert cs.get_row(store, rows + 50) == odd_row(rows + 50)
+
+
+def test_export_import():
+    rows = cs.CHECK_EVERY * (cs.MIN_DISTINCT // cs.CHECK_EVERY + 1)
+    store = cs.new_store()
+    cs.add_rows(store, [odd_row(i) for i in range(rows)])
+    for row_id in range(0, rows, 2):
+        cs.delete_row(store, row_id)
+    cs.delete_row(store, 1)
+    cs.compact(store, 0)
+    meta, sections = cs.export_store(store)
+    copy = cs.import_store(meta, sections)
+    assert [column["kind"] for column in copy["columns"]] == \
+        ["text", "dict", "dict"]
+    assert (cs.size(copy), cs.stored(copy), cs.count(copy)) == \
+        (cs.size(store), cs.stored(store), cs.count(store))
+    for row_id in range(rows):
+        if cs.is_deleted(store, row_id):
+            assert cs.is_deleted(copy, row_id)
+        else:
+            assert cs.get_row(copy, row_id) == odd_row(row_id)
+
+    # Los arreglos deben tener el numero de filas de la descripcion
+    meta["size"] += 1
+    with pytest.raises(ValueError):
+        cs.import_store(meta, sections)
+
+    # El almacenamiento creado usa los arreglos y sigue recibiendo filas
+    assert cs.add_row(copy, new_row(rows)) == rows
+    assert cs.get_row(copy, rows) == new_row(rows)
+
+    empty = cs.new_store()
+    assert cs.size(cs.import_store(*cs.export_store(empty))) == 0
@@ -0,0 +1,409 @@
+import datetime
+import os
+import threading
+
+import pytest
+
+import App.logic as logic
+from App import crime_store as cs
+
+
+OFFENSES = ["Larceny", "Robbery", "Vandalism", "Towed"]
+
+INDEX_TYPES = ["RBT", "BST", "PERSISTENT", "SORTED_ARRAY"]
+
+
+def new_crime(day, i):
+    date = datetime.date(2018, 1, 1) + datetime.timedelta(days=day)
+    return {"OCCURRED_ON_DATE": date.isoformat() + " %02d:00:00" % i,
+            "OFFENSE_CODE_GROUP": OFFENSES[i % len(OFFENSES)]}
+
+
+def setup_analyzer(index_type="RBT", days=30, per_day=3):
+    # Las fechas llegan en desorden: 0, 7, 14, ... (7 y days sin factores
+    # comunes)
+    analyzer = logic.new_logic(index_type)
+    for step in range(days):
+        day = (step * 7) % days
+        for i in range(per_day):
+            logic.add_crime(analyzer, new_crime(day, i))
+    return analyzer
+
+
+def test_evict_before():
+    for index_type in INDEX_TYPES:
+        analyzer = setup_analyzer(index_type)
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-30") == 90
+
+        assert logic.evict_before(analyzer, "2018-01-11") == 30
+        assert logic.index_size(analyzer) == 20
+        assert logic.min_key(analyzer) == datetime.date(2018, 1, 11)
+        assert logic.max_key(analyzer) == datetime.date(2018, 1, 30)
+        assert logic.crimes_size(analyzer) == 60
+        # La consulta en cache se vuelve a calcular
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-30") == 60
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-10") == 0
+        with pytest.raises(IndexError):
+            # El primer crimen agregado es del 1 de enero
+            logic.get_crime(analyzer, 0)
+
+        assert logic.evict_before(analyzer, "2018-01-11") == 0
+        assert logic.evict_before(analyzer, "2018-01-21") == 30
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-30") == 30
+        # Una fecha posterior a todas las del indice lo vacia
+        assert logic.evict_before(analyzer, "2019-01-01") == 30
+        assert logic.index_size(analyzer) == 0
+        assert logic.min_key(analyzer) is None
+        assert logic.crimes_size(analyzer) == 0
+
+
+def test_snapshot_stays_frozen():
+    analyzer = setup_analyzer("PERSISTENT", days=10)
+    view = logic.snapshot(analyzer)
+    first = logic.get_first_crimes(view, "2018-01-03", 3)
+    # Crimenes en fechas que ya estan (de tipos nuevos y de tipos que ya
+    # tiene la fecha) y en fechas nuevas
+    for day in range(0, 20, 2):
+        for i in range(3, 6):
+            logic.add_crime(analyzer, new_crime(day, i))
+
+    assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                     "2018-01-20") == 60
+    assert logic.get_dates_by_range(analyzer, "2018-01-01",
+                                    "2018-01-20") == 15
+    assert logic.get_crimes_by_range_code(analyzer, "2018-01-03",
+                                          "Larceny") == 2
+    assert logic.get_crimes_by_range_code(analyzer, "2018-01-03",
+                                          "Towed") == 1
+
+    assert logic.get_crimes_by_range(view, "2018-01-01", "2018-01-20") == 30
+    assert logic.get_dates_by_range(view, "2018-01-01", "2018-01-20") == 10
+    assert logic.max_key(view) == datetime.date(2018, 1, 10)
+    assert logic.get_crimes_by_range_code(view, "2018-01-03",
+                                          "Larceny") == 1
+    assert logic.get_crimes_by_range_code(view, "2018-01-03", "Towed") == 0
+    again = logic.get_first_crimes(view, "2018-01-03", 3)
+    assert again["elements"] == first["elements"]
+
+
+def test_append_shared():
+    base = logic.new_data_entry(None)["lstcrimes"]
+    first = logic.append_shared(base, 1)
+    second = logic.append_shared(first, 2)
+    # first ya no es la ultima version: se copian sus elementos
+    other = logic.append_shared(first, 3)
+    assert base["size"] == 0
+    assert first["size"] == 1
+    assert second["elements"][:second["size"]] == [1, 2]
+    assert other["elements"][:other["size"]] == [1, 3]
+    assert second["elements"] is first["elements"]
+    assert other["elements"] is not first["elements"]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "crimes.snapshot")
+    for index_type in INDEX_TYPES:
+        analyzer = setup_analyzer(index_type)
+        logic.evict_before(analyzer, "2018-01-04")
+        logic.save_snapshot(analyzer, path)
+        loaded = logic.load_snapshot(path)
+
+        assert loaded["dateIndex"]["_type"] == analyzer["dateIndex"]["_type"]
+        assert logic.crimes_size(loaded) == logic.crimes_size(analyzer)
+        assert logic.index_size(loaded) == 27
+        assert logic.min_key(loaded) == logic.min_key(analyzer)
+        assert logic.max_key(loaded) == logic.max_key(analyzer)
+        assert logic.get_crimes_by_range(loaded, "2018-01-01",
+                                         "2018-01-30") == 81
+        assert logic.get_crimes_by_range_code(loaded, "2018-01-05",
+                                              "Robbery") == 1
+        assert logic.get_crime(loaded, 20) == logic.get_crime(analyzer, 20)
+        with pytest.raises(IndexError):
+            logic.get_crime(loaded, 0)
+        first = logic.get_first_crimes(loaded, "2018-01-10", 4)
+        assert first["elements"] == \
+            logic.get_first_crimes(analyzer, "2018-01-10", 4)["elements"]
+
+        # El analizador cargado sigue recibiendo crimenes
+        logic.add_crime(loaded, new_crime(40, 0))
+        assert logic.get_crimes_by_range(loaded, "2018-01-01",
+                                         "2018-12-31") == 82
+        assert loaded["lock"] is None
+
+
+def test_snapshot_keeps_concurrent(tmp_path):
+    path = str(tmp_path / "crimes.snapshot")
+    analyzer = logic.new_logic("SORTED_ARRAY", concurrent=True)
+    for i in range(20):
+        logic.add_crime(analyzer, new_crime(i % 5, i))
+    logic.save_snapshot(analyzer, path)
+    # El archivo no es un pickle: despues del encabezado va JSON
+    with open(path, "rb") as file:
+        assert file.read(len(logic.SNAPSHOT_MAGIC)) == logic.SNAPSHOT_MAGIC
+        file.seek(logic._snapshot_header.size)
+        assert file.read(1) == b"{"
+
+    loaded = logic.load_snapshot(path)
+    assert loaded["lock"] is not None
+    assert logic.get_crimes_by_range(loaded, "2018-01-01",
+                                     "2018-01-05") == 20
+    assert logic.load_snapshot(path, concurrent=False)["lock"] is None
+
+
+def test_load_snapshot_rejects_other_files(tmp_path, monkeypatch):
+    path = str(tmp_path / "crimes.snapshot")
+    logic.save_snapshot(setup_analyzer(), path)
+    monkeypatch.setattr(logic, "SNAPSHOT_VERSION", logic.SNAPSHOT_VERSION + 1)
+    with pytest.raises(ValueError):
+        logic.load_snapshot(path)
+    monkeypatch.undo()
+    assert logic.index_size(logic.load_snapshot(path)) == 30
+
+    other = tmp_path / "other.csv"
+    other.write_text("OCCURRED_ON_DATE,OFFENSE_CODE_GROUP\n")
+    with pytest.raises(ValueError):
+        logic.load_snapshot(str(other))
+    empty = tmp_path / "empty.snapshot"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        logic.load_snapshot(str(empty))
+
+    # Archivos cortados o con arreglos que no corresponden a la descripcion
+    content = open(path, "rb").read()
+    damaged = tmp_path / "damaged.snapshot"
+    for broken in (content[:len(content) // 2], content[:-8],
+                   content.replace(b'"size": 90', b'"size": 91'),
+                   content.replace(b'"type": "RBT"', b'"type": "AVL"')):
+        assert broken != content
+        damaged.write_bytes(broken)
+        with pytest.raises(ValueError):
+            logic.load_snapshot(str(damaged))
+
+
+def test_query_cache_hits_and_eviction():
+    analyzer = setup_analyzer()
+    analyzer["queryCache"] = logic.new_query_cache(capacity=2)
+    assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                     "2018-01-10") == 30
+    assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                     "2018-01-10") == 30
+    stats = logic.query_cache_stats(analyzer)
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+    assert stats["capacity"] == 2
+
+    # Las fechas se normalizan: es la misma consulta
+    assert logic.get_crimes_by_range(analyzer, "2018-1-1", "2018-1-10") == 30
+    assert logic.query_cache_stats(analyzer)["hits"] == 2
+
+    # Al llenarse se descarta la consulta usada hace mas tiempo
+    logic.get_crimes_by_range_code(analyzer, "2018-01-02", "Larceny")
+    logic.get_crimes_by_range(analyzer, "2018-01-01", "2018-01-10")
+    logic.get_crimes_by_range(analyzer, "2018-01-11", "2018-01-20")
+    entries = analyzer["queryCache"]["entries"]
+    assert len(entries) == 2
+    assert ("code", datetime.date(2018, 1, 2), "Larceny") not in entries
+    assert ("range", datetime.date(2018, 1, 1),
+            datetime.date(2018, 1, 10)) in entries
+    stats = logic.query_cache_stats(analyzer)
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["invalidations"] == 0
+
+    logic.clear_query_cache(analyzer)
+    assert logic.query_cache_stats(analyzer)["size"] == 0
+
+
+def test_query_cache_invalidation():
+    for index_type in INDEX_TYPES:
+        analyzer = setup_analyzer(index_type)
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-10") == 30
+        assert logic.get_crimes_by_range_code(analyzer, "2018-01-02",
+                                              "Larceny") == 1
+        # Un crimen nuevo cambia la version del indice
+        logic.add_crime(analyzer, new_crime(1, 4))
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-10") == 31
+        assert logic.get_crimes_by_range_code(analyzer, "2018-01-02",
+                                              "Larceny") == 2
+        stats = logic.query_cache_stats(analyzer)
+        assert stats["invalidations"] == 1
+        assert stats["hits"] == 0
+        assert stats["misses"] == 4
+        assert stats["size"] == 2
+
+        # Sin cambios en el indice los resultados se reutilizan
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-01-10") == 31
+        assert logic.query_cache_stats(analyzer)["hits"] == 1
+
+
+def write_crimes(path, rows):
+    lines = ["INCIDENT_NUMBER,OFFENSE_CODE_GROUP,OCCURRED_ON_DATE\n"]
+    for i in range(rows):
+        crime = new_crime((i * 13) % 40, i % 5)
+        lines.append("I%05d,%s,%s\n" % (i, crime["OFFENSE_CODE_GROUP"],
+                                        crime["OCCURRED_ON_DATE"]))
+    path.write_text("".join(lines))
+
+
+def index_contents(analyzer):
+    # fecha -> (crimenes de la fecha, crimenes por tipo)
+    date_tree = analyzer["dateIndex"]
+    contents = {}
+    for crimedate, datentry in logic.index_selector(date_tree).iter_items(
+            date_tree):
+        offenses = {}
+        for crime_id in datentry["lstcrimes"]["elements"]:
+            offense = logic.get_crime(analyzer, crime_id)["OFFENSE_CODE_GROUP"]
+            offenses[offense] = offenses.get(offense, 0) + 1
+        contents[crimedate] = (datentry["lstcrimes"]["elements"], offenses)
+        for offense, count in offenses.items():
+            assert logic.get_crimes_by_range_code(
+                analyzer, crimedate.isoformat(), offense) == count
+    return contents
+
+
+def test_load_data_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr(logic, "data_dir", str(tmp_path) + "/")
+    write_crimes(tmp_path / "crimes.csv", 500)
+    for preloaded in (False, True):
+        serial = logic.new_logic()
+        parallel = logic.new_logic()
+        if preloaded:
+            # Con datos en el indice los crimenes se agregan con add_crime
+            for analyzer in (serial, parallel):
+                logic.add_crime(analyzer, new_crime(3, 0))
+        logic.load_data(serial, "crimes.csv")
+        logic.load_data_parallel(parallel, "crimes.csv", workers=4)
+
+        assert logic.crimes_size(parallel) == logic.crimes_size(serial)
+        assert logic.crimes_size(serial) == (501 if preloaded else 500)
+        assert logic.index_size(parallel) == logic.index_size(serial) == 40
+        assert logic.min_key(parallel) == logic.min_key(serial)
+        assert logic.max_key(parallel) == logic.max_key(serial)
+        assert index_contents(parallel) == index_contents(serial)
+        for crime_id in range(logic.crimes_size(serial)):
+            assert logic.get_crime(parallel, crime_id) == \
+                logic.get_crime(serial, crime_id)
+        assert parallel["source"] == serial["source"]
+
+
+def crime_line(i):
+    crime = new_crime(i % 40, i % 5)
+    return "I%05d,%s,%s\n" % (i, crime["OFFENSE_CODE_GROUP"],
+                              crime["OCCURRED_ON_DATE"])
+
+
+def append_text(path, text):
+    with open(path, "a", newline="") as file:
+        file.write(text)
+
+
+def test_refresh_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(logic, "data_dir", str(tmp_path) + "/")
+    path = tmp_path / "crimes.csv"
+    write_crimes(path, 100)
+    analyzer = logic.new_logic()
+    with pytest.raises(ValueError):
+        logic.refresh_data(analyzer)
+    logic.load_data(analyzer, "crimes.csv")
+    assert logic.refresh_data(analyzer) == 0
+
+    append_text(path, crime_line(100) + crime_line(101))
+    assert logic.refresh_data(analyzer) == 2
+    assert logic.crimes_size(analyzer) == 102
+    assert logic.get_crime(analyzer, 101)["INCIDENT_NUMBER"] == "I00101"
+    assert logic.refresh_data(analyzer) == 0
+
+    # Una linea sin terminar se deja para el siguiente refresh
+    line = crime_line(102)
+    append_text(path, crime_line(103) + line[:20])
+    assert logic.refresh_data(analyzer) == 1
+    assert logic.crimes_size(analyzer) == 103
+    assert analyzer["source"]["offset"] == os.path.getsize(path) - 20
+    append_text(path, line[20:])
+    assert logic.refresh_data(analyzer) == 1
+    assert logic.get_crime(analyzer, 103)["INCIDENT_NUMBER"] == "I00102"
+    assert analyzer["source"]["offset"] == os.path.getsize(path)
+
+    # El indice tiene los crimenes nuevos
+    assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                     "2018-12-31") == 104
+    first = logic.new_logic()
+    logic.load_data(first, "crimes.csv")
+    assert index_contents(analyzer) == index_contents(first)
+
+    # Un archivo mas corto que en la ultima carga no se puede continuar
+    write_crimes(path, 10)
+    with pytest.raises(ValueError):
+        logic.refresh_data(analyzer)
+
+
+def test_follow_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(logic, "data_dir", str(tmp_path) + "/")
+    path = tmp_path / "crimes.csv"
+    write_crimes(path, 100)
+    analyzer = logic.new_logic()
+    logic.load_data(analyzer, "crimes.csv")
+
+    polled = []
+
+    def on_refresh(analyzer, added):
+        polled.append(added)
+        # Filas nuevas para la siguiente revision
+        append_text(path, crime_line(100 + len(polled)))
+
+    assert logic.follow_data(analyzer, interval=0, polls=3,
+                             on_refresh=on_refresh) == 2
+    assert polled == [0, 1, 1]
+    assert logic.crimes_size(analyzer) == 102
+
+    # stop termina la espera entre revisiones
+    stop = threading.Event()
+    stop.set()
+    polled.clear()
+    assert logic.follow_data(analyzer, interval=60, stop=stop,
+                             on_refresh=on_refresh) == 1
+    assert polled == [1]
+    assert logic.crimes_size(analyzer) == 103
+
+
+def test_evict_before_compacts_store():
+    for index_type in INDEX_TYPES:
+        # Los crimenes llegan en orden de fecha: los eliminados son los
+        # mas antiguos
+        analyzer = logic.new_logic(index_type)
+        for day in range(30):
+            for i in range(3):
+                logic.add_crime(analyzer, new_crime(day, i))
+        store = analyzer["crimes"]
+        assert cs.stored(store) == 90
+
+        assert logic.evict_before(analyzer, "2018-01-21") == 60
+        assert cs.stored(store) == 30
+        assert logic.crimes_size(analyzer) == 30
+        assert logic.get_crime(analyzer, 60) == new_crime(20, 0)
+        assert logic.get_first_crimes(analyzer, "2018-01-01", 1)[
+            "elements"] == [new_crime(20, 0)]
+
+        # Una ventana movil no hace crecer el almacenamiento
+        for day in range(30, 120):
+            for i in range(3):
+                logic.add_crime(analyzer, new_crime(day, i))
+            first = datetime.date(2018, 1, 1) + datetime.timedelta(
+                days=day - 9)
+            logic.evict_before(analyzer, first.isoformat())
+            assert cs.stored(store) <= 60
+        assert logic.crimes_size(analyzer) == 30
+        assert logic.get_crimes_by_range(analyzer, "2018-01-01",
+                                         "2018-12-31") == 30
+        assert logic.get_crime(analyzer, cs.size(store) - 1) == \
+            new_crime(119, 2)
@@ -0,0 +1,109 @@
+import json
+import asyncio
+
+import App.logic as logic
+from App import server as srv
+
+
+def setup_analyzer():
+    analyzer = logic.new_logic()
+    crimes = [("2018-01-01 10:00:00", "Larceny"),
+              ("2018-01-01 12:30:00", "Larceny"),
+              ("2018-01-01 23:59:00", "Robbery"),
+              ("2018-01-02 08:00:00", "Larceny"),
+              ("2018-01-05 17:45:00", "Vandalism")]
+    for occurred, offense in crimes:
+        logic.add_crime(analyzer, {"OCCURRED_ON_DATE": occurred,
+                                   "OFFENSE_CODE_GROUP": offense})
+    return analyzer
+
+
+async def fetch(port, target, method="GET"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(("%s %s HTTP/1.1\r\nHost: localhost\r\n\r\n" %
+                  (method, target)).encode("latin-1"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, body = response.split(b"\r\n\r\n", 1)
+    status = int(head.split()[1])
+    return status, json.loads(body)
+
+
+def run_against_server(scenario):
+    async def main():
+        server = srv.new_server(setup_analyzer(), port=0, workers=4)
+        await srv.start(server)
+        try:
+            return await scenario(server["port"])
+        finally:
+            await srv.stop(server)
+    return asyncio.run(main())
+
+
+def test_handle_query():
+    analyzer = setup_analyzer()
+
+    status, payload = srv.handle_query(analyzer, "/crimes/range",
+                                       {"initialDate": ["2018-01-01"],
+                                        "finalDate": ["2018-01-02"]})
+    assert status == 200
+    assert payload["total"] == 4
+
+    status, payload = srv.handle_query(analyzer, "/crimes/offense",
+                                       {"date": ["2018-01-01"],
+                                        "offense": ["Larceny"]})
+    assert status == 200
+    assert payload["total"] == 2
+
+    # Parámetros faltantes o mal formados retornan 400
+    assert srv.handle_query(analyzer, "/crimes/range", {})[0] == 400
+    assert srv.handle_query(analyzer, "/crimes/range",
+                            {"initialDate": ["ayer"],
+                             "finalDate": ["hoy"]})[0] == 400
+
+    # Rutas desconocidas retornan 404
+    assert srv.handle_query(analyzer, "/nada", {})[0] == 404
+
+
+def test_server_endpoints():
+    async def scenario(port):
+        results = {}
+        results["range"] = await fetch(
+            port, "/crimes/range?initialDate=2018-01-01&finalDate=2018-01-31")
+        results["offense"] = await fetch(
+            port, "/crimes/offense?date=2018-01-01&offense=Robbery")
+        results["index"] = await fetch(port, "/index")
+        results["height"] = await fetch(port, "/index/height")
+        results["post"] = await fetch(port, "/index", method="POST")
+        results["missing"] = await fetch(port, "/otra")
+        return results
+
+    results = run_against_server(scenario)
+
+    assert results["range"] == (200, {"initialDate": "2018-01-01",
+                                      "finalDate": "2018-01-31",
+                                      "total": 5})
+    assert results["offense"][1]["total"] == 1
+    assert results["index"][1] == {"min": "2018-01-01", "max": "2018-01-05",
+                                   "height": results["height"][1]["height"],
+                                   "size": 3}
+    assert results["post"][0] == 405
+    assert results["missing"][0] == 404
+
+
+def test_server_concurrent_clients():
+    async def scenario(port):
+        requests = []
+        for day in range(1, 6):
+            target = ("/crimes/range?initialDate=2018-01-01"
+                      "&finalDate=2018-01-0%d" % day)
+            requests.extend(fetch(port, target) for _ in range(20))
+        return await asyncio.gather(*requests)
+
+    results = run_against_server(scenario)
+
+    # Cada grupo de 20 clientes concurrentes recibe el mismo total
+    totals = [payload["total"] for _, payload in results]
+    assert totals == [3] * 20 + [4] * 20 + [4] * 20 + [4] * 20 + [5] * 20
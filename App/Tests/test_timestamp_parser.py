@@ -0,0 +1,122 @@
+import datetime
+import random
+
+import pytest
+
+from App import timestamp_parser as tp
+
+
+def strptime_date(text, fmt=tp.DEFAULT_FORMAT):
+    return datetime.datetime.strptime(text, fmt).date()
+
+
+def test_fast_path_matches_strptime():
+    parser = tp.new_parser()
+    rng = random.Random(1225)
+    start = datetime.date(2015, 1, 1)
+    for _ in range(2000):
+        day = start + datetime.timedelta(days=rng.randrange(3000))
+        text = "%s %02d:%02d:%02d" % (day.isoformat(), rng.randrange(24),
+                                      rng.randrange(60), rng.randrange(60))
+        assert tp.parse_date(parser, text) == strptime_date(text)
+    # Ninguna cadena necesito strptime y los dias se memorizaron
+    assert parser["fallbacks"] == 0
+    assert 0 < tp.cache_size(parser) <= 3000
+
+    dates = tp.new_parser(tp.DATE_FORMAT)
+    for text in ("2016-02-29", "2018-12-31", "2019-01-01"):
+        assert tp.parse_date(dates, text) == strptime_date(text,
+                                                           tp.DATE_FORMAT)
+    assert dates["fallbacks"] == 0
+
+
+def test_malformed_input_falls_back():
+    parser = tp.new_parser()
+    # Cadenas validas para strptime que no tienen la forma del camino rapido
+    assert tp.parse_date(parser, "2018-1-5 7:05:00") == \
+        datetime.date(2018, 1, 5)
+    assert parser["fallbacks"] == 1
+    # Cadenas con la forma esperada pero con una fecha que no existe o
+    # campos que no son numeros
+    for text in ("2018-02-30 10:00:00", "2018-13-01 10:00:00",
+                 "20x8-01-01 10:00:00", "2018-01-01T10:00:00",
+                 "", "2018-01-01"):
+        with pytest.raises(ValueError):
+            tp.parse_date(parser, text)
+    assert parser["fallbacks"] == 7
+    # Las fechas invalidas no quedan en la cache
+    assert tp.cache_size(parser) == 0
+
+    # Un formato sin camino rapido siempre usa strptime
+    other = tp.new_parser("%d/%m/%Y")
+    assert tp.parse_date(other, "05/01/2018") == datetime.date(2018, 1, 5)
+    assert other["fallbacks"] == 1
+    assert tp.cache_size(other) == 0
+
+
+def test_invalid_time_falls_back():
+    parser = tp.new_parser()
+    assert tp.parse_date(parser, "2018-01-01 23:59:59") == \
+        datetime.date(2018, 1, 1)
+    # El dia ya esta en la cache, pero una hora invalida no lo usa
+    invalid = ("2018-01-01 99:99:99", "2018-01-01 24:00:00",
+               "2018-01-01 10:60:00", "2018-01-01 10:00:60",
+               "2018-01-01 1a:00:00", "2018-01-01 +1:00:00",
+               "2018-01-01 \u0661\u0662:00:00")
+    for text in invalid:
+        with pytest.raises(ValueError):
+            strptime_date(text)
+        with pytest.raises(ValueError):
+            tp.parse_date(parser, text)
+    assert parser["fallbacks"] == len(invalid)
+    assert tp.cache_size(parser) == 1
+    # Digitos que no son ASCII tambien los decide strptime
+    assert tp.parse_date(parser, "\uff12018-01-01 10:00:00") == \
+        datetime.date(2018, 1, 1)
+    assert parser["fallbacks"] == len(invalid) + 1
+
+
+def test_register_format():
+    fmt = "%d/%m/%Y %H:%M"
+
+    def slicer(text):
+        if len(text) == 16 and text[2] == "/" and text[5] == "/":
+            return text[:10]
+        return None
+
+    def builder(key):
+        return datetime.date(int(key[6:10]), int(key[3:5]), int(key[0:2]))
+
+    tp.register_format(fmt, slicer, builder)
+    try:
+        parser = tp.new_parser(fmt)
+        assert tp.parse_date(parser, "05/01/2018 10:30") == \
+            datetime.date(2018, 1, 5)
+        assert tp.parse_date(parser, "05/01/2018 23:59") == \
+            datetime.date(2018, 1, 5)
+        assert parser["fallbacks"] == 0
+        assert tp.cache_size(parser) == 1
+        # Si el builder rechaza la llave decide strptime
+        with pytest.raises(ValueError):
+            tp.parse_date(parser, "31/02/2018 10:30")
+        assert tp.parse_date(parser, "5/1/2018 10:30") == \
+            datetime.date(2018, 1, 5)
+        assert parser["fallbacks"] == 2
+    finally:
+        del tp._formats[fmt]
+
+
+def test_memo_eviction():
+    parser = tp.new_parser(max_cache=3)
+    for day in range(1, 4):
+        tp.parse_date(parser, "2018-01-%02d 10:00:00" % day)
+    assert tp.cache_size(parser) == 3
+    # Al llenarse la cache se vacia antes de guardar el dia nuevo
+    assert tp.parse_date(parser, "2018-01-04 10:00:00") == \
+        datetime.date(2018, 1, 4)
+    assert tp.cache_size(parser) == 1
+    # Los dias descartados se vuelven a calcular
+    assert tp.parse_date(parser, "2018-01-01 12:00:00") == \
+        datetime.date(2018, 1, 1)
+    assert tp.cache_size(parser) == 2
+    assert parser["fallbacks"] == 0
@@ -0,0 +1,541 @@
+"""
+ * Copyright 2020, Departamento de sistemas y Computación,
+ * Universidad de Los Andes
+ *
+ *
+ * Desarrolado para el curso ISIS1225 - Estructuras de Datos y Algoritmos
+ *
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along withthis program.  If not, see <http://www.gnu.org/licenses/>.
+ """
+
+"""
+Almacenamiento por columnas de los crímenes.
+
+En lugar de guardar cada fila del CSV como un diccionario, cada columna se
+guarda en un arreglo compacto y las filas se identifican con un entero
+(``row_id``) que es su posición de llegada. Los diccionarios solo se crean
+cuando se pide una fila con ``get_row``.
+
+Cada columna empieza codificada por diccionario: una lista con los valores
+distintos y un arreglo de códigos (de 1, 2 o 4 bytes según el número de
+valores distintos). Si la columna resulta tener demasiados valores
+distintos (por ejemplo ``INCIDENT_NUMBER`` o ``Location``) se convierte en
+una columna de texto: los valores se guardan en UTF-8, uno detrás de otro,
+en un ``bytearray`` con un arreglo de posiciones.
+
+Los valores que no son cadenas (``None`` o listas que produce
+``csv.DictReader`` cuando una fila tiene menos o más campos) se guardan
+aparte, por fila.
+
+Las filas eliminadas con ``delete_row`` se marcan en un ``bytearray`` (un
+byte por fila). Los ``row_id`` no se reutilizan, para que los del índice
+sigan siendo válidos. ``compact`` libera las filas eliminadas que están al
+inicio de los arreglos (las más antiguas, como las que quita
+``logic.evict_before``): los arreglos empiezan entonces en la fila
+``base`` y la posición de una fila es ``row_id - base``.
+"""
+
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+
+
+# Cada CHECK_EVERY filas se revisan las columnas codificadas por
+# diccionario: las que tienen más de MIN_DISTINCT valores distintos y más
+# de una fracción DISTINCT_RATIO de las filas se convierten en texto
+CHECK_EVERY = 1024
+MIN_DISTINCT = 4096
+DISTINCT_RATIO = 0.25
+
+# compact solo libera las filas eliminadas del inicio si son al menos esta
+# fracción de las filas guardadas, para que su costo (proporcional a las
+# filas que quedan) se reparta entre las filas eliminadas
+COMPACT_RATIO = 0.5
+
+# Tipos de los arreglos de códigos y de posiciones, de menor a mayor
+_int_types = (('B', 0xFF), ('H', 0xFFFF), ('I', 0xFFFFFFFF),
+              ('Q', 0xFFFFFFFFFFFFFFFF))
+
+
+def new_store(fieldnames=None):
+    """
+    Crea un almacenamiento vacío.
+
+    Si no se dan los nombres de las columnas, se toman de la primera fila
+    que se agregue.
+
+    :param fieldnames: Nombres de las columnas
+    :type fieldnames: list
+
+    :returns: El almacenamiento creado
+    :rtype: dict
+    """
+    store = {'fieldnames': None,
+             'field_index': None,
+             'columns': None,
+             'extras': {},
+             'size': 0,
+             'base': 0,
+             'deleted': bytearray(),
+             'deleted_count': 0
+             }
+    if fieldnames is not None:
+        _set_fieldnames(store, fieldnames)
+    return store
+
+
+def _set_fieldnames(store, fieldnames):
+    store['fieldnames'] = list(fieldnames)
+    # Posicion de cada columna, para no buscarla en la lista en cada lectura
+    store['field_index'] = {field: i
+                            for i, field in enumerate(store['fieldnames'])}
+    store['columns'] = [_new_dict_column() for _ in store['fieldnames']]
+
+
+def _new_dict_column():
+    return {'kind': 'dict',
+            'codes': array('B'),
+            'values': [],
+            'lookup': {},
+            'others': {}
+            }
+
+
+def _new_text_column():
+    return {'kind': 'text',
+            'data': bytearray(),
+            'offsets': array('I', [0]),
+            'others': {}
+            }
+
+
+def size(store):
+    """
+    Número de filas del almacenamiento
+    """
+    return store['size']
+
+
+def stored(store):
+    """
+    Número de filas guardadas en los arreglos de las columnas: las filas
+    desde base, incluidas las eliminadas que no se han compactado
+    """
+    return store['size'] - store['base']
+
+
+def count(store):
+    """
+    Número de filas sin eliminar
+    """
+    return stored(store) - store['deleted_count']
+
+
+def is_deleted(store, row_id):
+    """
+    Indica si la fila row_id fue eliminada
+    """
+    pos = row_id - store['base']
+    deleted = store['deleted']
+    return pos < 0 or (pos < len(deleted) and deleted[pos] == 1)
+
+
+def delete_row(store, row_id):
+    """
+    Elimina la fila row_id. Los valores de las columnas se quedan en los
+    arreglos (no se compactan), pero la fila deja de poder consultarse y
+    se liberan sus valores guardados aparte.
+
+    :returns: True si la fila se eliminó, False si ya estaba eliminada
+    :rtype: bool
+    """
+    if row_id < 0 or row_id >= store['size']:
+        raise IndexError(row_id)
+    pos = row_id - store['base']
+    if pos < 0:
+        return False
+    deleted = store['deleted']
+    if len(deleted) < stored(store):
+        deleted.extend(bytes(stored(store) - len(deleted)))
+    if deleted[pos]:
+        return False
+    deleted[pos] = 1
+    store['deleted_count'] += 1
+    store['extras'].pop(row_id, None)
+    for column in store['columns']:
+        if column['others']:
+            column['others'].pop(row_id, None)
+    return True
+
+
+def compact(store, ratio=COMPACT_RATIO):
+    """
+    Libera las filas eliminadas que están al inicio de los arreglos, si son
+    al menos una fracción ratio de las filas guardadas (con ratio 0 las
+    libera siempre). Las filas eliminadas que siguen a una fila sin
+    eliminar se quedan hasta que esta se elimine.
+
+    Los ``row_id`` no cambian: los arreglos pasan a empezar en la primera
+    fila sin eliminar (``base``). Las columnas codificadas por diccionario
+    descartan además los valores que ya no usa ninguna fila. El costo es
+    proporcional a las filas que quedan.
+
+    :returns: El número de filas liberadas
+    :rtype: int
+    """
+    deleted = store['deleted']
+    dead = len(deleted) - len(deleted.lstrip(b'\x01'))
+    if dead == 0 or dead < ratio * stored(store):
+        return 0
+    for i, column in enumerate(store['columns']):
+        if column['kind'] == 'dict':
+            store['columns'][i] = _compact_dict_column(column, dead)
+        else:
+            offsets = column['offsets']
+            start = offsets[dead]
+            column['data'] = column['data'][start:]
+            column['offsets'] = array(offsets.typecode,
+                                      [end - start for end in offsets[dead:]])
+    store['deleted'] = deleted[dead:]
+    store['deleted_count'] -= dead
+    store['base'] += dead
+    return dead
+
+
+def _compact_dict_column(column, dead):
+    """
+    Retorna la columna sin sus primeras dead filas y sin los valores que
+    ya no se usan, con los códigos renumerados.
+    """
+    codes = column['codes'][dead:]
+    used = sorted(set(codes))
+    compacted = _new_dict_column()
+    compacted['others'] = column['others']
+    if len(used) == len(column['values']):
+        compacted['codes'] = codes
+        compacted['values'] = column['values']
+        compacted['lookup'] = column['lookup']
+        return compacted
+    renumber = {}
+    for code in used:
+        renumber[code] = _add_distinct(compacted, column['values'][code])
+    compacted['codes'].extend(map(renumber.__getitem__, codes))
+    return compacted
+
+
+def fieldnames(store):
+    """
+    Nombres de las columnas del almacenamiento
+    """
+    return store['fieldnames']
+
+
+def add_row(store, row):
+    """
+    Agrega una fila (un diccionario columna -> valor) al almacenamiento.
+
+    :returns: El identificador (row_id) de la fila agregada
+    :rtype: int
+    """
+    if store['columns'] is None:
+        return add_rows(store, [row])
+    row_id = store['size']
+    names = store['fieldnames']
+    columns = store['columns']
+    for i in range(len(names)):
+        column = columns[i]
+        value = row.get(names[i])
+        if value.__class__ is not str:
+            column['others'][row_id] = value
+            value = ''
+        if column['kind'] == 'dict':
+            code = column['lookup'].get(value)
+            if code is None:
+                code = _add_distinct(column, value)
+            column['codes'].append(code)
+        else:
+            data = column['data']
+            data += value.encode('utf-8')
+            if len(data) > _limit(column['offsets']):
+                column['offsets'] = _widen(column['offsets'], len(data))
+            column['offsets'].append(len(data))
+    if len(row) != len(names):
+        _add_extras(store, row_id, row)
+    store['size'] = row_id + 1
+    if store['size'] % CHECK_EVERY == 0:
+        _convert_columns(store)
+    return row_id
+
+
+def add_rows(store, rows):
+    """
+    Agrega varias filas al almacenamiento, columna por columna.
+
+    Es equivalente a llamar add_row con cada fila, pero mucho más rápido
+    para cargas grandes.
+
+    :returns: El identificador (row_id) de la primera fila agregada. Las
+        demás tienen identificadores consecutivos.
+    :rtype: int
+    """
+    first_id = store['size']
+    if len(rows) == 0:
+        return first_id
+    if store['columns'] is None:
+        _set_fieldnames(store, rows[0].keys())
+    names = store['fieldnames']
+    columns = store['columns']
+    for i, field in enumerate(names):
+        column = columns[i]
+        try:
+            values = list(map(itemgetter(field), rows))
+        except KeyError:
+            values = [row.get(field) for row in rows]
+        if set(map(type, values)) != {str}:
+            others = column['others']
+            for pos, value in enumerate(values):
+                if value.__class__ is not str:
+                    others[first_id + pos] = value
+                    values[pos] = ''
+        if column['kind'] == 'dict':
+            lookup = column['lookup']
+            for value in dict.fromkeys(values):
+                if value not in lookup:
+                    _add_distinct(column, value)
+            column['codes'].extend(map(lookup.__getitem__, values))
+        else:
+            encoded = [value.encode('utf-8') for value in values]
+            data = column['data']
+            ends = accumulate(map(len, encoded), initial=len(data))
+            next(ends)
+            data += b''.join(encoded)
+            if len(data) > _limit(column['offsets']):
+                column['offsets'] = _widen(column['offsets'], len(data))
+            column['offsets'].extend(ends)
+    if set(map(len, rows)) != {len(names)}:
+        for pos, row in enumerate(rows):
+            _add_extras(store, first_id + pos, row)
+    store['size'] = first_id + len(rows)
+    if first_id // CHECK_EVERY != store['size'] // CHECK_EVERY:
+        _convert_columns(store)
+    return first_id
+
+
+def _add_extras(store, row_id, row):
+    """
+    Guarda aparte los campos de la fila que no son columnas del
+    almacenamiento.
+    """
+    extras = {}
+    field_index = store['field_index']
+    for field, value in row.items():
+        if field not in field_index:
+            extras[field] = value
+    if extras:
+        store['extras'][row_id] = extras
+
+
+def _add_distinct(column, value):
+    """
+    Agrega un valor distinto a una columna codificada por diccionario y
+    retorna su código.
+    """
+    code = len(column['values'])
+    column['values'].append(value)
+    column['lookup'][value] = code
+    if code > _limit(column['codes']):
+        column['codes'] = _widen(column['codes'], code)
+    return code
+
+
+def _limit(numbers):
+    """
+    Mayor entero que cabe en el arreglo.
+    """
+    for typecode, limit in _int_types:
+        if numbers.typecode == typecode:
+            return limit
+    return 0
+
+
+def _widen(numbers, value):
+    """
+    Retorna una copia del arreglo con el tipo de entero más pequeño en el
+    que cabe value.
+    """
+    for typecode, limit in _int_types:
+        if limit >= value:
+            return array(typecode, numbers)
+    raise OverflowError(value)
+
+
+def _convert_columns(store):
+    """
+    Convierte en columnas de texto las columnas codificadas por
+    diccionario que tienen demasiados valores distintos.
+    """
+    rows = stored(store)
+    for i, column in enumerate(store['columns']):
+        distinct = len(column['values']) if column['kind'] == 'dict' else 0
+        if distinct > MIN_DISTINCT and distinct > rows * DISTINCT_RATIO:
+            text = _new_text_column()
+            text['others'] = column['others']
+            encoded = [value.encode('utf-8') for value in column['values']]
+            pieces = [encoded[code] for code in column['codes']]
+            text['data'] += b''.join(pieces)
+            text['offsets'] = _widen(text['offsets'], len(text['data']))
+            text['offsets'].extend(accumulate(map(len, pieces)))
+            store['columns'][i] = text
+
+
+def _column_value(column, row_id, pos):
+    # Los valores guardados aparte usan el row_id; los arreglos, la
+    # posicion de la fila (row_id - base)
+    if column['others'] and row_id in column['others']:
+        return column['others'][row_id]
+    if column['kind'] == 'dict':
+        return column['values'][column['codes'][pos]]
+    offsets = column['offsets']
+    return column['data'][offsets[pos]:offsets[pos + 1]].decode('utf-8')
+
+
+def get_value(store, row_id, field):
+    """
+    Retorna el valor de una columna en una fila, sin crear la fila
+    completa.
+    """
+    if row_id < 0 or row_id >= store['size'] or is_deleted(store, row_id):
+        raise IndexError(row_id)
+    i = store['field_index'].get(field)
+    if i is None:
+        return store['extras'].get(row_id, {})[field]
+    return _column_value(store['columns'][i], row_id, row_id - store['base'])
+
+
+def get_row(store, row_id):
+    """
+    Retorna la fila row_id como un diccionario columna -> valor, igual al
+    que se agregó con add_row.
+    """
+    if row_id < 0 or row_id >= store['size'] or is_deleted(store, row_id):
+        raise IndexError(row_id)
+    row = {}
+    pos = row_id - store['base']
+    columns = store['columns']
+    for i, field in enumerate(store['fieldnames']):
+        row[field] = _column_value(columns[i], row_id, pos)
+    extras = store['extras'].get(row_id)
+    if extras is not None:
+        row.update(extras)
+    return row
+
+
+def export_store(store):
+    """
+    Describe el almacenamiento para guardarlo sin pickle.
+
+    Retorna (meta, sections): sections es la lista de arreglos del
+    almacenamiento (códigos, datos y posiciones de las columnas y el
+    ``bytearray`` de filas eliminadas) y meta un diccionario con el resto
+    (nombres de columnas, valores distintos de cada columna, valores
+    guardados aparte) que solo contiene cadenas, números, listas y None,
+    por lo que se puede escribir como JSON. meta se refiere a cada arreglo
+    por su posición en sections.
+
+    Los arreglos no se copian: no se debe modificar el almacenamiento
+    mientras se guardan.
+    """
+    sections = []
+
+    def section(buffer):
+        sections.append(buffer)
+        return len(sections) - 1
+
+    columns = None
+    if store['columns'] is not None:
+        columns = []
+        for column in store['columns']:
+            described = {'kind': column['kind'],
+                         'others': list(column['others'].items())}
+            if column['kind'] == 'dict':
+                described['values'] = column['values']
+                described['codes'] = section(column['codes'])
+            else:
+                described['data'] = section(column['data'])
+                described['offsets'] = section(column['offsets'])
+            columns.append(described)
+    meta = {'fieldnames': store['fieldnames'],
+            'size': store['size'],
+            'base': store['base'],
+            'deleted': section(store['deleted']),
+            'deleted_count': store['deleted_count'],
+            'columns': columns,
+            'extras': [[row_id, list(extras.items())]
+                       for row_id, extras in store['extras'].items()]
+            }
+    return meta, sections
+
+
+def import_store(meta, sections):
+    """
+    Crea un almacenamiento a partir de lo que retorna export_store (meta y
+    los arreglos de sections, ya leídos). Los arreglos se usan sin
+    copiarlos.
+
+    Lanza ValueError si meta y los arreglos no describen un almacenamiento
+    válido (por ejemplo, si no tienen el número de filas esperado).
+    """
+    store = new_store(meta['fieldnames'])
+    store['size'] = meta['size']
+    store['base'] = meta['base']
+    store['deleted'] = sections[meta['deleted']]
+    store['deleted_count'] = meta['deleted_count']
+    rows = stored(store)
+    valid = (0 <= store['base'] <= store['size']
+             and isinstance(store['deleted'], bytearray)
+             and len(store['deleted']) <= rows
+             and store['deleted'].count(1) == store['deleted_count'])
+    columns = meta['columns']
+    if columns is None:
+        valid = valid and store['fieldnames'] is None and rows == 0
+    else:
+        valid = valid and len(columns) == len(store['fieldnames'])
+        for i, described in enumerate(columns or ()):
+            if described['kind'] == 'dict':
+                column = _new_dict_column()
+                column['codes'] = sections[described['codes']]
+                for value in described['values']:
+                    _add_distinct(column, value)
+                valid = (valid and len(column['codes']) == rows
+                         and len(column['lookup']) == len(column['values'])
+                         and (rows == 0
+                              or max(column['codes']) < len(column['values'])))
+            else:
+                column = _new_text_column()
+                column['data'] = sections[described['data']]
+                column['offsets'] = sections[described['offsets']]
+                offsets = column['offsets']
+                valid = (valid and isinstance(column['data'], bytearray)
+                         and len(offsets) == rows + 1
+                         and offsets[0] == 0
+                         and offsets[-1] == len(column['data']))
+            column['others'] = {row_id: value
+                                for row_id, value in described['others']}
+            store['columns'][i] = column
+    if not valid:
+        raise ValueError('Descripcion de almacenamiento no valida')
+    store['extras'] = {row_id: dict(extras)
+                       for row_id, extras in meta['extras']}
+    return store
@@ -25,65 +25,479 @@
  """
 
 import os
+import io
 import csv
+import sys
+import json
+import mmap
+import array
+import struct
+import time
 import datetime
+import threading
+import functools
+import contextlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 
 from DataStructures.Tree import binary_search_tree as bst
+from DataStructures.Tree import red_black_tree as rbt
+from DataStructures.Tree import sorted_array_map as sam
+from DataStructures.Tree import persistent_tree as pt
 from DataStructures.List import array_list as al
 from DataStructures.Map import map_linear_probing as lp
+from App import timestamp_parser as tp
+from App import crime_store as cs
+from App import rw_lock as rw
 
 
 data_dir = os.path.dirname(os.path.realpath('__file__')) + '/Data/'
 
+# Parsers de fechas compartidos por la carga y las consultas
+_crime_date_parser = tp.new_parser(tp.DEFAULT_FORMAT)
+_query_date_parser = tp.new_parser(tp.DATE_FORMAT)
 
+# Estructuras disponibles para el indice por fechas
+_index_structures = {'BST': bst,
+                     'RBT': rbt,
+                     'PERSISTENT': pt,
+                     'SORTED_ARRAY': sam}
 
-def new_logic():
+# Numero de crimenes que se agregan juntos al almacenamiento en una carga
+_load_batch_size = 4096
+
+# Encabezado de los archivos de snapshot: firma, version y tamaño de la
+# descripcion (JSON) que va antes de los arreglos
+SNAPSHOT_MAGIC = b'ISIS1225-CRIMES'
+SNAPSHOT_VERSION = 8
+_snapshot_header = struct.Struct('<15sHQ')
+
+# Los arreglos de un snapshot empiezan en posiciones multiplo de este
+# numero de bytes
+_snapshot_align = 8
+
+# Tipos de arreglo que puede tener un snapshot ('bytes' es un bytearray)
+_snapshot_typecodes = ('bytes', 'B', 'H', 'I', 'Q', 'q')
+
+
+def new_logic(index_type='RBT', concurrent=False):
     """ Inicializa el analizador
 
-    Crea una lista vacia para guardar todos los crimenes
+    Crea un almacenamiento por columnas (crime_store) para guardar todos
+    los crimenes. Los indices guardan el identificador de cada crimen
+    (su posicion en el almacenamiento) y no el crimen completo.
     Se crean indices (Maps) por los siguientes criterios:
     -Fechas
 
+    index_type es la estructura del indice por fechas: 'RBT' (arbol
+    rojo-negro, siempre balanceado), 'BST' (arbol binario de busqueda),
+    'SORTED_ARRAY' (mapa ordenado sobre arreglos, para indices que casi
+    no cambian despues de la carga) o 'PERSISTENT' (arbol rojo-negro
+    persistente, para consultar vistas fijas del indice mientras se
+    siguen agregando crimenes; ver snapshot).
+
+    Si concurrent es True, el analizador se puede usar desde varios hilos
+    a la vez (por ejemplo, consultas mientras otro hilo carga datos): las
+    consultas toman un candado de lectura y cada crimen que se agrega toma
+    el candado de escritura, de modo que una carga sobre un analizador con
+    datos no bloquea las consultas hasta terminar. La primera carga (con
+    el indice vacio) tiene el candado de escritura hasta construir el
+    indice: las consultas ven el analizador vacio o con todos los crimenes,
+    nunca crimenes que aun no estan en el indice.
+
     Retorna el analizador inicializado.
     """
+    if index_type not in _index_structures:
+        raise ValueError('Tipo de indice no valido: ' + str(index_type))
     analyzer = {'crimes': None,
-                'dateIndex': None
+                'dateIndex': None,
+                'source': None,
+                'queryCache': None,
+                'lock': None
                 }
 
-    analyzer['crimes'] = al.new_list()
-    analyzer['dateIndex'] = bst.new_map()
+    analyzer['crimes'] = cs.new_store()
+    analyzer['dateIndex'] = _index_structures[index_type].new_map(
+        weight_func=date_entry_weight)
+    analyzer['queryCache'] = new_query_cache()
+    if concurrent:
+        analyzer['lock'] = rw.new_lock()
     
     return analyzer
 
+
+def index_selector(tree):
+    """
+    Retorna el modulo que implementa el indice (bst, rbt, sam o pt) segun
+    su tipo.
+    """
+    return _index_structures[tree['_type']]
+
+
+def _reading(analyzer):
+    """
+    Bloque with que tiene el candado del analizador para leer (si el
+    analizador es concurrente).
+    """
+    lock = analyzer.get('lock')
+    if lock is None:
+        return contextlib.nullcontext()
+    return rw.reading(lock)
+
+
+def _writing(analyzer):
+    """
+    Bloque with que tiene el candado del analizador para escribir (si el
+    analizador es concurrente).
+    """
+    lock = analyzer.get('lock')
+    if lock is None:
+        return contextlib.nullcontext()
+    return rw.writing(lock)
+
+
+def _reader(function):
+    """
+    Decorador para las funciones que solo consultan el analizador.
+    """
+    @functools.wraps(function)
+    def locked(analyzer, *args, **kwargs):
+        with _reading(analyzer):
+            return function(analyzer, *args, **kwargs)
+    return locked
+
+
+def _writer(function):
+    """
+    Decorador para las funciones que modifican el analizador.
+    """
+    @functools.wraps(function)
+    def locked(analyzer, *args, **kwargs):
+        with _writing(analyzer):
+            return function(analyzer, *args, **kwargs)
+    return locked
+
+
+def _index_is_empty(analyzer):
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).is_empty(date_tree)
+
 # Funciones para realizar la carga
 
 def load_data(analyzer, crimesfile):
     """
     Carga los datos de los archivos CSV en el modelo
+
+    Si el indice por fechas esta vacio, los crimenes se agrupan primero
+    por fecha y el arbol se construye balanceado de una sola vez
+    (ver bulk_load_date_index); en un analizador concurrente toda esta
+    carga se hace con el candado de escritura. Si ya tiene datos, cada
+    crimen se agrega con add_crime.
+
+    Se recuerda el archivo, sus columnas y hasta donde se leyo
+    (analyzer['source']) para poder cargar luego solo las filas que se
+    agreguen al final del archivo con refresh_data.
     """
     crimesfile = data_dir + crimesfile
-    input_file = csv.DictReader(open(crimesfile, encoding="utf-8"),
-                                delimiter=",")
-    for crime in input_file:
-        add_crime(analyzer, crime)
+    source = new_source(crimesfile)
+    with open(crimesfile, 'rb') as file:
+        input_file = csv.DictReader(_read_lines(file, source, False),
+                                    delimiter=",")
+        source['fieldnames'] = input_file.fieldnames
+        with _writing(analyzer):
+            bulk = _index_is_empty(analyzer)
+            if bulk:
+                groups = {}
+                batch = []
+                crime_id = cs.size(analyzer['crimes'])
+                for crime in input_file:
+                    batch.append(crime)
+                    crimedate = tp.parse_date(_crime_date_parser,
+                                              crime['OCCURRED_ON_DATE'])
+                    group = groups.get(crimedate)
+                    if group is None:
+                        group = []
+                        groups[crimedate] = group
+                    group.append(crime_id)
+                    crime_id += 1
+                    if len(batch) == _load_batch_size:
+                        cs.add_rows(analyzer['crimes'], batch)
+                        batch = []
+                cs.add_rows(analyzer['crimes'], batch)
+                bulk_load_date_index(analyzer, groups)
+        if not bulk:
+            for crime in input_file:
+                add_crime(analyzer, crime)
+    analyzer['source'] = source
     return analyzer
 
 
+def new_source(crimesfile):
+    """
+    Crea el registro de la fuente de datos de una carga: el archivo, los
+    nombres de sus columnas y el numero de bytes ya leidos.
+    """
+    source = {'file': crimesfile,
+              'fieldnames': None,
+              'offset': 0
+              }
+    return source
+
+
+def _read_lines(file, source, complete_only):
+    """
+    Retorna las lineas de un archivo abierto en modo binario desde su
+    posicion actual, y avanza source['offset'] con cada linea entregada.
+
+    Si complete_only es True, se detiene en la primera linea que no
+    termina en salto de linea (una fila que se esta escribiendo).
+    """
+    for line in file:
+        if complete_only and not line.endswith(b'\n'):
+            break
+        source['offset'] += len(line)
+        yield line.decode('utf-8')
+
+
+def refresh_data(analyzer):
+    """
+    Carga las filas agregadas al final del archivo desde la ultima carga
+    (load_data, load_data_parallel o un refresh_data anterior).
+
+    Solo se leen los bytes nuevos y cada crimen se agrega con add_crime,
+    por lo que el costo es proporcional al numero de filas nuevas. Una
+    ultima linea incompleta se deja para el siguiente refresh.
+
+    Retorna el numero de crimenes agregados.
+    """
+    source = analyzer['source']
+    if source is None:
+        raise ValueError('El analizador no tiene datos cargados de un archivo')
+    if os.path.getsize(source['file']) < source['offset']:
+        raise ValueError('El archivo ' + source['file'] +
+                         ' es mas corto que en la ultima carga')
+    added = 0
+    with open(source['file'], 'rb') as file:
+        file.seek(source['offset'])
+        input_file = csv.DictReader(_read_lines(file, source, True),
+                                    fieldnames=source['fieldnames'],
+                                    delimiter=",")
+        for crime in input_file:
+            add_crime(analyzer, crime)
+            added += 1
+    return added
+
+
+def follow_data(analyzer, interval=60.0, polls=None, stop=None,
+                on_refresh=None):
+    """
+    Revisa el archivo cada interval segundos y carga las filas nuevas con
+    refresh_data.
+
+    polls limita el numero de revisiones (None: sin limite). stop puede
+    ser un threading.Event para terminar la espera desde otro hilo.
+    on_refresh, si se da, se llama con (analyzer, agregados) despues de
+    cada revision.
+
+    Retorna el total de crimenes agregados.
+    """
+    total = 0
+    done = 0
+    while polls is None or done < polls:
+        added = refresh_data(analyzer)
+        total += added
+        done += 1
+        if on_refresh is not None:
+            on_refresh(analyzer, added)
+        if polls is not None and done >= polls:
+            break
+        if stop is not None:
+            if stop.wait(interval):
+                break
+        else:
+            time.sleep(interval)
+    return total
+
+
+def bulk_load_date_index(analyzer, groups):
+    """
+    Construye el indice por fechas a partir de los crimenes agrupados
+    por fecha.
+
+    groups es un diccionario fecha -> lista de identificadores de
+    crimenes (en el orden en que se leyeron). Las fechas se ordenan y el
+    arbol se crea con build_from_sorted, por lo que queda balanceado
+    aunque el archivo venga ordenado por fecha. El indice debe estar vacio.
+    """
+    store = analyzer['crimes']
+    dates = al.new_list()
+    entries = al.new_list()
+    for crimedate in sorted(groups):
+        crime_ids = groups[crimedate]
+        datentry = new_data_entry(None)
+        offenses = {}
+        for crime_id in crime_ids:
+            al.add_last(datentry['lstcrimes'], crime_id)
+            offensegrp = cs.get_value(store, crime_id, 'OFFENSE_CODE_GROUP')
+            lstoffenses = offenses.get(offensegrp)
+            if lstoffenses is None:
+                offenses[offensegrp] = [crime_id]
+            else:
+                lstoffenses.append(crime_id)
+        for offensegrp, lstoffenses in offenses.items():
+            ofentry = new_offense_entry(offensegrp, lstoffenses[0])
+            for crime_id in lstoffenses[1:]:
+                al.add_last(ofentry['lstoffenses'], crime_id)
+            datentry['offenseIndex'] = lp.put(datentry['offenseIndex'],
+                                              offensegrp, ofentry)
+        al.add_last(dates, crimedate)
+        al.add_last(entries, datentry)
+    tree = analyzer['dateIndex']
+    analyzer['dateIndex'] = index_selector(tree).build_from_sorted(
+        dates, entries, tree['cmp_func'], tree['weight_func'])
+    return analyzer
+
+
+
+def load_data_parallel(analyzer, crimesfile, workers=None):
+    """
+    Carga los datos del archivo CSV usando varios procesos.
+
+    El archivo se divide en rangos de bytes alineados a fin de linea.
+    Cada proceso lee su rango y retorna sus crimenes agrupados por fecha
+    (un indice parcial); los indices parciales se unen en el orden del
+    archivo, por lo que el analizador queda igual que con load_data.
+
+    Se asume que ningun campo del CSV contiene saltos de linea.
+
+    workers es el numero de procesos a usar; por defecto, el numero de
+    CPUs disponibles.
+
+    Como en load_data, si el indice esta vacio la carga completa se hace
+    con el candado de escritura; si no, los crimenes de cada rango se
+    guardan y se agregan al indice con el mismo candado.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return load_data(analyzer, crimesfile)
+    crimesfile = data_dir + crimesfile
+    fieldnames, shards = _split_file(crimesfile, workers)
+    source = new_source(crimesfile)
+    source['fieldnames'] = fieldnames
+    tasks = [(crimesfile, fieldnames, start, end) for start, end in shards]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_load_shard, tasks)
+        with _writing(analyzer):
+            bulk = _index_is_empty(analyzer)
+            if bulk:
+                groups = {}
+                for crimes, partial in results:
+                    first_id = cs.add_rows(analyzer['crimes'], crimes)
+                    for crimedate, positions in partial.items():
+                        group = groups.get(crimedate)
+                        if group is None:
+                            group = []
+                            groups[crimedate] = group
+                        for pos in positions:
+                            group.append(first_id + pos)
+                bulk_load_date_index(analyzer, groups)
+        if not bulk:
+            for crimes, partial in results:
+                with _writing(analyzer):
+                    first_id = cs.add_rows(analyzer['crimes'], crimes)
+                    for crimedate in sorted(partial):
+                        for pos in partial[crimedate]:
+                            crime_id = first_id + pos
+                            crime = cs.get_row(analyzer['crimes'], crime_id)
+                            analyzer['dateIndex'] = update_date_index(
+                                analyzer['dateIndex'], crime, crime_id)
+    source['offset'] = shards[-1][1] if shards else _data_start(crimesfile)
+    analyzer['source'] = source
+    return analyzer
+
+
+def _data_start(crimesfile):
+    """
+    Posicion en bytes del final del encabezado del archivo.
+    """
+    with open(crimesfile, 'rb') as file:
+        file.readline()
+        return file.tell()
+
+
+def _split_file(crimesfile, parts):
+    """
+    Retorna los nombres de las columnas del archivo y una lista de
+    rangos de bytes (inicio, fin) que cubren las filas de datos.
+    Cada rango comienza al inicio de una linea.
+    """
+    with open(crimesfile, 'rb') as file:
+        header = file.readline()
+        data_start = file.tell()
+        file_end = file.seek(0, os.SEEK_END)
+        fieldnames = next(csv.reader([header.decode('utf-8')]))
+        bounds = [data_start]
+        chunk = (file_end - data_start) // parts
+        for i in range(1, parts):
+            position = max(data_start + i * chunk, bounds[-1])
+            file.seek(position)
+            if position > data_start:
+                file.seek(position - 1)
+                file.readline()
+            bounds.append(file.tell())
+        bounds.append(file_end)
+    shards = []
+    for i in range(len(bounds) - 1):
+        if bounds[i] < bounds[i + 1]:
+            shards.append((bounds[i], bounds[i + 1]))
+    return fieldnames, shards
+
+
+def _load_shard(task):
+    """
+    Lee un rango de bytes del archivo de crimenes (se ejecuta en un
+    proceso aparte).
+
+    Retorna la lista de crimenes del rango y un diccionario
+    fecha -> posiciones de sus crimenes en esa lista.
+    """
+    crimesfile, fieldnames, start, end = task
+    with open(crimesfile, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    input_file = csv.DictReader(io.StringIO(text, newline=''),
+                                fieldnames=fieldnames, delimiter=",")
+    crimes = []
+    partial = {}
+    for crime in input_file:
+        crimedate = tp.parse_date(_crime_date_parser,
+                                  crime['OCCURRED_ON_DATE'])
+        positions = partial.get(crimedate)
+        if positions is None:
+            positions = []
+            partial[crimedate] = positions
+        positions.append(len(crimes))
+        crimes.append(crime)
+    return crimes, partial
+
 
 # Funciones para agregar informacion al analizador
 
 
+@_writer
 def add_crime(analyzer, crime):
     """
     funcion que agrega un crimen al catalogo
     """
-    al.add_last(analyzer['crimes'], crime)
-    update_date_index(analyzer['dateIndex'], crime)
+    crime_id = cs.add_row(analyzer['crimes'], crime)
+    analyzer['dateIndex'] = update_date_index(analyzer['dateIndex'], crime,
+                                              crime_id)
     return analyzer
 
 
-def update_date_index(map, crime):
+def update_date_index(map, crime, crime_id):
     """
     Se toma la fecha del crimen y se busca si ya existe en el arbol
     dicha fecha.  Si es asi, se adiciona a su lista de crimenes
@@ -91,20 +505,34 @@ def update_date_index(map, crime):
 
     Si no se encuentra creado un nodo para esa fecha en el arbol
     se crea y se actualiza el indice de tipos de crimenes
+
+    crime_id es el identificador del crimen en el almacenamiento del
+    analizador; es lo que se guarda en el indice.
+
+    Retorna el indice actualizado. Con el indice persistente es un arbol
+    nuevo: la entrada de la fecha se copia con el crimen agregado (ver
+    copy_date_entry), para que las versiones anteriores del indice no
+    cambien.
     """
     occurreddate = crime['OCCURRED_ON_DATE']
-    crimedate = datetime.datetime.strptime(occurreddate, '%Y-%m-%d %H:%M:%S')
-    entry = bst.get(map, crimedate.date())
+    crimedate = tp.parse_date(_crime_date_parser, occurreddate)
+    tree = index_selector(map)
+    entry = tree.get(map, crimedate)
     if entry is None:
-        bst.put(map, crimedate.date(), new_data_entry(crime))
-        datentry = bst.get(map, crimedate.date())
+        datentry = new_data_entry(crime)
+        add_date_index(datentry, crime, crime_id)
+        map = tree.put(map, crimedate, datentry)
+    elif tree is pt:
+        datentry = copy_date_entry(entry, crime, crime_id)
+        map = tree.put(map, crimedate, datentry)
     else:
-        datentry = entry
-    add_date_index(datentry, crime)
+        add_date_index(entry, crime, crime_id)
+        # El peso de la entrada (date_entry_weight) crecio en 1
+        map = tree.refresh(map, crimedate, 1)
     return map
 
 
-def add_date_index(datentry, crime):
+def add_date_index(datentry, crime, crime_id):
     """
     Actualiza un indice de tipo de crimenes.  Este indice tiene una lista
     de crimenes y una tabla de hash cuya llave es el tipo de crimen y
@@ -112,19 +540,74 @@ def add_date_index(datentry, crime):
     se está consultando (dada por el nodo del arbol)
     """
     lst = datentry['lstcrimes']
-    al.add_last(lst, crime)
+    al.add_last(lst, crime_id)
     offenseIndex = datentry['offenseIndex']
     offentry = lp.get(offenseIndex, crime['OFFENSE_CODE_GROUP'])
     if (offentry is None):
-        new_entry = new_offense_entry(crime['OFFENSE_CODE_GROUP'], crime)
-        lp.put(offenseIndex, crime['OFFENSE_CODE_GROUP'], new_entry)
+        new_entry = new_offense_entry(crime['OFFENSE_CODE_GROUP'], crime_id)
+        datentry['offenseIndex'] = lp.put(offenseIndex,
+                                          crime['OFFENSE_CODE_GROUP'],
+                                          new_entry)
     else:
         lstoffenses = offentry['lstoffenses']
-        al.add_last(lstoffenses, crime)
+        al.add_last(lstoffenses, crime_id)
         pass
     return datentry
 
 
+def copy_date_entry(datentry, crime, crime_id):
+    """
+    Retorna una copia de una entrada del indice por fechas con el crimen
+    agregado, sin modificar la original.
+
+    Solo se copian la tabla de tipos de crimen y la entrada del tipo del
+    crimen; las entradas de los demas tipos se comparten. Las listas de
+    crimenes tampoco se copian: se extienden con append_shared, asi que
+    agregar un crimen no depende de cuantos tiene ya la fecha.
+    """
+    offensegrp = crime['OFFENSE_CODE_GROUP']
+    entry = {'offenseIndex': lp.copy(datentry['offenseIndex']),
+             'lstcrimes': append_shared(datentry['lstcrimes'], crime_id)}
+    ofentry = lp.get(entry['offenseIndex'], offensegrp)
+    if ofentry is None:
+        ofentry = new_offense_entry(offensegrp, crime_id)
+    else:
+        ofentry = {'offense': offensegrp,
+                   'lstoffenses': append_shared(ofentry['lstoffenses'],
+                                                crime_id)}
+    entry['offenseIndex'] = lp.put(entry['offenseIndex'], offensegrp, ofentry)
+    return entry
+
+
+def append_shared(lst, element):
+    """
+    Retorna una lista con los elementos de lst y element al final, sin
+    modificar lst.
+
+    Si lst es la ultima version de sus elementos (nadie ha agregado despues
+    de ella), la lista nueva comparte el arreglo de elementos con lst y
+    element se agrega al final: lst conserva su tamaño, asi que no lo ve.
+    Si ya se agrego despues de lst, se copian sus elementos.
+    """
+    elements = lst['elements']
+    if len(elements) == al.size(lst):
+        new_lst = dict(lst)
+        elements.append(element)
+        new_lst['size'] += 1
+        return new_lst
+    new_lst = al.sub_list(lst, 0, al.size(lst))
+    al.add_last(new_lst, element)
+    return new_lst
+
+
+def date_entry_weight(datentry):
+    """
+    Peso de una entrada del indice por fechas: su numero de crimenes.
+    El arbol acumula estos pesos para contar crimenes por rango.
+    """
+    return al.size(datentry['lstcrimes'])
+
+
 def new_data_entry(crime):
     """
     Crea una entrada en el indice por fechas, es decir en el arbol
@@ -137,7 +620,7 @@ def new_data_entry(crime):
     return entry
 
 
-def new_offense_entry(offensegrp, crime):
+def new_offense_entry(offensegrp, crime_id):
     """
     Crea una entrada en el indice por tipo de crimen, es decir en
     la tabla de hash, que se encuentra en cada nodo del arbol.
@@ -145,79 +628,399 @@ def new_offense_entry(offensegrp, crime):
     ofentry = {'offense': None, 'lstoffenses': None}
     ofentry['offense'] = offensegrp
     ofentry['lstoffenses'] = al.new_list()
-    al.add_last(ofentry['lstoffenses'], crime)
+    al.add_last(ofentry['lstoffenses'], crime_id)
     return ofentry
 
 
+# Funciones para eliminar informacion del analizador
+
+
+@_writer
+def evict_before(analyzer, date):
+    """
+    Elimina del analizador todas las fechas anteriores a la fecha dada y
+    sus crimenes.
+
+    Las fechas se quitan del indice con remove_range (en los arboles es
+    una division y una union, O(log n) sin importar cuantas fechas se
+    quiten, y en el mapa sobre arreglos un corte) y los crimenes se marcan
+    como eliminados en el almacenamiento. Como los crimenes eliminados son
+    en general los mas antiguos, quedan al inicio del almacenamiento y
+    cs.compact libera su espacio cuando son una buena parte de las filas
+    guardadas. Las consultas en cache quedan invalidadas porque cambia la
+    version del indice.
+
+    Retorna el numero de crimenes eliminados.
+    """
+    date_tree = analyzer['dateIndex']
+    date = tp.parse_date(_query_date_parser, date)
+    tree = index_selector(date_tree)
+    before = tree.rank(date_tree, date)
+    if before == 0:
+        return 0
+    first = tree.get_min(date_tree)
+    last = tree.select(date_tree, before - 1)
+    store = analyzer['crimes']
+    evicted = 0
+    for datentry in tree.iter_values(date_tree, first, last):
+        lstcrimes = datentry['lstcrimes']
+        for i in range(al.size(lstcrimes)):
+            if cs.delete_row(store, al.get_element(lstcrimes, i)):
+                evicted += 1
+    analyzer['dateIndex'] = tree.remove_range(date_tree, first, last)
+    cs.compact(store)
+    return evicted
+
+
+# ==============================
+# Funciones para guardar y restaurar el analizador
+# ==============================
+
+
+@_reader
+def save_snapshot(analyzer, path):
+    """
+    Guarda el analizador en un archivo binario.
+
+    Se guardan las columnas del almacenamiento de crimenes tal como estan
+    en memoria, la fuente de datos (para seguir con refresh_data), si el
+    analizador es concurrente y el indice por fechas (su tipo y la lista
+    de fechas con los identificadores de sus crimenes).
+
+    El archivo no usa pickle. Despues del encabezado va una descripcion en
+    JSON (valores de las columnas por diccionario, fuente de datos, tipo
+    del indice) y luego los arreglos (codigos, textos y posiciones de las
+    columnas, filas eliminadas, fechas e identificadores del indice) con
+    sus bytes tal como estan en memoria, cada uno en una posicion multiplo
+    de 8, de modo que se pueden leer directamente de un mmap del archivo.
+    """
+    date_tree = analyzer['dateIndex']
+    dates = array.array('q')
+    counts = array.array('Q')
+    members = array.array('Q')
+    for crimedate, datentry in index_selector(date_tree).iter_items(date_tree):
+        lstcrimes = datentry['lstcrimes']
+        dates.append(crimedate.toordinal())
+        counts.append(al.size(lstcrimes))
+        for j in range(al.size(lstcrimes)):
+            members.append(al.get_element(lstcrimes, j))
+
+    store, sections = cs.export_store(analyzer['crimes'])
+    index = {'type': date_tree['_type'],
+             'dates': len(sections),
+             'counts': len(sections) + 1,
+             'members': len(sections) + 2}
+    sections.extend([dates, counts, members])
+    layout = []
+    offset = 0
+    for section in sections:
+        if isinstance(section, bytearray):
+            typecode, itemsize = 'bytes', 1
+        else:
+            typecode, itemsize = section.typecode, section.itemsize
+        nbytes = len(section) * itemsize
+        layout.append([typecode, itemsize, offset, nbytes])
+        offset = _aligned(offset + nbytes)
+    meta = json.dumps({'byteorder': sys.byteorder,
+                       'concurrent': analyzer.get('lock') is not None,
+                       'source': analyzer['source'],
+                       'store': store,
+                       'index': index,
+                       'sections': layout}).encode('utf-8')
+
+    with open(path, 'wb') as file:
+        file.write(_snapshot_header.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                         len(meta)))
+        file.write(meta)
+        file.write(bytes(_aligned(file.tell()) - file.tell()))
+        for section, (_, _, _, nbytes) in zip(sections, layout):
+            file.write(section)
+            file.write(bytes(_aligned(nbytes) - nbytes))
+    return analyzer
+
+
+def _aligned(position):
+    """
+    Primera posicion multiplo de _snapshot_align desde position.
+    """
+    return -(-position // _snapshot_align) * _snapshot_align
+
+
+def load_snapshot(path, concurrent=None):
+    """
+    Crea un analizador a partir de un archivo guardado con save_snapshot.
+
+    El archivo se abre con mmap y cada arreglo se copia de una sola vez
+    desde sus bytes. Las columnas de crimenes se restauran tal como se
+    guardaron (las filas solo se crean cuando se consultan con get_crime)
+    y el indice por fechas se reconstruye balanceado sin volver a leer el
+    CSV ni convertir fechas.
+
+    El archivo solo contiene datos (JSON y arreglos de numeros), no se
+    deserializa con pickle: cargar un archivo danado o ajeno no ejecuta
+    codigo, y su contenido se valida antes de usarlo.
+
+    concurrent indica si el analizador creado es concurrente (ver
+    new_logic); por defecto, se restaura como estaba al guardarlo.
+
+    Lanza ValueError si el archivo no es un snapshot valido o si fue
+    guardado con otra version del formato (SNAPSHOT_VERSION).
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_snapshot_header.size)
+        if len(header) < _snapshot_header.size:
+            raise ValueError('Archivo de snapshot no valido: ' + path)
+        magic, version, length = _snapshot_header.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError('Archivo de snapshot no valido: ' + path)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            try:
+                data, sections = _read_snapshot(mapped, length)
+            except (KeyError, IndexError, TypeError) as exp:
+                raise ValueError('Archivo de snapshot no valido: ' +
+                                 path) from exp
+
+    try:
+        if concurrent is None:
+            concurrent = data['concurrent'] is True
+        index = data['index']
+        analyzer = new_logic(index['type'], concurrent)
+        analyzer['crimes'] = cs.import_store(data['store'], sections)
+        dates = sections[index['dates']]
+        counts = sections[index['counts']]
+        members = sections[index['members']]
+        if len(dates) != len(counts) or sum(counts) != len(members):
+            raise ValueError('Indice no valido')
+    except (KeyError, IndexError, TypeError, ValueError) as exp:
+        raise ValueError('Archivo de snapshot no valido: ' + path) from exp
+    analyzer['source'] = data['source']
+    groups = {}
+    start = 0
+    for ordinal, count in zip(dates, counts):
+        groups[datetime.date.fromordinal(ordinal)] = \
+            members[start:start + count].tolist()
+        start += count
+    bulk_load_date_index(analyzer, groups)
+    return analyzer
+
+
+def _read_snapshot(mapped, length):
+    """
+    Lee la descripcion y los arreglos de un snapshot abierto con mmap.
+    Retorna (descripcion, arreglos).
+    """
+    meta_start = _snapshot_header.size
+    data = json.loads(mapped[meta_start:meta_start + length].decode('utf-8'))
+    base = _aligned(meta_start + length)
+    swap = data['byteorder'] != sys.byteorder
+    sections = []
+    with memoryview(mapped) as view:
+        for typecode, itemsize, start, nbytes in data['sections']:
+            start += base
+            if (typecode not in _snapshot_typecodes or start < base
+                    or nbytes < 0 or start + nbytes > len(mapped)):
+                raise ValueError('Arreglo no valido')
+            if typecode == 'bytes':
+                sections.append(bytearray(view[start:start + nbytes]))
+                continue
+            section = array.array(typecode)
+            if section.itemsize != itemsize or nbytes % itemsize:
+                raise ValueError('Arreglo no valido')
+            section.frombytes(view[start:start + nbytes])
+            if swap:
+                section.byteswap()
+            sections.append(section)
+    return data, sections
+
+
 # ==============================
 # Funciones de consulta
 # ==============================
 
 
+@_reader
+def snapshot(analyzer):
+    """
+    Retorna una vista del analizador para hacer consultas: un diccionario
+    con los mismos campos, la version actual del indice por fechas y su
+    propia cache de consultas. Las funciones de consulta reciben la vista
+    igual que el analizador.
+
+    Con el indice 'PERSISTENT' la vista no cambia aunque se sigan
+    agregando crimenes al analizador: add_crime publica una version nueva
+    del indice (una sola asignacion) sin modificar la anterior, por lo que
+    la vista no necesita bloqueos ni copias. Con los demas indices la vista
+    comparte el arbol del analizador.
+
+    Los crimenes se comparten: crimes_size cuenta tambien los que se
+    agreguen despues, y los eliminados con evict_before dejan de poder
+    consultarse tambien en la vista.
+    """
+    view = dict(analyzer)
+    view['queryCache'] = new_query_cache()
+    return view
+
+
+
+@_reader
 def crimes_size(analyzer):
     """
     Número de crimenes
     """
-    return al.size(analyzer['crimes'])
+    return cs.count(analyzer['crimes'])
+
+
+@_reader
+def get_crime(analyzer, crime_id):
+    """
+    Retorna el crimen con el identificador dado, como un diccionario
+    columna -> valor igual a la fila del CSV.
+    """
+    return cs.get_row(analyzer['crimes'], crime_id)
 
 
+@_reader
 def index_height(analyzer):
     """
     Altura del arbol
     """
-    return bst.height(analyzer['dateIndex'])
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).height(date_tree)
     
 
 
+@_reader
 def index_size(analyzer):
     """
     Numero de elementos en el indice
     """
-    return bst.size(analyzer['dateIndex'])
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).size(date_tree)
     
 
 
+@_reader
+def index_stats(analyzer):
+    """
+    Reporte de la forma del indice (altura, histograma de profundidades,
+    longitud de las busquedas). Ver bst.stats.
+    """
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).stats(date_tree)
+
+
+@_reader
 def min_key(analyzer):
     """
     Llave mas pequena
     """
-    return bst.get_min(analyzer['dateIndex'])
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).get_min(date_tree)
     
 
 
+@_reader
 def max_key(analyzer):
     """
     Llave mas grande
     """
-    return bst.get_max(analyzer['dateIndex'])
+    date_tree = analyzer['dateIndex']
+    return index_selector(date_tree).get_max(date_tree)
 
 
+@_reader
 def get_crimes_by_range(analyzer, initialDate, finalDate):
     """
     Retorna el numero de crimenes en un rago de fechas.
+
+    El arbol guarda en cada nodo el total de crimenes de su subarbol,
+    por lo que la suma se hace en O(altura) con range_sum. El
+    resultado se guarda en la cache de consultas del analizador.
     """
-    total = 0
     date_tree = analyzer['dateIndex']
-    initialDate = datetime.datetime.strptime(initialDate, '%Y-%m-%d').date()
-    finalDate = datetime.datetime.strptime(finalDate, '%Y-%m-%d').date()
-
-    entries = bst.values(date_tree, initialDate, finalDate)
-    for i in range(al.size(entries)):
-        entry = al.get_element(entries, i)
-        total += al.size(entry['lstcrimes'])
+    initialDate = tp.parse_date(_query_date_parser, initialDate)
+    finalDate = tp.parse_date(_query_date_parser, finalDate)
+    key = ('range', initialDate, finalDate)
+    total, version = _cache_lookup(analyzer, key)
+    if total is _MISSING:
+        total = index_selector(date_tree).range_sum(date_tree, initialDate,
+                                                    finalDate)
+        _cache_store(analyzer, key, total, version)
     return total
     
 
 
+@_reader
+def get_dates_by_range(analyzer, initialDate, finalDate):
+    """
+    Retorna el numero de fechas distintas con crimenes en un rango de
+    fechas. Se calcula con los tamaños de los subarboles (size_range),
+    sin recorrer el rango.
+    """
+    date_tree = analyzer['dateIndex']
+    initialDate = tp.parse_date(_query_date_parser, initialDate)
+    finalDate = tp.parse_date(_query_date_parser, finalDate)
+    return index_selector(date_tree).size_range(date_tree, initialDate,
+                                                finalDate)
+
+
+@_reader
+def get_nearest_dates(analyzer, date):
+    """
+    Retorna la fecha con crimenes mas cercana antes (o igual) y despues
+    (o igual) de la fecha dada. Cualquiera de las dos es None si no
+    existe.
+    """
+    date_tree = analyzer['dateIndex']
+    date = tp.parse_date(_query_date_parser, date)
+    tree = index_selector(date_tree)
+    return tree.floor(date_tree, date), tree.ceiling(date_tree, date)
+
+
+@_reader
+def get_first_crimes(analyzer, initialDate, n):
+    """
+    Retorna una lista (array_list) con los primeros n crimenes ocurridos
+    desde la fecha dada, en orden de fecha.
+
+    El indice se recorre con iter_values, por lo que solo se visitan las
+    fechas necesarias para completar los n crimenes.
+    """
+    date_tree = analyzer['dateIndex']
+    initialDate = tp.parse_date(_query_date_parser, initialDate)
+    crimes = al.new_list()
+    if n <= 0:
+        return crimes
+    tree = index_selector(date_tree)
+    for datentry in tree.iter_values(date_tree, initialDate):
+        lstcrimes = datentry['lstcrimes']
+        for i in range(al.size(lstcrimes)):
+            crime_id = al.get_element(lstcrimes, i)
+            al.add_last(crimes, cs.get_row(analyzer['crimes'], crime_id))
+            if al.size(crimes) == n:
+                return crimes
+    return crimes
+
+
+@_reader
 def get_crimes_by_range_code(analyzer, initialDate, offensecode):
     """
     Para una fecha determinada, retorna el numero de crimenes
-    de un tipo especifico.
+    de un tipo especifico. El resultado se guarda en la cache de
+    consultas del analizador.
     """
-    initialDate = datetime.datetime.strptime(initialDate, '%Y-%m-%d').date()
-    
+    initialDate = tp.parse_date(_query_date_parser, initialDate)
+    key = ('code', initialDate, offensecode)
+    total, version = _cache_lookup(analyzer, key)
+    if total is _MISSING:
+        total = _count_crimes_by_code(analyzer, initialDate, offensecode)
+        _cache_store(analyzer, key, total, version)
+    return total
+
+
+def _count_crimes_by_code(analyzer, initialDate, offensecode):
     date_tree = analyzer['dateIndex']
-    entry = bst.get(date_tree, initialDate)
+    entry = index_selector(date_tree).get(date_tree, initialDate)
     
     if entry is None:
         return 0
@@ -229,4 +1032,114 @@ def get_crimes_by_range_code(analyzer, initialDate, offensecode):
         return 0
     
     return al.size(offense_entry['lstoffenses'])
+
+
+# ==============================
+# Cache de consultas
+# ==============================
+
+# Marca de "no esta en la cache" (un resultado puede ser 0 o None)
+_MISSING = object()
+
+
+def new_query_cache(capacity=1024):
+    """
+    Crea una cache LRU para los resultados de las consultas.
+
+    Guarda a lo sumo capacity resultados; al llenarse descarta el usado
+    hace mas tiempo. Las llaves son las consultas normalizadas (con las
+    fechas ya convertidas). La cache se vacia sola cuando el indice por
+    fechas cambia: recuerda el arbol y su version (ver bst.new_map) y
+    los compara en cada consulta.
+    """
+    cache = {'entries': OrderedDict(),
+             'capacity': capacity,
+             'tree': None,
+             'version': None,
+             'hits': 0,
+             'misses': 0,
+             'invalidations': 0,
+             'lock': threading.Lock()
+             }
+    return cache
+
+
+def _cache_lookup(analyzer, key):
+    """
+    Busca una consulta en la cache del analizador.
+
+    Retorna el resultado (o _MISSING) y la version del indice con la que
+    se debe guardar un resultado nuevo.
+    """
+    cache = analyzer.get('queryCache')
+    tree = analyzer['dateIndex']
+    version = tree.get('version')
+    if cache is None:
+        return _MISSING, version
+    with cache['lock']:
+        if cache['tree'] is not tree or cache['version'] != version:
+            if len(cache['entries']) > 0:
+                cache['invalidations'] += 1
+            cache['entries'].clear()
+            cache['tree'] = tree
+            cache['version'] = version
+        entries = cache['entries']
+        result = entries.get(key, _MISSING)
+        if result is _MISSING:
+            cache['misses'] += 1
+        else:
+            cache['hits'] += 1
+            entries.move_to_end(key)
+    return result, version
+
+
+def _cache_store(analyzer, key, result, version):
+    """
+    Guarda el resultado de una consulta calculado con la version dada del
+    indice. Si el indice cambio mientras se calculaba, no se guarda.
+    """
+    cache = analyzer.get('queryCache')
+    if cache is None:
+        return
+    tree = analyzer['dateIndex']
+    with cache['lock']:
+        if (cache['tree'] is not tree or cache['version'] != version
+                or tree.get('version') != version):
+            return
+        entries = cache['entries']
+        entries[key] = result
+        entries.move_to_end(key)
+        while len(entries) > cache['capacity']:
+            entries.popitem(last=False)
+
+
+def clear_query_cache(analyzer):
+    """
+    Vacia la cache de consultas del analizador
+    """
+    cache = analyzer.get('queryCache')
+    if cache is not None:
+        with cache['lock']:
+            cache['entries'].clear()
+    return analyzer
+
+
+def query_cache_stats(analyzer):
+    """
+    Retorna las estadisticas de la cache de consultas: aciertos,
+    fallos, tasa de aciertos, invalidaciones, tamaño y capacidad.
+    """
+    cache = analyzer.get('queryCache')
+    if cache is None:
+        return None
+    with cache['lock']:
+        lookups = cache['hits'] + cache['misses']
+        stats = {'hits': cache['hits'],
+                 'misses': cache['misses'],
+                 'hit_rate': cache['hits'] / lookups if lookups else 0.0,
+                 'invalidations': cache['invalidations'],
+                 'size': len(cache['entries']),
+                 'capacity': cache['capacity']
+                 }
+    return stats
     
\ No newline at end of file
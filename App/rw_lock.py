@@ -0,0 +1,115 @@
+"""
+ * Copyright 2020, Departamento de sistemas y Computación,
+ * Universidad de Los Andes
+ *
+ *
+ * Desarrolado para el curso ISIS1225 - Estructuras de Datos y Algoritmos
+ *
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along withthis program.  If not, see <http://www.gnu.org/licenses/>.
+ """
+
+"""
+Candado de lectores y escritor para compartir el analizador entre hilos.
+
+Varios hilos pueden tener el candado para leer al mismo tiempo; un hilo
+que escribe lo tiene solo. Un escritor que espera tiene prioridad sobre
+los lectores que llegan después, para que una carga no se quede esperando
+mientras siguen llegando consultas.
+
+El candado no es reentrante: un hilo que ya lo tiene no debe pedirlo otra
+vez (ni para leer ni para escribir).
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+def new_lock():
+    """
+    Crea un candado de lectores y escritor libre.
+    """
+    lock = {'condition': threading.Condition(threading.Lock()),
+            'readers': 0,
+            'writer': False,
+            'waiting_writers': 0
+            }
+    return lock
+
+
+def acquire_read(lock):
+    """
+    Espera hasta que no haya un escritor activo ni esperando y registra
+    un lector.
+    """
+    with lock['condition']:
+        while lock['writer'] or lock['waiting_writers'] > 0:
+            lock['condition'].wait()
+        lock['readers'] += 1
+
+
+def release_read(lock):
+    """
+    Libera el candado de un lector.
+    """
+    with lock['condition']:
+        lock['readers'] -= 1
+        if lock['readers'] == 0:
+            lock['condition'].notify_all()
+
+
+def acquire_write(lock):
+    """
+    Espera hasta que no haya lectores ni otro escritor y toma el candado
+    para escribir.
+    """
+    with lock['condition']:
+        lock['waiting_writers'] += 1
+        while lock['writer'] or lock['readers'] > 0:
+            lock['condition'].wait()
+        lock['waiting_writers'] -= 1
+        lock['writer'] = True
+
+
+def release_write(lock):
+    """
+    Libera el candado del escritor.
+    """
+    with lock['condition']:
+        lock['writer'] = False
+        lock['condition'].notify_all()
+
+
+@contextmanager
+def reading(lock):
+    """
+    Bloque ``with`` que tiene el candado para leer.
+    """
+    acquire_read(lock)
+    try:
+        yield lock
+    finally:
+        release_read(lock)
+
+
+@contextmanager
+def writing(lock):
+    """
+    Bloque ``with`` que tiene el candado para escribir.
+    """
+    acquire_write(lock)
+    try:
+        yield lock
+    finally:
+        release_write(lock)
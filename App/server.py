@@ -0,0 +1,238 @@
+"""
+ * Copyright 2020, Departamento de sistemas y Computación,
+ * Universidad de Los Andes
+ *
+ *
+ * Desarrolado para el curso ISIS1225 - Estructuras de Datos y Algoritmos
+ *
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along withthis program.  If not, see <http://www.gnu.org/licenses/>.
+ """
+
+"""
+Servidor HTTP/JSON local para consultar un analizador ya cargado.
+
+El analizador se carga una sola vez y muchos clientes pueden consultarlo al
+mismo tiempo. Las conexiones se atienden con asyncio y cada consulta se
+ejecuta en un pool de hilos (executor), de modo que una consulta costosa no
+detiene la atención de las demás conexiones.
+
+Rutas (todas con el método GET):
+
+- ``/crimes/range?initialDate=YYYY-MM-DD&finalDate=YYYY-MM-DD``
+- ``/crimes/offense?date=YYYY-MM-DD&offense=<grupo>``
+- ``/crimes/size``
+- ``/index/min``, ``/index/max``, ``/index/height``, ``/index/size``
+- ``/index``: todos los datos del índice
+- ``/index/stats``: forma del índice (ver ``logic.index_stats``)
+
+Uso:
+    python -m App.server <archivo de crimenes o snapshot> [puerto]
+"""
+
+import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import App.logic as logic
+
+
+_reasons = {200: 'OK',
+            400: 'Bad Request',
+            404: 'Not Found',
+            405: 'Method Not Allowed',
+            500: 'Internal Server Error'}
+
+
+def _param(params, name):
+    values = params.get(name)
+    if not values:
+        raise ValueError('Falta el parametro ' + name)
+    return values[0]
+
+
+def _index_info(analyzer):
+    return {'min': str(logic.min_key(analyzer)),
+            'max': str(logic.max_key(analyzer)),
+            'height': logic.index_height(analyzer),
+            'size': logic.index_size(analyzer)}
+
+
+def handle_query(analyzer, path, params):
+    """
+    Resuelve una consulta sobre el analizador.
+
+    :param path: Ruta de la consulta, por ejemplo '/crimes/range'
+    :type path: str
+    :param params: Parámetros de la consulta, como los retorna
+        ``urllib.parse.parse_qs``
+    :type params: dict
+
+    :returns: El código HTTP y el contenido de la respuesta
+    :rtype: tuple
+    """
+    try:
+        if path == '/crimes/range':
+            initial = _param(params, 'initialDate')
+            final = _param(params, 'finalDate')
+            total = logic.get_crimes_by_range(analyzer, initial, final)
+            return 200, {'initialDate': initial, 'finalDate': final,
+                         'total': total}
+        if path == '/crimes/offense':
+            date = _param(params, 'date')
+            offense = _param(params, 'offense')
+            total = logic.get_crimes_by_range_code(analyzer, date, offense)
+            return 200, {'date': date, 'offense': offense, 'total': total}
+        if path == '/crimes/size':
+            return 200, {'size': logic.crimes_size(analyzer)}
+        if path == '/index':
+            return 200, _index_info(analyzer)
+        if path == '/index/stats':
+            return 200, logic.index_stats(analyzer)
+        if path.startswith('/index/'):
+            info = _index_info(analyzer)
+            field = path[len('/index/'):]
+            if field in info:
+                return 200, {field: info[field]}
+        return 404, {'error': 'Ruta no encontrada: ' + path}
+    except ValueError as exp:
+        return 400, {'error': str(exp)}
+
+
+def _response(status, payload):
+    body = json.dumps(payload).encode('utf-8')
+    head = ('HTTP/1.1 %d %s\r\n'
+            'Content-Type: application/json; charset=utf-8\r\n'
+            'Content-Length: %d\r\n'
+            'Connection: close\r\n\r\n') % (status, _reasons[status], len(body))
+    return head.encode('latin-1') + body
+
+
+async def _handle_client(server, reader, writer):
+    """
+    Atiende una conexión: lee una petición, la resuelve en el executor y
+    escribe la respuesta.
+    """
+    try:
+        request_line = await reader.readline()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2:
+            status, payload = 400, {'error': 'Peticion no valida'}
+        elif parts[0] != 'GET':
+            status, payload = 405, {'error': 'Solo se permite GET'}
+        else:
+            url = urlsplit(parts[1])
+            loop = asyncio.get_running_loop()
+            try:
+                status, payload = await loop.run_in_executor(
+                    server['executor'], handle_query, server['analyzer'],
+                    url.path, parse_qs(url.query))
+            except Exception as exp:
+                status, payload = 500, {'error': str(exp)}
+        server['requests'] += 1
+        writer.write(_response(status, payload))
+        await writer.drain()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def new_server(analyzer, host='127.0.0.1', port=8000, workers=None):
+    """
+    Crea la configuración de un servidor para el analizador dado.
+
+    port puede ser 0 para que el sistema escoja un puerto libre; el puerto
+    real queda en server['port'] después de ``start``. workers es el
+    número de hilos para las consultas.
+    """
+    server = {'analyzer': analyzer,
+              'host': host,
+              'port': port,
+              'executor': ThreadPoolExecutor(max_workers=workers),
+              'asyncio_server': None,
+              'requests': 0
+              }
+    return server
+
+
+async def start(server):
+    """
+    Comienza a aceptar conexiones en el ciclo de eventos actual.
+    """
+    async def handler(reader, writer):
+        await _handle_client(server, reader, writer)
+
+    aserver = await asyncio.start_server(handler, server['host'],
+                                         server['port'])
+    server['asyncio_server'] = aserver
+    server['port'] = aserver.sockets[0].getsockname()[1]
+    return server
+
+
+async def stop(server):
+    """
+    Deja de aceptar conexiones y libera el pool de hilos.
+    """
+    aserver = server['asyncio_server']
+    if aserver is not None:
+        aserver.close()
+        await aserver.wait_closed()
+        server['asyncio_server'] = None
+    server['executor'].shutdown(wait=True)
+
+
+async def serve_forever(server):
+    """
+    Inicia el servidor y atiende conexiones hasta que se cancele.
+    """
+    await start(server)
+    try:
+        await server['asyncio_server'].serve_forever()
+    finally:
+        await stop(server)
+
+
+def main():
+    """
+    Carga el analizador desde un archivo de crímenes (relativo a la
+    carpeta Data) o desde un snapshot y lo publica. Un snapshot solo
+    contiene datos y se valida al cargarlo (ver logic.load_snapshot).
+    """
+    datafile = sys.argv[1] if len(sys.argv) > 1 else 'Boston Crimes//crime-utf8.csv'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    if datafile.endswith('.snapshot'):
+        analyzer = logic.load_snapshot(datafile)
+    else:
+        analyzer = logic.new_logic()
+        logic.load_data(analyzer, datafile)
+    server = new_server(analyzer, port=port)
+    print('Crimenes cargados: ' + str(logic.crimes_size(analyzer)))
+    print('Atendiendo en http://%s:%d' % (server['host'], port))
+    try:
+        asyncio.run(serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+ * Copyright 2020, Departamento de sistemas y Computación,
+ * Universidad de Los Andes
+ *
+ *
+ * Desarrolado para el curso ISIS1225 - Estructuras de Datos y Algoritmos
+ *
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along withthis program.  If not, see <http://www.gnu.org/licenses/>.
+ """
+
+"""
+Conversión de marcas de tiempo para la carga de crímenes.
+
+Un parser toma cadenas con un formato fijo (por defecto
+``'%Y-%m-%d %H:%M:%S'``) y retorna la fecha (``datetime.date``) que
+contienen. Para los formatos registrados, la cadena se corta por posición y
+la fecha resultante se memoriza por su porción de día, pues miles de filas
+comparten la misma fecha. Si la cadena no tiene la forma esperada se usa
+``datetime.strptime``, que es quien decide si la entrada es válida.
+
+En el camino rápido la hora también se valida (dígitos y rangos), aunque
+el índice solo usa la fecha: el parser acepta exactamente las mismas
+cadenas que ``strptime``.
+"""
+
+import datetime
+
+
+DEFAULT_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def _is_number(text):
+    """
+    Indica si el texto tiene solo dígitos ASCII ('0' a '9').
+    """
+    return text.isascii() and text.isdigit()
+
+
+def _slice_datetime(text):
+    """
+    Retorna la porción 'YYYY-MM-DD' de una cadena 'YYYY-MM-DD HH:MM:SS'
+    o None si la cadena no tiene esa forma o la hora no es válida.
+    """
+    if (len(text) == 19 and text[4] == '-' and text[7] == '-'
+            and text[10] == ' ' and text[13] == ':' and text[16] == ':'):
+        hour = text[11:13]
+        minute = text[14:16]
+        second = text[17:19]
+        # Con dos dígitos ASCII la comparación de cadenas es numérica
+        if (_is_number(hour + minute + second) and hour < '24'
+                and minute < '60' and second < '60'):
+            return text[:10]
+    return None
+
+
+def _slice_date(text):
+    """
+    Retorna la cadena si tiene la forma 'YYYY-MM-DD', si no None.
+    """
+    if len(text) == 10 and text[4] == '-' and text[7] == '-':
+        return text
+    return None
+
+
+def _build_date(day_text):
+    """
+    Construye la fecha a partir de una cadena 'YYYY-MM-DD'.
+    Lanza ValueError si alguno de los campos no es numérico o la fecha
+    no existe.
+    """
+    year = day_text[0:4]
+    month = day_text[5:7]
+    day = day_text[8:10]
+    if not _is_number(year + month + day):
+        raise ValueError(day_text)
+    return datetime.date(int(year), int(month), int(day))
+
+
+# Formatos con camino rápido: formato -> (slicer, builder)
+# slicer(texto) retorna la llave de la cache o None si no aplica.
+# builder(llave) retorna la fecha o lanza ValueError.
+_formats = {
+    DEFAULT_FORMAT: (_slice_datetime, _build_date),
+    DATE_FORMAT: (_slice_date, _build_date),
+}
+
+
+def register_format(fmt, slicer, builder):
+    """
+    Registra un camino rápido para un formato de fecha.
+
+    :param fmt: Formato en la notación de ``strptime``
+    :type fmt: str
+    :param slicer: Función que recibe el texto y retorna la llave de la
+        cache (la porción que identifica el día) o None si el texto no
+        tiene la forma esperada
+    :type slicer: function
+    :param builder: Función que recibe la llave y retorna la fecha.
+        Debe lanzar ValueError si la llave no es válida
+    :type builder: function
+    """
+    _formats[fmt] = (slicer, builder)
+
+
+def new_parser(fmt=DEFAULT_FORMAT, max_cache=4096):
+    """
+    Crea un parser de fechas para el formato dado.
+
+    Si el formato no tiene un camino rápido registrado, todas las
+    conversiones se hacen con ``strptime``.
+
+    :param fmt: Formato de las cadenas a convertir
+    :type fmt: str
+    :param max_cache: Número máximo de días memorizados
+    :type max_cache: int
+
+    :returns: El parser creado
+    :rtype: dict
+    """
+    slicer, builder = _formats.get(fmt, (None, None))
+    parser = {'format': fmt,
+              'slicer': slicer,
+              'builder': builder,
+              'cache': {},
+              'max_cache': max_cache,
+              'fallbacks': 0
+              }
+    return parser
+
+
+def parse_date(parser, text):
+    """
+    Retorna la fecha (``datetime.date``) contenida en el texto.
+
+    Lanza ValueError si el texto no corresponde al formato del parser.
+    """
+    slicer = parser['slicer']
+    if slicer is not None:
+        key = slicer(text)
+        if key is not None:
+            cache = parser['cache']
+            day = cache.get(key)
+            if day is not None:
+                return day
+            try:
+                day = parser['builder'](key)
+            except ValueError:
+                day = None
+            if day is not None:
+                if len(cache) >= parser['max_cache']:
+                    cache.clear()
+                cache[key] = day
+                return day
+    parser['fallbacks'] += 1
+    return datetime.datetime.strptime(text, parser['format']).date()
+
+
+def cache_size(parser):
+    """
+    Número de días memorizados por el parser
+    """
+    return len(parser['cache'])
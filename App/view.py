@@ -59,6 +59,9 @@ def print_menu():
     print("2- Cargar información de crimenes")
     print("3- Consultar crimenes en un rango de fechas")
     print("4- Consultar crimenes por codigo y fecha")
+    print("5- Guardar snapshot del analizador")
+    print("6- Cargar analizador desde snapshot")
+    print("7- Cargar crimenes nuevos agregados al archivo")
     print("0- Salir")
     print("*******************************************")
 
@@ -70,6 +73,7 @@ def main():
     # bandera para controlar el ciclo del menu
     working = True
     crimefile = 'Boston Crimes//crime-utf8.csv'
+    snapshotfile = logic.data_dir + 'Boston Crimes//crime-utf8.snapshot'
 
     # ciclo del menu
     while working:
@@ -105,6 +109,27 @@ def main():
             print("\nTotal de ofensas tipo: " + offensecode + " en esa fecha:  " +
                 str(numoffenses))
 
+        elif int(inputs[0]) == 5:
+            print("\nGuardando snapshot en: " + snapshotfile)
+            logic.save_snapshot(control, snapshotfile)
+            print("Snapshot guardado")
+
+        elif int(inputs[0]) == 6:
+            print("\nCargando analizador desde: " + snapshotfile)
+            control = logic.load_snapshot(snapshotfile)
+            print('Crimenes cargados: ' + str(logic.crimes_size(control)))
+            print('Altura del arbol: ' + str(logic.index_height(control)))
+            print('Elementos en el arbol: ' + str(logic.index_size(control)))
+            print('Menor Llave: ' + str(logic.min_key(control)))
+            print('Mayor Llave: ' + str(logic.max_key(control)))
+
+        elif int(inputs[0]) == 7:
+            print("\nBuscando crimenes nuevos en el archivo ....")
+            added = logic.refresh_data(control)
+            print('Crimenes nuevos: ' + str(added))
+            print('Crimenes cargados: ' + str(logic.crimes_size(control)))
+            print('Mayor Llave: ' + str(logic.max_key(control)))
+
         else:
             sys.exit(0)
     sys.exit(0)
@@ -0,0 +1,213 @@
+"""
+Benchmark de latencia de las tablas de hash: sondeo lineal
+(map_linear_probing) y encadenamiento separado (map_separate_chaining),
+con rehash completo y con rehash incremental.
+
+Para cada combinación inserta las mismas llaves al azar en una tabla
+pequeña (para que haga varios rehash) y luego las busca todas con
+``get``. Mide cada operación por separado y reporta el tiempo total y los
+percentiles 50, 99 y 99.9 y el máximo de la latencia, en microsegundos.
+
+Además reporta cómo quedan repartidas (``stats`` de cada tabla) llaves
+con estructura: enteros consecutivos, enteros con salto fijo y fechas
+como enteros AAAAMMDD. Cada conjunto se inserta en una tabla del tamaño
+justo (sin rehash) con los parámetros del hash escogidos con la semilla y
+con a = 1 y b = 0, que eran los parámetros fijos antes.
+
+Por último compara el sondeo lineal con Robin Hood (map_robin_hood) con
+mezclas de inserciones, eliminaciones y búsquedas (``MIXES``) sobre una
+tabla que empieza llena hasta su factor de carga. Reporta el tiempo y la
+latencia de las operaciones, el tiempo de buscar todas las llaves y
+otras tantas que no están, y el ``stats`` final con la varianza de la
+longitud de sondeo.
+
+Uso:
+    python -m Benchmarks.bench_hash_maps [llaves] [semilla]
+"""
+
+import datetime
+import gc
+import json
+import random
+import sys
+import time
+
+from DataStructures.Map import map_linear_probing as lp
+from DataStructures.Map import map_separate_chaining as sc
+from DataStructures.Map import map_robin_hood as rh
+
+
+STRUCTURES = {
+    'linear_probing': (lp, 0.5),
+    'separate_chaining': (sc, 4),
+}
+
+OPEN_ADDRESSING = {'linear_probing': lp, 'robin_hood': rh}
+
+# Fracción de inserciones, eliminaciones y búsquedas de cada mezcla
+MIXES = {
+    'insert_heavy': (0.6, 0.2, 0.2),
+    'churn': (0.4, 0.4, 0.2),
+    'delete_heavy': (0.3, 0.5, 0.2),
+}
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _summary(latencies):
+    ordered = sorted(latencies)
+    return {
+        'total_seconds': sum(ordered) / 1e9,
+        'p50_us': _percentile(ordered, 0.5) / 1e3,
+        'p99_us': _percentile(ordered, 0.99) / 1e3,
+        'p999_us': _percentile(ordered, 0.999) / 1e3,
+        'max_us': ordered[-1] / 1e3,
+    }
+
+
+def _run(module, load_factor, incremental, keys, seed):
+    clock = time.perf_counter_ns
+    put = module.put
+    get = module.get
+    my_map = module.new_map(16, load_factor, incremental=incremental,
+                            seed=seed)
+    puts = []
+    gets = []
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            my_map = put(my_map, key, key)
+            puts.append(clock() - start)
+        for key in keys:
+            start = clock()
+            get(my_map, key)
+            gets.append(clock() - start)
+    finally:
+        gc.enable()
+    return {'capacity': my_map['capacity'], 'put': _summary(puts),
+            'get': _summary(gets)}
+
+
+def _structured_keys(count):
+    first = datetime.date(2000, 1, 1)
+    return {
+        'sequential': list(range(count)),
+        'stride_1000': [key * 1000 for key in range(count)],
+        'dates': [int((first + datetime.timedelta(days)).strftime('%Y%m%d'))
+                  for days in range(count)],
+    }
+
+
+def _distribution(module, load_factor, keys, seed, fixed):
+    my_map = module.new_map(len(keys), load_factor, seed=seed)
+    if fixed:
+        my_map['scale'] = 1
+        my_map['shift'] = 0
+    for key in keys:
+        my_map = module.put(my_map, key, key)
+    return module.stats(my_map)
+
+
+def _variance(histogram):
+    count = sum(histogram.values())
+    if count == 0:
+        return 0.0
+    mean = sum(probes * n for probes, n in histogram.items()) / count
+    return sum(n * (probes - mean) ** 2
+               for probes, n in histogram.items()) / count
+
+
+def _churn(module, count, mix, operations, seed):
+    rnd = random.Random(seed)
+    clock = time.perf_counter_ns
+    my_map = module.new_map(count, 0.5, seed=seed)
+    live = []
+    next_key = 0
+    for _ in range(count):
+        key = 'K%d' % next_key
+        my_map = module.put(my_map, key, next_key)
+        live.append(key)
+        next_key += 1
+    inserts, deletes, _ = mix
+    latencies = []
+    gc.disable()
+    try:
+        for _ in range(operations):
+            choice = rnd.random()
+            if choice < inserts or not live:
+                key = 'K%d' % next_key
+                start = clock()
+                my_map = module.put(my_map, key, next_key)
+                next_key += 1
+                latencies.append(clock() - start)
+                live.append(key)
+            elif choice < inserts + deletes:
+                i = rnd.randrange(len(live))
+                key = live[i]
+                live[i] = live[-1]
+                live.pop()
+                start = clock()
+                my_map = module.remove(my_map, key)
+                latencies.append(clock() - start)
+            else:
+                key = 'K%d' % rnd.randrange(next_key)
+                start = clock()
+                module.get(my_map, key)
+                latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    entry = {'operations': _summary(latencies)}
+    start = time.perf_counter()
+    for key in live:
+        module.get(my_map, key)
+    entry['get_hits_seconds'] = time.perf_counter() - start
+    misses = ['K%d' % key for key in range(next_key, next_key + len(live))]
+    start = time.perf_counter()
+    for key in misses:
+        module.get(my_map, key)
+    entry['get_misses_seconds'] = time.perf_counter() - start
+    report = module.stats(my_map)
+    report['probe_variance'] = _variance(report['probe_histogram'])
+    del report['probe_histogram']
+    entry['stats'] = report
+    return entry
+
+
+def run(count=200000, seed=1225):
+    """
+    Ejecuta el benchmark y retorna un diccionario con los resultados.
+    """
+    rnd = random.Random(seed)
+    keys = ['K%d' % key for key in rnd.sample(range(count * 10), count)]
+    result = {'keys': count, 'seed': seed,
+              'python': sys.version.split()[0], 'structures': {}}
+    for name, (module, load_factor) in STRUCTURES.items():
+        for incremental in (False, True):
+            label = name + ('_incremental' if incremental else '')
+            result['structures'][label] = _run(module, load_factor,
+                                               incremental, keys, seed)
+
+    result['distribution'] = {}
+    for pattern, pattern_keys in _structured_keys(min(count, 20000)).items():
+        entry = result['distribution'][pattern] = {}
+        for name, (module, load_factor) in STRUCTURES.items():
+            entry[name] = _distribution(module, load_factor, pattern_keys,
+                                        seed, False)
+            entry[name + '_fixed'] = _distribution(module, load_factor,
+                                                   pattern_keys, seed, True)
+
+    result['mixes'] = {}
+    for mix_name, mix in MIXES.items():
+        entry = result['mixes'][mix_name] = {}
+        for name, module in OPEN_ADDRESSING.items():
+            entry[name] = _churn(module, count, mix, count * 2, seed)
+    return result
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1225
+    print(json.dumps(run(count, seed), indent=2))
@@ -0,0 +1,222 @@
+"""
+Benchmark de punta a punta de la carga y las consultas del laboratorio.
+
+Genera (o reutiliza) un archivo sintético de crímenes en la carpeta Data
+con ``Benchmarks.crime_generator``, lo carga con ``logic.load_data`` y mide:
+
+- la carga: tiempo, filas por segundo, memoria máxima y altura del árbol;
+- ``get_crimes_by_range`` con ventanas de varios anchos (en días);
+- ``get_crimes_by_range_code`` con fechas y grupos de delito al azar;
+- las mismas consultas repetidas, para ver el efecto de la cache.
+
+Las consultas de las tres primeras mediciones se hacen sin cache. Los
+resultados se imprimen como JSON.
+
+Uso:
+    python -m Benchmarks.bench_logic [filas] [semilla] [opciones]
+
+Ver ``python -m Benchmarks.bench_logic --help``.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from App import logic
+from Benchmarks import crime_generator as gen
+
+
+DEFAULT_WIDTHS = (1, 7, 30, 365, 1200)
+
+
+def dataset_path(rows, seed, order='random'):
+    """
+    Ruta, relativa a la carpeta Data, del archivo sintético para los
+    parámetros dados.
+    """
+    return 'Benchmarks//crimes-%d-%d-%s.csv' % (rows, seed, order)
+
+
+def ensure_dataset(rows, seed, order='random'):
+    """
+    Genera el archivo sintético si no existe y retorna su ruta relativa a
+    la carpeta Data.
+    """
+    crimesfile = dataset_path(rows, seed, order)
+    fullpath = logic.data_dir + crimesfile
+    if not os.path.exists(fullpath):
+        os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+        partial = fullpath + '.partial'
+        gen.write_csv(partial, rows, seed, order)
+        os.replace(partial, fullpath)
+    return crimesfile
+
+
+def percentiles(samples):
+    """
+    Retorna el mínimo, la media, los percentiles 50, 90, 99 y el máximo
+    (en microsegundos) de una lista de duraciones en segundos.
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    if count == 0:
+        return {}
+
+    def pick(fraction):
+        return ordered[min(count - 1, int(fraction * count))] * 1e6
+
+    return {'count': count,
+            'min_us': ordered[0] * 1e6,
+            'mean_us': sum(ordered) / count * 1e6,
+            'p50_us': pick(0.50),
+            'p90_us': pick(0.90),
+            'p99_us': pick(0.99),
+            'max_us': ordered[-1] * 1e6,
+            'queries_per_sec': count / sum(ordered) if sum(ordered) else None}
+
+
+def _time_calls(function, analyzer, arguments):
+    samples = []
+    clock = time.perf_counter
+    for first, second in arguments:
+        start = clock()
+        function(analyzer, first, second)
+        samples.append(clock() - start)
+    return samples
+
+
+def bench_load(crimesfile, rows, trace_memory=True):
+    """
+    Carga el archivo y mide el tiempo de carga. Si trace_memory es True,
+    hace una segunda carga con tracemalloc para medir la memoria máxima
+    (tracemalloc hace la carga mucho más lenta, por eso no se mide el
+    tiempo en esa carga).
+    """
+    gc.collect()
+    start = time.perf_counter()
+    analyzer = logic.new_logic()
+    logic.load_data(analyzer, crimesfile)
+    seconds = time.perf_counter() - start
+    result = {'seconds': seconds,
+              'rows_per_sec': rows / seconds if seconds else None,
+              'crimes': logic.crimes_size(analyzer),
+              'index_size': logic.index_size(analyzer),
+              'index_height': logic.index_height(analyzer),
+              'peak_memory_bytes': None}
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        traced = logic.new_logic()
+        logic.load_data(traced, crimesfile)
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del traced
+        gc.collect()
+    return analyzer, result
+
+
+def _range_arguments(rnd, analyzer, width, queries):
+    first = logic.min_key(analyzer)
+    last = logic.max_key(analyzer)
+    span = max((last - first).days - width + 1, 1)
+    arguments = []
+    for _ in range(queries):
+        initial = first + datetime.timedelta(days=rnd.randrange(span))
+        final = initial + datetime.timedelta(days=width - 1)
+        arguments.append((initial.isoformat(), final.isoformat()))
+    return arguments
+
+
+def _code_arguments(rnd, analyzer, queries):
+    first = logic.min_key(analyzer)
+    span = (logic.max_key(analyzer) - first).days + 1
+    groups = list(gen.OFFENSE_GROUPS)
+    arguments = []
+    for _ in range(queries):
+        day = first + datetime.timedelta(days=rnd.randrange(span))
+        arguments.append((day.isoformat(), rnd.choice(groups)))
+    return arguments
+
+
+def bench_queries(analyzer, seed=1225, queries=2000, widths=DEFAULT_WIDTHS):
+    """
+    Mide las consultas sobre un analizador ya cargado.
+    """
+    rnd = random.Random(seed)
+    cache = analyzer.get('queryCache')
+    analyzer['queryCache'] = None
+    try:
+        ranges = {}
+        for width in widths:
+            arguments = _range_arguments(rnd, analyzer, width, queries)
+            samples = _time_calls(logic.get_crimes_by_range, analyzer,
+                                  arguments)
+            ranges[str(width)] = percentiles(samples)
+        arguments = _code_arguments(rnd, analyzer, queries)
+        codes = percentiles(_time_calls(logic.get_crimes_by_range_code,
+                                        analyzer, arguments))
+    finally:
+        analyzer['queryCache'] = cache
+
+    cached = None
+    if cache is not None:
+        # Pocas consultas distintas repetidas muchas veces
+        logic.clear_query_cache(analyzer)
+        hot = _range_arguments(rnd, analyzer, 30, 50)
+        arguments = [hot[rnd.randrange(len(hot))] for _ in range(queries)]
+        cached = percentiles(_time_calls(logic.get_crimes_by_range,
+                                         analyzer, arguments))
+        cached['stats'] = logic.query_cache_stats(analyzer)
+    return {'range_by_width_days': ranges,
+            'range_code': codes,
+            'range_cached': cached}
+
+
+def run(rows=100000, seed=1225, order='random', queries=2000,
+        widths=DEFAULT_WIDTHS, trace_memory=True):
+    """
+    Ejecuta el benchmark completo y retorna un diccionario con los
+    resultados.
+    """
+    crimesfile = ensure_dataset(rows, seed, order)
+    analyzer, load = bench_load(crimesfile, rows, trace_memory)
+    result = {'rows': rows,
+              'seed': seed,
+              'order': order,
+              'file': crimesfile,
+              'python': sys.version.split()[0],
+              'load': load,
+              'queries': bench_queries(analyzer, seed, queries, widths)}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', nargs='?', type=int, default=100000)
+    parser.add_argument('seed', nargs='?', type=int, default=1225)
+    parser.add_argument('--order', choices=('random', 'sorted'),
+                        default='random')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--widths', type=int, nargs='+',
+                        default=list(DEFAULT_WIDTHS))
+    parser.add_argument('--no-memory', action='store_true',
+                        help='no medir la memoria con tracemalloc')
+    parser.add_argument('--output', help='archivo donde guardar el JSON')
+    args = parser.parse_args(argv)
+    result = run(args.rows, args.seed, args.order, args.queries,
+                 tuple(args.widths), not args.no_memory)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark de los mapas ordenados: árbol binario de búsqueda (bst), árbol
+rojo-negro (rbt) y mapa sobre arreglos ordenados (sorted_array_map).
+
+Para cada estructura mide, con las mismas llaves enteras al azar:
+
+- la construcción con ``put`` (llaves en desorden) y con
+  ``build_from_sorted``, y la memoria de la estructura construida;
+- ``get`` de todas las llaves;
+- recorridos de rangos de varios anchos con ``iter_values`` y sumas de
+  rangos con ``range_sum``.
+
+Uso:
+    python -m Benchmarks.bench_ordered_maps [llaves] [semilla]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from DataStructures.List import array_list as al
+from DataStructures.Tree import binary_search_tree as bst
+from DataStructures.Tree import red_black_tree as rbt
+from DataStructures.Tree import sorted_array_map as sam
+
+
+STRUCTURES = {'bst': bst, 'rbt': rbt, 'sorted_array': sam}
+
+RANGE_WIDTHS = (10, 1000, 100000)
+
+
+def _weight(value):
+    return value
+
+
+def _build(module, keys):
+    tree = module.new_map(weight_func=_weight)
+    for key in keys:
+        module.put(tree, key, key)
+    return tree
+
+
+def _memory(module, keys):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = _build(module, keys)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tree
+    return used
+
+
+def _time(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _get_all(module, tree, keys):
+    get = module.get
+    for key in keys:
+        get(tree, key)
+
+
+def _scan(module, tree, ranges):
+    total = 0
+    for lo, hi in ranges:
+        for value in module.iter_values(tree, lo, hi):
+            total += value
+    return total
+
+
+def _sums(module, tree, ranges):
+    total = 0
+    for lo, hi in ranges:
+        total += module.range_sum(tree, lo, hi)
+    return total
+
+
+def run(count=100000, seed=1225, queries=200):
+    """
+    Ejecuta el benchmark y retorna un diccionario con los resultados.
+    """
+    rnd = random.Random(seed)
+    keys = rnd.sample(range(count * 10), count)
+    ordered = sorted(keys)
+    sorted_keys = al.new_list()
+    for key in ordered:
+        al.add_last(sorted_keys, key)
+    ranges = {}
+    for width in RANGE_WIDTHS:
+        starts = [rnd.randrange(count * 10) for _ in range(queries)]
+        ranges[width] = [(lo, lo + width * 10) for lo in starts]
+
+    result = {'keys': count, 'seed': seed, 'queries': queries,
+              'python': sys.version.split()[0], 'structures': {}}
+    for name, module in STRUCTURES.items():
+        tree = _build(module, keys)
+        entry = {
+            'put_seconds': _time(_build, module, keys),
+            'build_from_sorted_seconds': _time(module.build_from_sorted,
+                                               sorted_keys, sorted_keys,
+                                               module.dflt_tree_node_cmp,
+                                               _weight),
+            'memory_bytes': _memory(module, keys),
+            'height': module.height(tree),
+            'get_seconds': _time(_get_all, module, tree, keys),
+            'scan_seconds': {},
+            'range_sum_us': {},
+        }
+        entry['bytes_per_key'] = entry['memory_bytes'] / count
+        for width, windows in ranges.items():
+            entry['scan_seconds'][str(width)] = _time(_scan, module, tree,
+                                                      windows)
+            seconds = _time(_sums, module, tree, windows)
+            entry['range_sum_us'][str(width)] = seconds / queries * 1e6
+        result['structures'][name] = entry
+    return result
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1225
+    print(json.dumps(run(count, seed), indent=2))
@@ -0,0 +1,75 @@
+"""
+Benchmark del parser de fechas usado en la carga de crímenes.
+
+Compara ``datetime.strptime`` (el método usado antes en
+``logic.update_date_index``) contra ``timestamp_parser.parse_date`` sobre
+marcas de tiempo sintéticas con la misma forma que ``OCCURRED_ON_DATE``.
+
+Uso:
+    python -m Benchmarks.bench_timestamp_parser [filas] [semilla]
+"""
+
+import datetime
+import json
+import random
+import sys
+import time
+
+from App import timestamp_parser as tp
+
+
+def generate_timestamps(rows, seed=1225, days=1200):
+    """
+    Genera ``rows`` marcas de tiempo 'YYYY-MM-DD HH:MM:SS' repartidas en
+    ``days`` días consecutivos, casi ordenadas como en el archivo real.
+    """
+    rnd = random.Random(seed)
+    start = datetime.datetime(2015, 6, 15)
+    step = days * 86400 / max(rows, 1)
+    stamps = []
+    for i in range(rows):
+        offset = int(i * step + rnd.uniform(-3600, 3600))
+        moment = start + datetime.timedelta(seconds=max(offset, 0))
+        stamps.append(moment.strftime(tp.DEFAULT_FORMAT))
+    return stamps
+
+
+def _time_baseline(stamps):
+    start = time.perf_counter()
+    for text in stamps:
+        crimedate = datetime.datetime.strptime(text, tp.DEFAULT_FORMAT)
+        crimedate.date()
+        crimedate.date()
+    return time.perf_counter() - start
+
+
+def _time_parser(stamps):
+    parser = tp.new_parser(tp.DEFAULT_FORMAT)
+    start = time.perf_counter()
+    for text in stamps:
+        tp.parse_date(parser, text)
+    return time.perf_counter() - start
+
+
+def run(rows=200000, seed=1225):
+    """
+    Ejecuta el benchmark y retorna un diccionario con los resultados.
+    """
+    stamps = generate_timestamps(rows, seed)
+    baseline = _time_baseline(stamps)
+    parsed = _time_parser(stamps)
+    result = {
+        'rows': rows,
+        'strptime_seconds': baseline,
+        'parser_seconds': parsed,
+        'strptime_rows_per_sec': rows / baseline,
+        'parser_rows_per_sec': rows / parsed,
+        'speedup': baseline / parsed,
+    }
+    return result
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1225
+    print(json.dumps(run(rows, seed), indent=2))
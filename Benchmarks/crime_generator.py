@@ -0,0 +1,228 @@
+"""
+Generador de archivos sintéticos de crímenes de Boston.
+
+Escribe archivos CSV con las mismas columnas que ``crime-utf8.csv`` y con
+distribuciones parecidas a las del archivo real: fechas entre junio de 2015
+y septiembre de 2018, grupos de delitos y distritos con sus frecuencias
+aproximadas, horas con más crímenes en la tarde y coordenadas alrededor del
+centro de cada distrito (algunas filas sin ubicación, como en el archivo
+real). El archivo se escribe fila por fila, por lo que sirve para tamaños
+de 10 mil a 10 millones de filas.
+
+La misma semilla produce siempre el mismo archivo.
+
+Uso:
+    python -m Benchmarks.crime_generator <filas> <archivo> [semilla] [orden]
+
+orden puede ser 'random' (por defecto) o 'sorted' (filas ordenadas por
+fecha).
+"""
+
+import csv
+import datetime
+import random
+import sys
+
+
+FIELDNAMES = ['INCIDENT_NUMBER', 'OFFENSE_CODE', 'OFFENSE_CODE_GROUP',
+              'OFFENSE_DESCRIPTION', 'DISTRICT', 'REPORTING_AREA',
+              'SHOOTING', 'OCCURRED_ON_DATE', 'YEAR', 'MONTH', 'DAY_OF_WEEK',
+              'HOUR', 'UCR_PART', 'STREET', 'Lat', 'Long', 'Location']
+
+FIRST_DATE = datetime.datetime(2015, 6, 15)
+LAST_DATE = datetime.datetime(2018, 9, 3, 23, 59, 59)
+
+# Grupo de delito -> (peso en %, parte UCR, [(codigo, descripcion)])
+OFFENSE_GROUPS = {
+    'Motor Vehicle Accident Response': (11.6, 'Part Three', [
+        ('3831', 'M/V - LEAVING SCENE - PROPERTY DAMAGE'),
+        ('3801', 'M/V ACCIDENT - OTHER'),
+        ('3802', 'M/V ACCIDENT - PROPERTY DAMAGE')]),
+    'Larceny': (8.1, 'Part One', [
+        ('619', 'LARCENY ALL OTHERS'),
+        ('614', 'LARCENY THEFT FROM BUILDING'),
+        ('613', 'LARCENY SHOPLIFTING')]),
+    'Medical Assistance': (7.4, 'Part Three', [
+        ('3006', 'SICK/INJURED/MEDICAL - PERSON'),
+        ('3005', 'SICK ASSIST')]),
+    'Investigate Person': (5.9, 'Part Three', [
+        ('3115', 'INVESTIGATE PERSON')]),
+    'Other': (5.6, 'Part Two', [
+        ('3410', 'TOWED MOTOR VEHICLE'),
+        ('2907', 'VAL - VIOLATION OF AUTO LAW - OTHER')]),
+    'Drug Violation': (5.1, 'Part Two', [
+        ('1843', 'DRUGS - POSS CLASS B - INTENT TO MFR DIST DISP'),
+        ('1841', 'DRUGS - POSS CLASS A - INTENT TO MFR DIST DISP')]),
+    'Simple Assault': (4.9, 'Part Two', [
+        ('801', 'ASSAULT SIMPLE - BATTERY'),
+        ('802', 'ASSAULT SIMPLE - BATTERY')]),
+    'Vandalism': (4.8, 'Part Two', [
+        ('1402', 'VANDALISM')]),
+    'Verbal Disputes': (4.1, 'Part Three', [
+        ('3301', 'VERBAL DISPUTE')]),
+    'Towed': (3.5, 'Part Three', [
+        ('3410', 'TOWED MOTOR VEHICLE')]),
+    'Investigate Property': (3.5, 'Part Three', [
+        ('3125', 'INVESTIGATE PROPERTY')]),
+    'Larceny From Motor Vehicle': (3.4, 'Part One', [
+        ('617', 'LARCENY THEFT FROM MV - NON-ACCESSORY')]),
+    'Property Lost': (3.1, 'Part Three', [
+        ('3207', 'PROPERTY - LOST')]),
+    'Warrant Arrests': (2.9, 'Part Three', [
+        ('3125', 'WARRANT ARREST')]),
+    'Aggravated Assault': (2.5, 'Part One', [
+        ('413', 'ASSAULT - AGGRAVATED - BATTERY'),
+        ('423', 'ASSAULT - AGGRAVATED')]),
+    'Violations': (2.0, 'Part Two', [
+        ('2629', 'HARASSMENT')]),
+    'Fraud': (1.9, 'Part Two', [
+        ('1106', 'FRAUD - CREDIT CARD / ATM FRAUD')]),
+    'Residential Burglary': (1.8, 'Part One', [
+        ('520', 'BURGLARY - RESIDENTIAL - FORCE')]),
+    'Missing Person Located': (1.7, 'Part Three', [
+        ('3201', 'MISSING PERSON - LOCATED')]),
+    'Auto Theft': (1.5, 'Part One', [
+        ('724', 'AUTO THEFT')]),
+    'Robbery': (1.5, 'Part One', [
+        ('301', 'ROBBERY - STREET')]),
+    'Harassment': (1.5, 'Part Two', [
+        ('2647', 'THREATS TO DO BODILY HARM')]),
+    'Property Found': (1.5, 'Part Three', [
+        ('3109', 'PROPERTY - FOUND')]),
+    'Missing Person Reported': (1.2, 'Part Three', [
+        ('3207', 'MISSING PERSON')]),
+    'Confidence Games': (0.9, 'Part Two', [
+        ('1107', 'FRAUD - IMPERSONATION')]),
+    'Police Service Incidents': (0.8, 'Part Three', [
+        ('3114', 'SERVICE TO OTHER PD INSIDE OF MA.')]),
+    'Fire Related Reports': (0.7, 'Part Three', [
+        ('2900', 'FIRE REPORT - HOUSE, BUILDING, ETC.')]),
+    'Commercial Burglary': (0.4, 'Part One', [
+        ('540', 'BURGLARY - COMMERICAL - FORCE')]),
+    'Homicide': (0.05, 'Part One', [
+        ('111', 'MURDER, NON-NEGLIGIENT MANSLAUGHTER')]),
+}
+
+# Distrito -> (peso en %, latitud, longitud del centro)
+DISTRICTS = {
+    'B2': (15.8, 42.3196, -71.0838),
+    'C11': (13.3, 42.2971, -71.0597),
+    'D4': (13.1, 42.3414, -71.0772),
+    'A1': (11.1, 42.3571, -71.0584),
+    'B3': (11.0, 42.2842, -71.0913),
+    'C6': (7.3, 42.3372, -71.0494),
+    'D14': (6.2, 42.3503, -71.1472),
+    'E18': (5.5, 42.2574, -71.1243),
+    'E13': (5.5, 42.3098, -71.1046),
+    'E5': (4.2, 42.2868, -71.1484),
+    'A7': (4.1, 42.3727, -71.0342),
+    'A15': (2.0, 42.3783, -71.0603),
+    '': (0.5, 42.3200, -71.0800),
+}
+
+# Peso relativo de cada hora del día (0 a 23)
+HOUR_WEIGHTS = [4.6, 2.9, 2.5, 1.5, 1.1, 1.1, 1.6, 2.6, 4.2, 4.5, 4.9, 4.8,
+                6.0, 4.9, 5.0, 5.2, 5.9, 6.2, 6.0, 5.4, 4.8, 4.6, 4.2, 3.5]
+
+STREETS = ['WASHINGTON ST', 'BLUE HILL AVE', 'BOYLSTON ST', 'DORCHESTER AVE',
+           'TREMONT ST', 'HARRISON AVE', 'MASSACHUSETTS AVE', 'CENTRE ST',
+           'COMMONWEALTH AVE', 'HYDE PARK AVE', 'RIVER ST', 'GENEVA AVE',
+           'COLUMBIA RD', 'HUNTINGTON AVE', 'BEACON ST', 'CAMBRIDGE ST',
+           'MAIN ST', 'WARREN ST', 'COLUMBUS AVE', 'ADAMS ST']
+
+# Fraccion de filas sin ubicación (Lat y Long vacíos o -1)
+NO_LOCATION = 0.06
+
+
+def _choices(rnd, table, count):
+    """
+    Escoge count llaves de la tabla segun el peso (primer elemento de cada
+    valor).
+    """
+    keys = list(table)
+    weights = [table[key][0] for key in keys]
+    return rnd.choices(keys, weights, k=count)
+
+
+def generate_rows(rows, seed=1225, order='random', chunk=8192):
+    """
+    Genera las filas del archivo (listas en el orden de FIELDNAMES).
+
+    :param rows: Número de filas
+    :type rows: int
+    :param seed: Semilla del generador aleatorio
+    :type seed: int
+    :param order: 'random' para fechas en desorden o 'sorted' para filas
+        ordenadas por fecha
+    :type order: str
+    """
+    if order not in ('random', 'sorted'):
+        raise ValueError('Orden no valido: ' + str(order))
+    rnd = random.Random(seed)
+    span = int((LAST_DATE - FIRST_DATE).total_seconds()) // 86400 + 1
+    hours = list(range(24))
+    produced = 0
+    while produced < rows:
+        count = min(chunk, rows - produced)
+        days = [rnd.randrange(span) for _ in range(count)]
+        if order == 'sorted':
+            # Fechas crecientes repartidas uniformemente en el rango
+            days = [(produced + i) * span // rows for i in range(count)]
+        groups = _choices(rnd, OFFENSE_GROUPS, count)
+        districts = _choices(rnd, DISTRICTS, count)
+        hour_list = rnd.choices(hours, HOUR_WEIGHTS, k=count)
+        for i in range(count):
+            number = produced + i
+            day = FIRST_DATE + datetime.timedelta(days=days[i])
+            moment = day.replace(hour=hour_list[i],
+                                 minute=rnd.randrange(60),
+                                 second=rnd.randrange(60))
+            group = groups[i]
+            weight, ucr, codes = OFFENSE_GROUPS[group]
+            code, description = codes[rnd.randrange(len(codes))]
+            district = districts[i]
+            weight, lat, lon = DISTRICTS[district]
+            if rnd.random() < NO_LOCATION:
+                if rnd.random() < 0.5:
+                    lat_text, long_text = '', ''
+                    location = '(0.00000000, 0.00000000)'
+                else:
+                    lat_text, long_text = '-1', '-1'
+                    location = '(-1.00000000, -1.00000000)'
+            else:
+                lat += rnd.gauss(0, 0.012)
+                lon += rnd.gauss(0, 0.012)
+                lat_text, long_text = '%.8f' % lat, '%.8f' % lon
+                location = '(%s, %s)' % (lat_text, long_text)
+            shooting = 'Y' if rnd.random() < 0.003 else ''
+            yield ['I%09d' % (182000000 - number), code, group, description,
+                   district, str(rnd.randint(1, 960)), shooting,
+                   moment.strftime('%Y-%m-%d %H:%M:%S'), str(moment.year),
+                   str(moment.month), moment.strftime('%A'),
+                   str(moment.hour), ucr, rnd.choice(STREETS), lat_text,
+                   long_text, location]
+        produced += count
+
+
+def write_csv(path, rows, seed=1225, order='random'):
+    """
+    Escribe un archivo CSV sintético de crímenes en path.
+
+    :returns: El número de filas escritas
+    :rtype: int
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(generate_rows(rows, seed, order))
+    return rows
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    rows = int(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 1225
+    order = sys.argv[4] if len(sys.argv) > 4 else 'random'
+    write_csv(sys.argv[2], rows, seed, order)
@@ -0,0 +1,42 @@
+from DataStructures.List import single_linked_list as sl
+
+
+def setup_list(count):
+    my_list = sl.new_list()
+    for element in range(1, count + 1):
+        sl.add_last(my_list, element)
+    return my_list
+
+
+def node_infos(my_list):
+    infos = []
+    node = my_list["first"]
+    while node is not None:
+        infos.append(node["info"])
+        node = node["next"]
+    return infos
+
+
+def test_delete_last_then_add_last():
+    my_list = setup_list(3)
+    sl.delete_element(my_list, 3)
+    assert sl.last_element(my_list) == 2
+    sl.add_last(my_list, 4)
+    assert node_infos(my_list) == [1, 2, 4]
+    assert sl.size(my_list) == 3
+    assert sl.last_element(my_list) == 4
+    assert sl.get_element(my_list, 2) == 4
+
+    # Al eliminar el único elemento la lista queda vacía
+    single = setup_list(1)
+    sl.delete_element(single, 1)
+    assert sl.last_element(single) is None
+    sl.add_last(single, 5)
+    assert node_infos(single) == [5]
+    assert sl.last_element(single) == 5
+
+    # Eliminar otro elemento no cambia el último
+    sl.delete_element(my_list, 1)
+    sl.delete_element(my_list, 1)
+    sl.add_last(my_list, 6)
+    assert node_infos(my_list) == [4, 6]
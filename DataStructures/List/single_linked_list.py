@@ -266,6 +266,8 @@ def delete_element(my_list, pos):
         searchpos = 1
         if (pos == 1):
             my_list['first'] = my_list['first']['next']
+            if my_list['first'] is None:
+                my_list['last'] = None
             my_list['size'] -= 1
         elif(pos > 1):
             while searchpos < pos:
@@ -273,6 +275,8 @@ def delete_element(my_list, pos):
                 prev = node
                 node = node['next']
             prev['next'] = node['next']
+            if node is my_list['last']:
+                my_list['last'] = prev
             my_list['size'] -= 1
         return my_list
     except Exception as exp:
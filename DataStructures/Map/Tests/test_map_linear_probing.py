@@ -0,0 +1,217 @@
+from DataStructures.Map import map_linear_probing as lp
+from DataStructures.List import array_list as al
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_map = lp.new_map(num_elements=10, load_factor=0.5)
+
+    return empty_map
+
+
+def setup_keys(count):
+    my_map = lp.new_map(num_elements=10, load_factor=0.5)
+    for key in range(count):
+        my_map = lp.put(my_map, key, key * 10)
+
+    return my_map
+
+
+@handle_not_implemented
+def test_new_map():
+    empty_map = setup_tests()
+
+    assert lp.is_empty(empty_map)
+    assert lp.size(empty_map) == 0
+    assert empty_map['capacity'] == 23
+    assert lp.get(empty_map, 1) is None
+    assert not lp.contains(empty_map, 1)
+
+
+@handle_not_implemented
+def test_put_get():
+    my_map = setup_tests()
+    my_map = lp.put(my_map, "A", 1)
+    my_map = lp.put(my_map, "B", 2)
+
+    assert lp.size(my_map) == 2
+    assert lp.get(my_map, "A") == 1
+    assert lp.get(my_map, "B") == 2
+    assert lp.get(my_map, "C") is None
+
+    # Reemplazar el valor de una llave existente
+    my_map = lp.put(my_map, "A", 10)
+    assert lp.size(my_map) == 2
+    assert lp.get(my_map, "A") == 10
+
+
+@handle_not_implemented
+def test_rehash():
+    my_map = setup_keys(100)
+
+    assert lp.size(my_map) == 100
+    assert my_map['capacity'] > 200
+    assert my_map['current_factor'] <= my_map['limit_factor']
+    for key in range(100):
+        assert lp.get(my_map, key) == key * 10
+
+
+@handle_not_implemented
+def test_rehash_compacts_tombstones():
+    for incremental in (False, True):
+        my_map = lp.new_map(num_elements=10, load_factor=0.5,
+                            incremental=incremental)
+        for key in range(4):
+            my_map = lp.put(my_map, key, key * 10)
+        capacity = my_map['capacity']
+        # Agregar y eliminar llaves deja tumbas que provocan rehashes, pero
+        # con pocas llaves vivas la tabla solo se compacta
+        for key in range(100, 3100):
+            my_map = lp.put(my_map, key, key)
+            my_map = lp.remove(my_map, key)
+        assert my_map['capacity'] == capacity
+        assert lp.size(my_map) == 4
+        assert my_map['deleted'] < capacity
+        for key in range(4):
+            assert lp.get(my_map, key) == key * 10
+
+        # Con suficientes llaves vivas el rehash sí duplica la capacidad
+        for key in range(4, 20):
+            my_map = lp.put(my_map, key, key * 10)
+        assert my_map['capacity'] > capacity
+        for key in range(20):
+            assert lp.get(my_map, key) == key * 10
+
+
+@handle_not_implemented
+def test_collisions():
+    # Llaves con el mismo hash (hash(-1) == hash(-2)) en la misma casilla
+    my_map = setup_tests()
+    my_map = lp.put(my_map, -1, "a")
+    my_map = lp.put(my_map, -2, "b")
+
+    assert hash(-1) == hash(-2)
+    assert lp.get(my_map, -1) == "a"
+    assert lp.get(my_map, -2) == "b"
+
+
+@handle_not_implemented
+def test_remove():
+    my_map = setup_keys(20)
+    my_map = lp.remove(my_map, 5)
+    my_map = lp.remove(my_map, 100)
+
+    assert lp.size(my_map) == 19
+    assert not lp.contains(my_map, 5)
+    assert lp.get(my_map, 6) == 60
+
+    # Las casillas eliminadas se reutilizan
+    my_map = lp.put(my_map, 5, 1)
+    assert lp.size(my_map) == 20
+    assert lp.get(my_map, 5) == 1
+
+    # Muchas eliminaciones no llenan la tabla de casillas eliminadas
+    for key in range(1000):
+        my_map = lp.put(my_map, "k" + str(key), key)
+        my_map = lp.remove(my_map, "k" + str(key))
+    assert lp.size(my_map) == 20
+    assert lp.get(my_map, 19) == 190
+
+
+@handle_not_implemented
+def test_key_set_value_set():
+    my_map = setup_keys(30)
+    my_map = lp.remove(my_map, 0)
+    keys = lp.key_set(my_map)
+    values = lp.value_set(my_map)
+
+    assert al.size(keys) == 29
+    assert al.size(values) == 29
+    assert sorted(keys['elements']) == list(range(1, 30))
+    assert sorted(values['elements']) == [key * 10 for key in range(1, 30)]
+
+
+@handle_not_implemented
+def test_incremental_rehash():
+    my_map = lp.new_map(num_elements=10, load_factor=0.5, incremental=True)
+    for key in range(12):
+        my_map = lp.put(my_map, key, key * 10)
+
+    # El rehash dejó la tabla anterior pendiente por mover
+    assert my_map['resize'] is not None
+    assert lp.size(my_map) == 12
+    for key in range(12):
+        assert lp.get(my_map, key) == key * 10
+    assert sorted(lp.key_set(my_map)['elements']) == list(range(12))
+
+    my_map = lp.remove(my_map, 3)
+    my_map = lp.put(my_map, 4, 1)
+    for key in range(12, 200):
+        my_map = lp.put(my_map, key, key * 10)
+    assert lp.size(my_map) == 199
+    assert not lp.contains(my_map, 3)
+    assert lp.get(my_map, 4) == 1
+    assert lp.get(my_map, 199) == 1990
+
+
+@handle_not_implemented
+def test_copy():
+    for incremental in (False, True):
+        my_map = lp.new_map(num_elements=10, load_factor=0.5,
+                            incremental=incremental)
+        for key in range(12):
+            my_map = lp.put(my_map, key, key * 10)
+        new_map = lp.copy(my_map)
+        new_map = lp.put(new_map, 0, 1)
+        new_map = lp.remove(new_map, 1)
+        for key in range(12, 100):
+            new_map = lp.put(new_map, key, key * 10)
+
+        # La original no cambia
+        assert lp.size(my_map) == 12
+        assert lp.get(my_map, 0) == 0
+        assert lp.get(my_map, 1) == 10
+        assert not lp.contains(my_map, 12)
+        assert lp.size(new_map) == 99
+        assert lp.get(new_map, 0) == 1
+        assert not lp.contains(new_map, 1)
+
+
+@handle_not_implemented
+def test_seed():
+    my_map = lp.new_map(num_elements=10, load_factor=0.5, seed=1225)
+    same_map = lp.new_map(num_elements=10, load_factor=0.5, seed=1225)
+    for key in range(100):
+        my_map = lp.put(my_map, key, key)
+        same_map = lp.put(same_map, key, key)
+
+    assert 1 <= my_map['scale'] < my_map['prime']
+    assert 0 <= my_map['shift'] < my_map['prime']
+    # Con la misma semilla los parámetros y la ubicación de las llaves se
+    # repiten, también después de los rehash
+    assert my_map['scale'] == same_map['scale']
+    assert my_map['shift'] == same_map['shift']
+    assert my_map['keys'] == same_map['keys']
+
+
+@handle_not_implemented
+def test_stats():
+    my_map = setup_keys(50)
+    my_map = lp.remove(my_map, 0)
+    report = lp.stats(my_map)
+
+    assert report['size'] == 49
+    assert report['capacity'] == my_map['capacity']
+    assert report['tombstones'] == 1
+    assert sum(report['probe_histogram'].values()) == 49
+    assert report['avg_probe'] >= 1
+    assert report['max_probe'] == max(report['probe_histogram'])
+    assert report['max_cluster'] >= report['max_probe']
+
+    # Enteros consecutivos con a = 1 y b = 0 quedan en un solo grupo
+    fixed_map = lp.new_map(num_elements=100, load_factor=0.5)
+    fixed_map['scale'] = 1
+    fixed_map['shift'] = 0
+    for key in range(100):
+        fixed_map = lp.put(fixed_map, key, key)
+    assert lp.stats(fixed_map)['max_cluster'] == 100
@@ -0,0 +1,112 @@
+from DataStructures.Map import map_robin_hood as rh
+from DataStructures.List import array_list as al
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_map = rh.new_map(num_elements=10, load_factor=0.5)
+
+    return empty_map
+
+
+def setup_keys(count):
+    my_map = rh.new_map(num_elements=10, load_factor=0.5, seed=1225)
+    for key in range(count):
+        my_map = rh.put(my_map, key, key * 10)
+
+    return my_map
+
+
+def check_distances(my_map):
+    # Cada llave guarda su distancia a la casilla inicial y ninguna llave
+    # está más lejos que la anterior más uno
+    capacity = my_map['capacity']
+    for pos, key_hash in enumerate(my_map['hashes']):
+        if key_hash is None:
+            continue
+        home = (abs(my_map['scale'] * key_hash + my_map['shift'])
+                % my_map['prime']) % capacity
+        assert my_map['dists'][pos] == (pos - home) % capacity
+        previous = (pos - 1) % capacity
+        if my_map['dists'][pos] > 0:
+            assert my_map['hashes'][previous] is not None
+            assert my_map['dists'][previous] >= my_map['dists'][pos] - 1
+
+
+@handle_not_implemented
+def test_new_map():
+    empty_map = setup_tests()
+
+    assert rh.is_empty(empty_map)
+    assert rh.size(empty_map) == 0
+    assert empty_map['capacity'] == 23
+    assert rh.get(empty_map, 1) is None
+    assert not rh.contains(empty_map, 1)
+
+
+@handle_not_implemented
+def test_put_get():
+    my_map = setup_tests()
+    my_map = rh.put(my_map, "A", 1)
+    my_map = rh.put(my_map, "B", 2)
+
+    assert rh.size(my_map) == 2
+    assert rh.get(my_map, "A") == 1
+    assert rh.get(my_map, "B") == 2
+    assert rh.get(my_map, "C") is None
+
+    my_map = rh.put(my_map, "A", 10)
+    assert rh.size(my_map) == 2
+    assert rh.get(my_map, "A") == 10
+
+
+@handle_not_implemented
+def test_rehash():
+    my_map = setup_keys(200)
+
+    assert rh.size(my_map) == 200
+    assert my_map['current_factor'] <= my_map['limit_factor']
+    for key in range(200):
+        assert rh.get(my_map, key) == key * 10
+    check_distances(my_map)
+
+
+@handle_not_implemented
+def test_remove():
+    my_map = setup_keys(100)
+    for key in range(0, 100, 3):
+        my_map = rh.remove(my_map, key)
+    my_map = rh.remove(my_map, 1000)
+
+    assert rh.size(my_map) == 66
+    for key in range(100):
+        assert rh.contains(my_map, key) == (key % 3 != 0)
+    # No quedan tumbas: las casillas ocupadas son exactamente las llaves
+    occupied = sum(1 for key_hash in my_map['hashes'] if key_hash is not None)
+    assert occupied == 66
+    check_distances(my_map)
+
+    # Muchas eliminaciones no cambian la capacidad ni alargan los sondeos
+    capacity = my_map['capacity']
+    for key in range(1000):
+        my_map = rh.put(my_map, "k" + str(key), key)
+        my_map = rh.remove(my_map, "k" + str(key))
+    assert my_map['capacity'] == capacity
+    assert rh.size(my_map) == 66
+    check_distances(my_map)
+
+
+@handle_not_implemented
+def test_key_set_value_set_stats():
+    my_map = setup_keys(30)
+    keys = rh.key_set(my_map)
+    values = rh.value_set(my_map)
+    report = rh.stats(my_map)
+
+    assert al.size(keys) == 30
+    assert sorted(keys['elements']) == list(range(30))
+    assert sorted(values['elements']) == [key * 10 for key in range(30)]
+    assert report['size'] == 30
+    assert report['tombstones'] == 0
+    assert sum(report['probe_histogram'].values()) == 30
+    assert report['max_probe'] == max(report['probe_histogram'])
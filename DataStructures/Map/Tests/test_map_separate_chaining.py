@@ -0,0 +1,138 @@
+from DataStructures.Map import map_separate_chaining as sc
+from DataStructures.List import array_list as al
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_map = sc.new_map(num_elements=10, load_factor=2)
+
+    return empty_map
+
+
+def setup_keys(count, incremental=False):
+    my_map = sc.new_map(num_elements=10, load_factor=2,
+                        incremental=incremental)
+    for key in range(count):
+        my_map = sc.put(my_map, key, key * 10)
+
+    return my_map
+
+
+@handle_not_implemented
+def test_new_map():
+    empty_map = setup_tests()
+
+    assert sc.is_empty(empty_map)
+    assert sc.size(empty_map) == 0
+    assert empty_map['capacity'] == 7
+    assert sc.get(empty_map, 1) is None
+    assert not sc.contains(empty_map, 1)
+
+
+@handle_not_implemented
+def test_put_get():
+    my_map = setup_tests()
+    my_map = sc.put(my_map, "A", 1)
+    my_map = sc.put(my_map, "B", 2)
+
+    assert sc.size(my_map) == 2
+    assert sc.get(my_map, "A") == 1
+    assert sc.get(my_map, "C") is None
+
+    my_map = sc.put(my_map, "A", 10)
+    assert sc.size(my_map) == 2
+    assert sc.get(my_map, "A") == 10
+
+
+@handle_not_implemented
+def test_remove():
+    my_map = setup_keys(10)
+    # Se elimina el último elemento de un bucket y luego se agrega otro
+    my_map = sc.remove(my_map, 9)
+    my_map = sc.put(my_map, 9, 1)
+
+    assert sc.size(my_map) == 10
+    assert sc.get(my_map, 9) == 1
+
+    my_map = sc.remove(my_map, 5)
+    my_map = sc.remove(my_map, 100)
+    assert sc.size(my_map) == 9
+    assert not sc.contains(my_map, 5)
+
+
+@handle_not_implemented
+def test_rehash():
+    my_map = setup_keys(100)
+
+    assert sc.size(my_map) == 100
+    assert my_map['current_factor'] < my_map['limit_factor']
+    for key in range(100):
+        assert sc.get(my_map, key) == key * 10
+
+
+@handle_not_implemented
+def test_incremental_rehash():
+    my_map = setup_keys(14, incremental=True)
+
+    # El rehash dejó la tabla anterior pendiente por mover
+    assert my_map['resize'] is not None
+    assert sc.size(my_map) == 14
+    for key in range(14):
+        assert sc.get(my_map, key) == key * 10
+
+    my_map = sc.remove(my_map, 3)
+    my_map = sc.put(my_map, 4, 1)
+    for key in range(14, 200):
+        my_map = sc.put(my_map, key, key * 10)
+    assert sc.size(my_map) == 199
+    assert not sc.contains(my_map, 3)
+    assert sc.get(my_map, 4) == 1
+    assert sorted(sc.value_set(my_map)['elements']) == sorted(
+        [1] + [key * 10 for key in range(200) if key not in (3, 4)])
+    assert al.size(sc.key_set(my_map)) == 199
+
+
+@handle_not_implemented
+def test_seed():
+    my_map = sc.new_map(num_elements=10, load_factor=2, seed=1225)
+    same_map = sc.new_map(num_elements=10, load_factor=2, seed=1225)
+    for key in range(100):
+        my_map = sc.put(my_map, key, key)
+        same_map = sc.put(same_map, key, key)
+
+    assert my_map['scale'] == same_map['scale']
+    assert my_map['shift'] == same_map['shift']
+    assert sc.key_set(my_map)['elements'] == sc.key_set(same_map)['elements']
+
+
+@handle_not_implemented
+def test_stats():
+    my_map = setup_keys(50)
+    report = sc.stats(my_map)
+
+    assert report['size'] == 50
+    assert report['capacity'] == my_map['capacity']
+    assert sum(report['bucket_histogram'].values()) == my_map['capacity']
+    assert sum(length * count for length, count
+               in report['bucket_histogram'].items()) == 50
+    assert report['empty_buckets'] == report['bucket_histogram'].get(0, 0)
+    assert report['max_bucket'] == max(report['bucket_histogram'])
+    assert report['avg_search'] >= 1
+
+
+@handle_not_implemented
+def test_buckets():
+    my_map = setup_tests()
+
+    # Los buckets vacíos no ocupan una lista
+    assert all(bucket is None for bucket in my_map['table'])
+
+    my_map = sc.put(my_map, "A", 1)
+    my_map = sc.put(my_map, "B", 2)
+    buckets = [bucket for bucket in my_map['table'] if bucket is not None]
+    assert sorted(sum(buckets, [])[::2]) == ["A", "B"]
+
+    my_map = sc.remove(my_map, "A")
+    my_map = sc.remove(my_map, "B")
+    assert all(bucket is None for bucket in my_map['table'])
+    assert sc.is_empty(my_map)
@@ -1,4 +1,5 @@
 import math
+import random
 
 """
     Funciones auxiliares para el manejo de tablas de simbolos (**mapas**)
@@ -50,6 +51,26 @@ def next_prime(n):
             found = True
     return int(next_p)
 
+def new_hash_params(prime, seed=None):
+    """ Escoge al azar los parámetros a (scale) y b (shift) del método MAD
+        (ver hash_value), con a en [1, p-1] y b en [0, p-1].
+
+        Con seed los parámetros son siempre los mismos para esa semilla.
+        Para las llaves de tipo str el hash de Python además depende de
+        PYTHONHASHSEED, así que la ubicación de esas llaves solo se repite
+        entre ejecuciones si también se fija esa variable.
+
+        :param prime: El primo p de la tabla
+        :type prime: int
+        :param seed: Semilla para escoger los parámetros, o None
+        :type seed: int
+
+        :return: La pareja (scale, shift)
+        :rtype tuple
+    """
+    rnd = random if seed is None else random.Random(seed)
+    return rnd.randint(1, prime - 1), rnd.randint(0, prime - 1)
+
 def hash_value(table, key):
 
     """
@@ -77,4 +98,22 @@ def hash_value(table, key):
     m = table['capacity']
 
     value = int((abs(a*h + b) % p) % m)
-    return value
\ No newline at end of file
+    return value
+
+
+def migrate_step(load_factor):
+    """ Calcula cuántas casillas (o buckets) de la tabla anterior se deben
+        mover en cada operación durante un rehash incremental.
+
+        Después de duplicar la tabla caben load_factor * M inserciones
+        más antes del siguiente rehash (M es el tamaño de la tabla
+        anterior); moviendo 2 / load_factor casillas por operación el
+        rehash termina a la mitad de ese margen.
+
+        :param load_factor: Factor de carga máximo de la tabla
+        :type load_factor: float
+
+        :return: Número de casillas a mover por operación
+        :rtype int
+    """
+    return max(1, math.ceil(2 / load_factor))
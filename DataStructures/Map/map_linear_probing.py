@@ -1,124 +1,395 @@
-import random
+"""
+Tabla de símbolos (map) con manejo de colisiones por sondeo lineal
+(linear probing).
+
+La tabla se guarda en tres listas paralelas del tamaño de la tabla:
+
+- ``keys``: la llave de cada casilla. ``None`` es una casilla libre y
+  ``__EMPTY__`` una casilla de la que se eliminó una llave (tumba).
+- ``values``: el valor de cada casilla.
+- ``hashes``: el ``hash()`` de la llave de cada casilla (``None`` en las
+  casillas libres y en las tumbas).
+
+Al buscar una llave se compara primero el hash guardado en la casilla y
+solo si coincide se comparan las llaves, por lo que casi nunca se llama a
+``==`` sobre llaves distintas. El hash de cada llave se calcula una sola
+vez y se reutiliza en el rehash.
+
+La posición inicial de cada llave se calcula con el método MAD de
+``map_functions.hash_value``. Sus parámetros a (``scale``) y b (``shift``)
+se escogen al azar al crear la tabla y en cada rehash, para que las
+llaves con estructura (enteros consecutivos, fechas) no formen grupos
+largos de casillas ocupadas. Con ``seed`` se escogen siempre los mismos.
+
+Con ``incremental=True`` el rehash no mueve toda la tabla de una vez: la
+tabla anterior se guarda en ``resize`` y cada ``put``, ``get``,
+``contains`` o ``remove`` mueve algunas casillas de ella a la tabla nueva
+(ver ``map_functions.migrate_step``). Mientras tanto cada llave está en
+una sola de las dos tablas y las búsquedas revisan ambas. Así ninguna
+operación paga el costo de mover toda la tabla.
+"""
+
 from DataStructures.List import array_list as lt
-from DataStructures.Map import map_entry as me
 from DataStructures.Map import map_functions as mf
 
-__EMPTY__ = me.new_map_entry("__EMPTY__", "__EMPTY__")
+__EMPTY__ = "__EMPTY__"
 
-def new_map(num_elements, load_factor, prime=109345121):
+
+def new_map(num_elements, load_factor, prime=109345121, incremental=False,
+            seed=None):
     capacity = mf.next_prime(int(num_elements / load_factor))
-    table = lt.new_list("ARRAY_LIST")
-    for _ in range(capacity):
-        lt.add_last(table, me.new_map_entry(None, None))
+    scale, shift = mf.new_hash_params(prime, seed)
     return {
         'prime': prime,
         'capacity': capacity,
-        'scale': 1, 
-        'shift': 0,  
-        'table': table,
+        'scale': scale,
+        'shift': shift,
+        'seed': seed,
+        'keys': [None] * capacity,
+        'values': [None] * capacity,
+        'hashes': [None] * capacity,
         'current_factor': 0,
         'limit_factor': load_factor,
-        'size': 0
+        'size': 0,
+        'deleted': 0,
+        'incremental': incremental,
+        'resize': None
     }
 
+
 def put(my_map, key, value):
-    hash_val = mf.hash_value(my_map, key)
-    found, pos = find_slot(my_map, key, hash_val)
+    key_hash = hash(key)
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    found, pos = find_slot(my_map, key, key_hash)
 
     if found:
-        entry = lt.get_element(my_map['table'], pos)
-        me.set_value(entry, value)
-        lt.change_info(my_map['table'], pos, entry)
-    else:
-        new_entry = me.new_map_entry(key, value)
-        lt.change_info(my_map['table'], pos, new_entry)
-        my_map['size'] += 1
-        my_map['current_factor'] = my_map['size'] / my_map['capacity']
+        my_map['values'][pos] = value
+        return my_map
+    if my_map['resize'] is not None:
+        old_pos = _find_old(my_map, key, key_hash)
+        if old_pos is not None:
+            my_map['resize']['values'][old_pos] = value
+            return my_map
 
-    if my_map['current_factor'] > my_map['limit_factor']:
+    if my_map['keys'][pos] is not None:
+        # Se reutiliza una tumba
+        my_map['deleted'] -= 1
+    my_map['keys'][pos] = key
+    my_map['values'][pos] = value
+    my_map['hashes'][pos] = key_hash
+    my_map['size'] += 1
+    my_map['current_factor'] = my_map['size'] / my_map['capacity']
+    # Las tumbas también alargan los sondeos: cuentan para el rehash
+    if ((my_map['size'] + my_map['deleted']) / my_map['capacity']
+            > my_map['limit_factor']):
         my_map = rehash(my_map)
 
     return my_map
 
-def find_slot(my_map, key, hash_value):
+
+def find_slot(my_map, key, key_hash):
+    """ Busca la casilla de una llave a partir de su hash.
+
+        Durante un rehash incremental solo revisa la tabla nueva.
+
+        :return: (True, posición) si la llave está en la tabla o
+            (False, posición) con la primera casilla donde se puede
+            agregar (la primera tumba del recorrido o la casilla libre
+            donde terminó la búsqueda).
+    """
+    keys = my_map['keys']
+    hashes = my_map['hashes']
+    capacity = my_map['capacity']
+    pos = (abs(my_map['scale'] * key_hash + my_map['shift'])
+           % my_map['prime']) % capacity
     first_avail = None
-    found = False
-    occupied = False
-    table = my_map['table']
-    while not found:
-        if is_available(table, hash_value):
-            if first_avail is None:
-                first_avail = hash_value
-            entry = lt.get_element(table, hash_value)
-            if me.get_key(entry) is None:
-                found = True
-        elif default_compare(key, lt.get_element(table, hash_value)) == 0:
-            first_avail = hash_value
-            found = True
-            occupied = True
-        hash_value = (hash_value + 1) % my_map["capacity"]
-    return occupied, first_avail
-
-def is_available(table, pos):
-    entry = lt.get_element(table, pos)
-    return me.get_key(entry) is None or me.get_key(entry) == "__EMPTY__"
-
-def default_compare(key, entry):
-    entry_key = me.get_key(entry)
-    if key == entry_key:
-        return 0
-    elif key > entry_key:
-        return 1
-    return -1
+    while True:
+        slot_key = keys[pos]
+        if slot_key is None:
+            return False, (pos if first_avail is None else first_avail)
+        slot_hash = hashes[pos]
+        if slot_hash == key_hash and (slot_key is key or slot_key == key):
+            return True, pos
+        if slot_hash is None and first_avail is None:
+            first_avail = pos
+        pos += 1
+        if pos == capacity:
+            pos = 0
+
+
+def _find_old(my_map, key, key_hash):
+    """ Busca una llave en la tabla anterior de un rehash incremental.
+
+        :return: La posición de la llave o None si no está.
+    """
+    resize = my_map['resize']
+    keys = resize['keys']
+    hashes = resize['hashes']
+    capacity = resize['capacity']
+    pos = (abs(resize['scale'] * key_hash + resize['shift'])
+           % my_map['prime']) % capacity
+    # La tabla anterior puede haber quedado sin casillas libres
+    for _ in range(capacity):
+        slot_key = keys[pos]
+        if slot_key is None:
+            return None
+        if hashes[pos] == key_hash and (slot_key is key or slot_key == key):
+            return pos
+        pos += 1
+        if pos == capacity:
+            pos = 0
+    return None
+
 
 def contains(my_map, key):
-    hash_val = mf.hash_value(my_map, key)
-    found, _ = find_slot(my_map, key, hash_val)
+    key_hash = hash(key)
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    found, _ = find_slot(my_map, key, key_hash)
+    if not found and my_map['resize'] is not None:
+        found = _find_old(my_map, key, key_hash) is not None
     return found
 
+
 def remove(my_map, key):
-    hash_val = mf.hash_value(my_map, key)
-    found, pos = find_slot(my_map, key, hash_val)
+    key_hash = hash(key)
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    found, pos = find_slot(my_map, key, key_hash)
     if found:
-        lt.change_info(my_map['table'], pos, __EMPTY__)
+        table = my_map
+        my_map['deleted'] += 1
+    elif my_map['resize'] is not None:
+        table = my_map['resize']
+        pos = _find_old(my_map, key, key_hash)
+        found = pos is not None
+    if found:
+        table['keys'][pos] = __EMPTY__
+        table['values'][pos] = None
+        table['hashes'][pos] = None
         my_map['size'] -= 1
         my_map['current_factor'] = my_map['size'] / my_map['capacity']
     return my_map
 
+
 def get(my_map, key):
-    hash_val = mf.hash_value(my_map, key)
-    found, pos = find_slot(my_map, key, hash_val)
-    if found:
-        return me.get_value(lt.get_element(my_map['table'], pos))
+    key_hash = hash(key)
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    # Mismo recorrido de find_slot, sin buscar casillas disponibles
+    keys = my_map['keys']
+    hashes = my_map['hashes']
+    capacity = my_map['capacity']
+    pos = (abs(my_map['scale'] * key_hash + my_map['shift'])
+           % my_map['prime']) % capacity
+    while True:
+        slot_key = keys[pos]
+        if slot_key is None:
+            break
+        if hashes[pos] == key_hash and (slot_key is key or slot_key == key):
+            return my_map['values'][pos]
+        pos += 1
+        if pos == capacity:
+            pos = 0
+    if my_map['resize'] is not None:
+        pos = _find_old(my_map, key, key_hash)
+        if pos is not None:
+            return my_map['resize']['values'][pos]
     return None
 
+
 def size(my_map):
     return my_map['size']
 
+
 def is_empty(my_map):
     return my_map['size'] == 0
 
+
+def _tables(my_map):
+    """ Retorna las tablas (la actual y, durante un rehash incremental, la
+        anterior) que pueden tener llaves.
+    """
+    if my_map['resize'] is None:
+        return (my_map,)
+    return (my_map, my_map['resize'])
+
+
+def copy(my_map):
+    """ Retorna una copia de la tabla que se puede modificar sin cambiar
+        la original. Las llaves y los valores se comparten; se copian las
+        listas de la tabla (y las de la tabla anterior durante un rehash
+        incremental): O(capacidad).
+    """
+    new_map = dict(my_map)
+    new_map['keys'] = list(my_map['keys'])
+    new_map['values'] = list(my_map['values'])
+    new_map['hashes'] = list(my_map['hashes'])
+    resize = my_map['resize']
+    if resize is not None:
+        new_map['resize'] = dict(resize)
+        new_map['resize']['keys'] = list(resize['keys'])
+        new_map['resize']['values'] = list(resize['values'])
+        new_map['resize']['hashes'] = list(resize['hashes'])
+    return new_map
+
+
 def key_set(my_map):
     keys = lt.new_list("ARRAY_LIST")
-    for i in range(my_map['capacity']):
-        entry = lt.get_element(my_map['table'], i)
-        if me.get_key(entry) not in [None, "__EMPTY__"]:
-            lt.add_last(keys, me.get_key(entry))
+    for table in _tables(my_map):
+        hashes = table['hashes']
+        for i, key in enumerate(table['keys']):
+            if hashes[i] is not None:
+                lt.add_last(keys, key)
     return keys
 
+
 def value_set(my_map):
     values = lt.new_list("ARRAY_LIST")
-    for i in range(my_map['capacity']):
-        entry = lt.get_element(my_map['table'], i)
-        if me.get_key(entry) not in [None, "__EMPTY__"]:
-            lt.add_last(values, me.get_value(entry))
+    for table in _tables(my_map):
+        hashes = table['hashes']
+        for i, value in enumerate(table['values']):
+            if hashes[i] is not None:
+                lt.add_last(values, value)
     return values
 
+
+def stats(my_map):
+    """ Retorna un reporte de cómo están repartidas las llaves en la tabla.
+
+        Incluye el número de llaves, la capacidad, el factor de carga, el
+        número de tumbas, un histograma de la longitud de sondeo de las
+        llaves (casillas revisadas en una búsqueda exitosa; 1 si la llave
+        está en su casilla inicial), la longitud de sondeo promedio y
+        máxima, y el grupo más largo de casillas no libres consecutivas.
+        Durante un rehash incremental cuenta las dos tablas.
+
+        Recorre toda la tabla: O(capacidad).
+    """
+    histogram = {}
+    tombstones = 0
+    max_cluster = 0
+    for table in _tables(my_map):
+        keys = table['keys']
+        hashes = table['hashes']
+        capacity = table['capacity']
+        scale = table['scale']
+        shift = table['shift']
+        prime = my_map['prime']
+        cluster = 0
+        first_cluster = None
+        for pos in range(capacity):
+            key_hash = hashes[pos]
+            if keys[pos] is None:
+                if first_cluster is None:
+                    first_cluster = cluster
+                max_cluster = max(max_cluster, cluster)
+                cluster = 0
+                continue
+            cluster += 1
+            if key_hash is None:
+                tombstones += 1
+                continue
+            home = (abs(scale * key_hash + shift) % prime) % capacity
+            probes = (pos - home) % capacity + 1
+            histogram[probes] = histogram.get(probes, 0) + 1
+        # El último grupo continúa al inicio de la tabla
+        max_cluster = max(max_cluster, cluster + (first_cluster or 0))
+    total = sum(probes * count for probes, count in histogram.items())
+    return {
+        'size': my_map['size'],
+        'capacity': my_map['capacity'],
+        'load_factor': my_map['current_factor'],
+        'tombstones': tombstones,
+        'probe_histogram': dict(sorted(histogram.items())),
+        'avg_probe': total / my_map['size'] if my_map['size'] > 0 else 0.0,
+        'max_probe': max(histogram) if histogram else 0,
+        'max_cluster': max_cluster,
+    }
+
+
 def rehash(my_map):
-    new_capacity = mf.next_prime(2 * my_map['capacity'])
-    new_table = new_map(new_capacity, my_map['limit_factor'], my_map['prime'])
-    for i in range(my_map['capacity']):
-        entry = lt.get_element(my_map['table'], i)
-        if me.get_key(entry) not in [None, "__EMPTY__"]:
-            new_table = put(new_table, me.get_key(entry), me.get_value(entry))
-    return new_table
+    """ Duplica (al siguiente primo) la capacidad de la tabla y vuelve a
+        ubicar las llaves usando los hashes guardados y nuevos parámetros
+        a y b. Las tumbas se descartan. La tabla se modifica en sitio y se
+        retorna.
+
+        Si el rehash se debe sobre todo a las tumbas (las llaves ocupan
+        menos de la mitad del factor de carga) la capacidad no cambia: la
+        tabla solo se compacta.
+
+        Si la tabla es incremental solo se crea la tabla nueva; las llaves
+        se mueven en las operaciones siguientes (ver ``_migrate``).
+    """
+    if my_map['resize'] is not None:
+        # Un rehash incremental anterior que no alcanzó a terminar
+        _migrate(my_map, my_map['resize']['capacity'])
+    capacity = my_map['capacity']
+    if my_map['size'] > my_map['limit_factor'] * capacity / 2:
+        capacity = mf.next_prime(2 * capacity)
+    my_map['resize'] = {
+        'keys': my_map['keys'],
+        'values': my_map['values'],
+        'hashes': my_map['hashes'],
+        'capacity': my_map['capacity'],
+        'scale': my_map['scale'],
+        'shift': my_map['shift'],
+        'pos': 0,
+        'step': mf.migrate_step(my_map['limit_factor'])
+    }
+    my_map['keys'] = [None] * capacity
+    my_map['values'] = [None] * capacity
+    my_map['hashes'] = [None] * capacity
+    my_map['capacity'] = capacity
+    seed = my_map['seed']
+    my_map['scale'], my_map['shift'] = mf.new_hash_params(
+        my_map['prime'], None if seed is None else seed + capacity)
+    my_map['deleted'] = 0
+    my_map['current_factor'] = my_map['size'] / capacity
+    if not my_map['incremental']:
+        _migrate(my_map, my_map['resize']['capacity'])
+    return my_map
+
+
+def _migrate(my_map, steps=None):
+    """ Mueve las siguientes ``steps`` casillas de la tabla anterior a la
+        tabla nueva. Las casillas movidas quedan como tumbas para no cortar
+        las búsquedas que aún pasan por la tabla anterior. Cuando se
+        recorre toda la tabla anterior, el rehash termina.
+    """
+    resize = my_map['resize']
+    if steps is None:
+        steps = resize['step']
+    old_keys = resize['keys']
+    old_values = resize['values']
+    old_hashes = resize['hashes']
+    keys = my_map['keys']
+    values = my_map['values']
+    hashes = my_map['hashes']
+    capacity = my_map['capacity']
+    scale = my_map['scale']
+    shift = my_map['shift']
+    prime = my_map['prime']
+    start = resize['pos']
+    end = min(start + steps, resize['capacity'])
+    for i in range(start, end):
+        key_hash = old_hashes[i]
+        if key_hash is None:
+            continue
+        pos = (abs(scale * key_hash + shift) % prime) % capacity
+        while hashes[pos] is not None:
+            pos += 1
+            if pos == capacity:
+                pos = 0
+        if keys[pos] is not None:
+            my_map['deleted'] -= 1
+        keys[pos] = old_keys[i]
+        values[pos] = old_values[i]
+        hashes[pos] = key_hash
+        old_keys[i] = __EMPTY__
+        old_values[i] = None
+        old_hashes[i] = None
+    resize['pos'] = end
+    if end == resize['capacity']:
+        my_map['resize'] = None
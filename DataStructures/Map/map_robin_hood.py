@@ -0,0 +1,281 @@
+"""
+Tabla de símbolos (map) con sondeo lineal Robin Hood y eliminación por
+desplazamiento hacia atrás (backward shift).
+
+Tiene la misma interfaz de ``map_linear_probing`` y guarda la tabla de la
+misma forma, en listas paralelas (``keys``, ``values``, ``hashes``), más
+una lista ``dists`` con la distancia de cada llave a su casilla inicial.
+Una casilla está libre si su hash es ``None``.
+
+- Al agregar, si la llave que se está ubicando ya se alejó de su casilla
+  inicial más que la llave de la casilla actual, toma esa casilla y se
+  sigue ubicando la llave desplazada. Así las distancias quedan parejas
+  (poca varianza en la longitud de los sondeos).
+- Por lo mismo, una búsqueda termina en cuanto encuentra una casilla
+  cuya llave está más cerca de su casilla inicial que la llave buscada.
+- Al eliminar, las llaves siguientes del grupo se corren una casilla
+  hacia atrás hasta encontrar una casilla libre o una llave que ya está
+  en su casilla inicial. No quedan tumbas, así que eliminar muchas llaves
+  no alarga las búsquedas.
+
+Los parámetros a (``scale``) y b (``shift``) del hash se escogen como en
+``map_linear_probing`` (ver ``map_functions.new_hash_params``).
+"""
+
+from DataStructures.List import array_list as lt
+from DataStructures.Map import map_functions as mf
+
+
+def new_map(num_elements, load_factor, prime=109345121, seed=None):
+    capacity = mf.next_prime(int(num_elements / load_factor))
+    scale, shift = mf.new_hash_params(prime, seed)
+    return {
+        'prime': prime,
+        'capacity': capacity,
+        'scale': scale,
+        'shift': shift,
+        'seed': seed,
+        'keys': [None] * capacity,
+        'values': [None] * capacity,
+        'hashes': [None] * capacity,
+        'dists': [0] * capacity,
+        'current_factor': 0,
+        'limit_factor': load_factor,
+        'size': 0
+    }
+
+
+def put(my_map, key, value):
+    key_hash = hash(key)
+    keys = my_map['keys']
+    values = my_map['values']
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    capacity = my_map['capacity']
+    pos = (abs(my_map['scale'] * key_hash + my_map['shift'])
+           % my_map['prime']) % capacity
+    dist = 0
+    while True:
+        slot_hash = hashes[pos]
+        if slot_hash is None or dists[pos] < dist:
+            # La llave no está: una búsqueda terminaría aquí
+            break
+        if slot_hash == key_hash:
+            slot_key = keys[pos]
+            if slot_key is key or slot_key == key:
+                values[pos] = value
+                return my_map
+        pos += 1
+        if pos == capacity:
+            pos = 0
+        dist += 1
+    _place(my_map, pos, key, value, key_hash, dist)
+    my_map['size'] += 1
+    my_map['current_factor'] = my_map['size'] / capacity
+    if my_map['current_factor'] > my_map['limit_factor']:
+        my_map = rehash(my_map)
+    return my_map
+
+
+def _place(my_map, pos, key, value, key_hash, dist):
+    """ Ubica una llave que no está en la tabla, empezando en la casilla
+        pos, que está a distancia dist de su casilla inicial. Si una llave
+        está más cerca de su casilla inicial que la que se ubica, le cede
+        la casilla y se sigue ubicando la llave desplazada.
+    """
+    keys = my_map['keys']
+    values = my_map['values']
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    capacity = my_map['capacity']
+    while True:
+        if hashes[pos] is None:
+            keys[pos] = key
+            values[pos] = value
+            hashes[pos] = key_hash
+            dists[pos] = dist
+            return
+        if dists[pos] < dist:
+            key, keys[pos] = keys[pos], key
+            value, values[pos] = values[pos], value
+            key_hash, hashes[pos] = hashes[pos], key_hash
+            dist, dists[pos] = dists[pos], dist
+        pos += 1
+        if pos == capacity:
+            pos = 0
+        dist += 1
+
+
+def find_slot(my_map, key, key_hash):
+    """ Busca la casilla de una llave a partir de su hash.
+
+        :return: La posición de la llave o None si no está.
+    """
+    keys = my_map['keys']
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    capacity = my_map['capacity']
+    pos = (abs(my_map['scale'] * key_hash + my_map['shift'])
+           % my_map['prime']) % capacity
+    dist = 0
+    while True:
+        slot_hash = hashes[pos]
+        if slot_hash is None or dists[pos] < dist:
+            return None
+        if slot_hash == key_hash:
+            slot_key = keys[pos]
+            if slot_key is key or slot_key == key:
+                return pos
+        pos += 1
+        if pos == capacity:
+            pos = 0
+        dist += 1
+
+
+def contains(my_map, key):
+    return find_slot(my_map, key, hash(key)) is not None
+
+
+def remove(my_map, key):
+    pos = find_slot(my_map, key, hash(key))
+    if pos is None:
+        return my_map
+    keys = my_map['keys']
+    values = my_map['values']
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    capacity = my_map['capacity']
+    # Se corren hacia atrás las llaves siguientes que no están en su
+    # casilla inicial
+    following = pos + 1 if pos + 1 < capacity else 0
+    while hashes[following] is not None and dists[following] > 0:
+        keys[pos] = keys[following]
+        values[pos] = values[following]
+        hashes[pos] = hashes[following]
+        dists[pos] = dists[following] - 1
+        pos = following
+        following = pos + 1 if pos + 1 < capacity else 0
+    keys[pos] = None
+    values[pos] = None
+    hashes[pos] = None
+    dists[pos] = 0
+    my_map['size'] -= 1
+    my_map['current_factor'] = my_map['size'] / capacity
+    return my_map
+
+
+def get(my_map, key):
+    # Mismo recorrido de find_slot
+    key_hash = hash(key)
+    keys = my_map['keys']
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    capacity = my_map['capacity']
+    pos = (abs(my_map['scale'] * key_hash + my_map['shift'])
+           % my_map['prime']) % capacity
+    dist = 0
+    while True:
+        slot_hash = hashes[pos]
+        if slot_hash is None or dists[pos] < dist:
+            return None
+        if slot_hash == key_hash:
+            slot_key = keys[pos]
+            if slot_key is key or slot_key == key:
+                return my_map['values'][pos]
+        pos += 1
+        if pos == capacity:
+            pos = 0
+        dist += 1
+
+
+def size(my_map):
+    return my_map['size']
+
+
+def is_empty(my_map):
+    return my_map['size'] == 0
+
+
+def key_set(my_map):
+    keys = lt.new_list("ARRAY_LIST")
+    hashes = my_map['hashes']
+    for i, key in enumerate(my_map['keys']):
+        if hashes[i] is not None:
+            lt.add_last(keys, key)
+    return keys
+
+
+def value_set(my_map):
+    values = lt.new_list("ARRAY_LIST")
+    hashes = my_map['hashes']
+    for i, value in enumerate(my_map['values']):
+        if hashes[i] is not None:
+            lt.add_last(values, value)
+    return values
+
+
+def stats(my_map):
+    """ Retorna un reporte de cómo están repartidas las llaves en la tabla,
+        con los mismos campos de ``map_linear_probing.stats`` (aquí
+        ``tombstones`` siempre es 0).
+
+        Recorre toda la tabla: O(capacidad).
+    """
+    histogram = {}
+    max_cluster = 0
+    cluster = 0
+    first_cluster = None
+    hashes = my_map['hashes']
+    dists = my_map['dists']
+    for pos in range(my_map['capacity']):
+        if hashes[pos] is None:
+            if first_cluster is None:
+                first_cluster = cluster
+            max_cluster = max(max_cluster, cluster)
+            cluster = 0
+            continue
+        cluster += 1
+        probes = dists[pos] + 1
+        histogram[probes] = histogram.get(probes, 0) + 1
+    # El último grupo continúa al inicio de la tabla
+    max_cluster = max(max_cluster, cluster + (first_cluster or 0))
+    total = sum(probes * count for probes, count in histogram.items())
+    return {
+        'size': my_map['size'],
+        'capacity': my_map['capacity'],
+        'load_factor': my_map['current_factor'],
+        'tombstones': 0,
+        'probe_histogram': dict(sorted(histogram.items())),
+        'avg_probe': total / my_map['size'] if my_map['size'] > 0 else 0.0,
+        'max_probe': max(histogram) if histogram else 0,
+        'max_cluster': max_cluster,
+    }
+
+
+def rehash(my_map):
+    """ Duplica (al siguiente primo) la capacidad de la tabla y vuelve a
+        ubicar las llaves usando los hashes guardados y nuevos parámetros
+        a y b. La tabla se modifica en sitio y se retorna.
+    """
+    old_keys = my_map['keys']
+    old_values = my_map['values']
+    old_hashes = my_map['hashes']
+    capacity = mf.next_prime(2 * my_map['capacity'])
+    seed = my_map['seed']
+    my_map['scale'], my_map['shift'] = mf.new_hash_params(
+        my_map['prime'], None if seed is None else seed + capacity)
+    my_map['keys'] = [None] * capacity
+    my_map['values'] = [None] * capacity
+    my_map['hashes'] = [None] * capacity
+    my_map['dists'] = [0] * capacity
+    my_map['capacity'] = capacity
+    my_map['current_factor'] = my_map['size'] / capacity
+    scale = my_map['scale']
+    shift = my_map['shift']
+    prime = my_map['prime']
+    for i, key_hash in enumerate(old_hashes):
+        if key_hash is None:
+            continue
+        pos = (abs(scale * key_hash + shift) % prime) % capacity
+        _place(my_map, pos, old_keys[i], old_values[i], key_hash, 0)
+    return my_map
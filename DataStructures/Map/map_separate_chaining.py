@@ -1,46 +1,95 @@
-import random
+"""
+Tabla de símbolos (map) con manejo de colisiones por encadenamiento
+separado (separate chaining).
+
+La tabla (``table``) es una lista de Python con un bucket por posición.
+Los buckets vacíos son ``None``; un bucket con llaves es una lista plana
+con las parejas llave-valor seguidas: ``[k0, v0, k1, v1, ...]``. Así solo
+se crean listas para los buckets que tienen llaves y buscar en un bucket
+es un solo recorrido.
+
+Los parámetros a (``scale``) y b (``shift``) del método MAD (ver
+``map_functions.hash_value``) se escogen al azar al crear la tabla y en
+cada rehash; con ``seed`` se escogen siempre los mismos.
+
+Con ``incremental=True`` el rehash no mueve toda la tabla de una vez: la
+tabla anterior queda en ``resize`` y cada ``put``, ``get``, ``contains``
+o ``remove`` mueve algunos de sus buckets a la tabla nueva (ver
+``map_functions.migrate_step``). Mientras tanto cada llave está en una
+sola de las dos tablas y las búsquedas revisan ambas.
+"""
+
 from DataStructures.List import array_list as lt
-from DataStructures.List import single_linked_list as sll
-from DataStructures.Map import map_entry as me
 from DataStructures.Map import map_functions as mf
 
 
-def new_map(num_elements, load_factor, prime=109345121):
+def new_map(num_elements, load_factor, prime=109345121, incremental=False,
+            seed=None):
     capacity = mf.next_prime(int(num_elements / load_factor))
-    table = lt.new_list('ARRAY_LIST')
-    for _ in range(capacity):
-        lt.add_last(table, sll.new_list())
+    scale, shift = mf.new_hash_params(prime, seed)
 
     map_table = {
         'prime': prime,
         'capacity': capacity,
-        'scale': 1,
-        'shift': 0,
-        'table': table,
+        'scale': scale,
+        'shift': shift,
+        'seed': seed,
+        'table': [None] * capacity,
         'current_factor': 0,
         'limit_factor': load_factor,
-        'size': 0
+        'size': 0,
+        'incremental': incremental,
+        'resize': None
     }
     return map_table
 
 
+def _find(bucket, key):
+    """ Retorna la posición de la llave en el bucket (la del valor es la
+        siguiente) o -1 si no está.
+    """
+    for i in range(0, len(bucket), 2):
+        if bucket[i] == key:
+            return i
+    return -1
+
+
+def _old_bucket(my_map, key):
+    """ Retorna el bucket de la tabla anterior de un rehash incremental
+        donde debe estar la llave, o None si está vacío.
+    """
+    resize = my_map['resize']
+    return resize['table'][mf.hash_value(resize, key)]
+
+
 def put(my_map, key, value):
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    table = my_map['table']
     pos = mf.hash_value(my_map, key)
-    bucket = lt.get_element(my_map['table'], pos)
-    found = False
-
-    for i in range(sll.size(bucket)):
-        entry = sll.get_element(bucket, i)
-        if me.get_key(entry) == key:
-            me.set_value(entry, value)
-            found = True
-            break
-
-    if not found:
-        entry = me.new_map_entry(key, value)
-        sll.add_last(bucket, entry)
-        my_map['size'] += 1
-        my_map['current_factor'] = my_map['size'] / my_map['capacity']
+    bucket = table[pos]
+
+    if bucket is not None:
+        i = _find(bucket, key)
+        if i >= 0:
+            bucket[i + 1] = value
+            return my_map
+
+    if my_map['resize'] is not None:
+        old_bucket = _old_bucket(my_map, key)
+        if old_bucket is not None:
+            i = _find(old_bucket, key)
+            if i >= 0:
+                old_bucket[i + 1] = value
+                return my_map
+
+    if bucket is None:
+        table[pos] = [key, value]
+    else:
+        bucket.append(key)
+        bucket.append(value)
+    my_map['size'] += 1
+    my_map['current_factor'] = my_map['size'] / my_map['capacity']
 
     if my_map['current_factor'] >= my_map['limit_factor']:
         my_map = rehash(my_map)
@@ -49,32 +98,62 @@ def put(my_map, key, value):
 
 
 def contains(my_map, key):
-    return get(my_map, key) is not None
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    bucket = my_map['table'][mf.hash_value(my_map, key)]
+    if bucket is not None and _find(bucket, key) >= 0:
+        return True
+    if my_map['resize'] is not None:
+        old_bucket = _old_bucket(my_map, key)
+        return old_bucket is not None and _find(old_bucket, key) >= 0
+    return False
 
 
 def remove(my_map, key):
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    table = my_map['table']
     pos = mf.hash_value(my_map, key)
-    bucket = lt.get_element(my_map['table'], pos)
-
-    for i in range(sll.size(bucket)):
-        entry = sll.get_element(bucket, i)
-        if me.get_key(entry) == key:
-            sll.delete_element(bucket, i + 1)
-            my_map['size'] -= 1
-            my_map['current_factor'] = my_map['size'] / my_map['capacity']
-            break
+    i = -1
+    if table[pos] is not None:
+        i = _find(table[pos], key)
+
+    if i < 0 and my_map['resize'] is not None:
+        table = my_map['resize']['table']
+        pos = mf.hash_value(my_map['resize'], key)
+        if table[pos] is not None:
+            i = _find(table[pos], key)
+
+    if i >= 0:
+        bucket = table[pos]
+        del bucket[i:i + 2]
+        if not bucket:
+            table[pos] = None
+        my_map['size'] -= 1
+        my_map['current_factor'] = my_map['size'] / my_map['capacity']
 
     return my_map
 
 
 def get(my_map, key):
-    pos = mf.hash_value(my_map, key)
-    bucket = lt.get_element(my_map['table'], pos)
-
-    for i in range(sll.size(bucket)):
-        entry = sll.get_element(bucket, i)
-        if me.get_key(entry) == key:
-            return me.get_value(entry)
+    if my_map['resize'] is not None:
+        _migrate(my_map)
+    # Mismo cálculo de mf.hash_value
+    pos = (abs(my_map['scale'] * hash(key) + my_map['shift'])
+           % my_map['prime']) % my_map['capacity']
+    bucket = my_map['table'][pos]
+
+    if bucket is not None:
+        for i in range(0, len(bucket), 2):
+            if bucket[i] == key:
+                return bucket[i + 1]
+
+    if my_map['resize'] is not None:
+        old_bucket = _old_bucket(my_map, key)
+        if old_bucket is not None:
+            i = _find(old_bucket, key)
+            if i >= 0:
+                return old_bucket[i + 1]
     return None
 
 
@@ -86,50 +165,128 @@ def is_empty(my_map):
     return my_map['size'] == 0
 
 
+def _tables(my_map):
+    """ Retorna las tablas (la actual y, durante un rehash incremental, la
+        anterior) que pueden tener llaves.
+    """
+    if my_map['resize'] is None:
+        return (my_map,)
+    return (my_map, my_map['resize'])
+
+
 def key_set(my_map):
     keys = lt.new_list('ARRAY_LIST')
-    for i in range(my_map['capacity']):
-        bucket = lt.get_element(my_map['table'], i)
-        for j in range(sll.size(bucket)):
-            entry = sll.get_element(bucket, j)
-            lt.add_last(keys, me.get_key(entry))
+    for table in _tables(my_map):
+        for bucket in table['table']:
+            if bucket is not None:
+                for i in range(0, len(bucket), 2):
+                    lt.add_last(keys, bucket[i])
     return keys
 
 
 def value_set(my_map):
     values = lt.new_list('ARRAY_LIST')
-    for i in range(my_map['capacity']):
-        bucket = lt.get_element(my_map['table'], i)
-        for j in range(sll.size(bucket)):
-            entry = sll.get_element(bucket, j)
-            lt.add_last(values, me.get_value(entry))
+    for table in _tables(my_map):
+        for bucket in table['table']:
+            if bucket is not None:
+                for i in range(1, len(bucket), 2):
+                    lt.add_last(values, bucket[i])
     return values
 
 
+def stats(my_map):
+    """ Retorna un reporte de cómo están repartidas las llaves en la tabla.
+
+        Incluye el número de llaves, el número de buckets, el factor de
+        carga, un histograma de la longitud de los buckets (cuántos
+        buckets tienen 0, 1, 2... llaves), el bucket más largo y el número
+        promedio de llaves revisadas en una búsqueda exitosa. Durante un
+        rehash incremental cuenta las dos tablas.
+
+        Recorre toda la tabla: O(capacidad).
+    """
+    histogram = {}
+    total = 0
+    for table in _tables(my_map):
+        for bucket in table['table']:
+            length = 0 if bucket is None else len(bucket) // 2
+            histogram[length] = histogram.get(length, 0) + 1
+            # Buscar la j-ésima llave del bucket revisa j llaves
+            total += length * (length + 1) // 2
+    return {
+        'size': my_map['size'],
+        'capacity': my_map['capacity'],
+        'load_factor': my_map['current_factor'],
+        'bucket_histogram': dict(sorted(histogram.items())),
+        'empty_buckets': histogram.get(0, 0),
+        'max_bucket': max(histogram),
+        'avg_search': total / my_map['size'] if my_map['size'] > 0 else 0.0,
+    }
+
+
 def rehash(my_map):
+    """ Duplica (al siguiente primo) la capacidad de la tabla y mueve las
+        parejas llave-valor a la tabla nueva, con nuevos parámetros a y b.
+
+        Si la tabla es incremental solo se crea la tabla nueva y las
+        parejas se mueven en las operaciones siguientes (ver
+        ``_migrate``).
+    """
+    if my_map['resize'] is not None:
+        # Un rehash incremental anterior que no alcanzó a terminar
+        _migrate(my_map, my_map['resize']['capacity'])
     new_capacity = mf.next_prime(my_map['capacity'] * 2)
 
-    new_table = lt.new_list('ARRAY_LIST')
-    for _ in range(new_capacity):
-        lt.add_last(new_table, sll.new_list())
-
-    for i in range(my_map['capacity']):
-        bucket = lt.get_element(my_map['table'], i)
-        for j in range(sll.size(bucket)):
-            entry = sll.get_element(bucket, j)
-            key = me.get_key(entry)
-            value = me.get_value(entry)
-            pos = mf.hash_value({
-                'capacity': new_capacity,
-                'prime': my_map['prime'],
-                'scale': my_map['scale'],
-                'shift': my_map['shift']
-            }, key)
-            new_bucket = lt.get_element(new_table, pos)
-            sll.add_last(new_bucket, me.new_map_entry(key, value))
-
-    my_map['table'] = new_table
+    my_map['resize'] = {
+        'table': my_map['table'],
+        'capacity': my_map['capacity'],
+        'prime': my_map['prime'],
+        'scale': my_map['scale'],
+        'shift': my_map['shift'],
+        'pos': 0,
+        'step': mf.migrate_step(my_map['limit_factor'])
+    }
+    my_map['table'] = [None] * new_capacity
     my_map['capacity'] = new_capacity
+    seed = my_map['seed']
+    my_map['scale'], my_map['shift'] = mf.new_hash_params(
+        my_map['prime'], None if seed is None else seed + new_capacity)
     my_map['current_factor'] = my_map['size'] / my_map['capacity']
+    if not my_map['incremental']:
+        _migrate(my_map, my_map['resize']['capacity'])
 
     return my_map
+
+
+def _migrate(my_map, steps=None):
+    """ Mueve los siguientes ``steps`` buckets de la tabla anterior a la
+        tabla nueva. Cuando se recorre toda la tabla anterior, el rehash
+        termina.
+    """
+    resize = my_map['resize']
+    if steps is None:
+        steps = resize['step']
+    old_table = resize['table']
+    table = my_map['table']
+    capacity = my_map['capacity']
+    scale = my_map['scale']
+    shift = my_map['shift']
+    prime = my_map['prime']
+    start = resize['pos']
+    end = min(start + steps, resize['capacity'])
+    for i in range(start, end):
+        bucket = old_table[i]
+        if bucket is None:
+            continue
+        for j in range(0, len(bucket), 2):
+            key = bucket[j]
+            pos = (abs(scale * hash(key) + shift) % prime) % capacity
+            if table[pos] is None:
+                table[pos] = [key, bucket[j + 1]]
+            else:
+                table[pos].append(key)
+                table[pos].append(bucket[j + 1])
+        old_table[i] = None
+    resize['pos'] = end
+    if end == resize['capacity']:
+        my_map['resize'] = None
@@ -1,5 +1,6 @@
 from DataStructures.Tree import binary_search_tree as bst
 from DataStructures.Tree import bst_node as bst_node
+from DataStructures.List import array_list as al
 from DataStructures.Utils.utils import handle_not_implemented
 
 
@@ -26,6 +27,7 @@ def setup_three_nodes():
     node_2["left"] = node_1
     node_2["right"] = node_3
     node_2["size"] = 3
+    node_2["height"] = 2
 
     three_nodes["root"] = node_2
 
@@ -45,14 +47,17 @@ def setup_seven_nodes():
     node_2["left"] = node_1
     node_2["right"] = node_3
     node_2["size"] = 3
+    node_2["height"] = 2
 
     node_6["left"] = node_5
     node_6["right"] = node_7
     node_6["size"] = 3
+    node_6["height"] = 2
 
     node_4["left"] = node_2
     node_4["right"] = node_6
     node_4["size"] = 7
+    node_4["height"] = 3
 
     seven_nodes["root"] = node_4
 
@@ -594,3 +599,254 @@ def test_values():
     keys_size = bst.keys(seven_bst, 20, 60)["size"]
     values_size = bst.values(seven_bst, 20, 60)["size"]
     assert keys_size == values_size, "keys y values deben tener el mismo tamaño para el mismo rango"
+
+
+@handle_not_implemented
+def test_build_from_sorted():
+    keys = al.new_list()
+    values = al.new_list()
+    for i in range(1, 128):
+        al.add_last(keys, i)
+        al.add_last(values, i * 10)
+
+    built = bst.build_from_sorted(keys, values)
+
+    # Verificar que el árbol contiene todas las llaves con sus valores
+    assert bst.size(built) == 127
+    assert bst.get(built, 1) == 10
+    assert bst.get(built, 64) == 640
+    assert bst.get(built, 127) == 1270
+
+    # Verificar que el árbol queda balanceado (altura mínima)
+    assert bst.height(built) == bst.height(setup_seven_nodes()) + 4
+
+    # Verificar que un árbol construido sin llaves está vacío
+    empty_bst = bst.build_from_sorted(al.new_list(), al.new_list())
+    assert bst.is_empty(empty_bst)
+
+
+@handle_not_implemented
+def test_range_sum():
+    empty_bst = setup_tests()
+    seven_bst = setup_seven_nodes()
+
+    # Sin función de peso, range_sum cuenta las llaves en el rango
+    assert bst.range_sum(empty_bst, 1, 10) == 0
+    assert bst.range_sum(seven_bst, 20, 60) == 5
+    assert bst.range_sum(seven_bst, 15, 65) == 5
+    assert bst.range_sum(seven_bst, 60, 20) == 0
+
+    # Con función de peso, suma los pesos del rango
+    weighted = bst.new_map(weight_func=lambda value: value)
+    for key in [50, 20, 70, 10, 30, 60, 80]:
+        bst.put(weighted, key, key)
+    assert bst.range_sum(weighted, 20, 60) == 20 + 30 + 50 + 60
+    assert bst.range_sum(weighted, 0, 100) == 320
+
+    # Los pesos se mantienen al eliminar y al actualizar valores
+    bst.remove(weighted, 50)
+    assert bst.range_sum(weighted, 20, 60) == 20 + 30 + 60
+    bst.put(weighted, 30, 5)
+    assert bst.range_sum(weighted, 20, 60) == 20 + 5 + 60
+
+    # refresh recalcula los pesos después de modificar un valor en sitio
+    lists = bst.new_map(weight_func=len)
+    bst.put(lists, 1, [1])
+    bst.put(lists, 2, [2])
+    bst.get(lists, 2).append(3)
+    bst.refresh(lists, 2)
+    assert bst.range_sum(lists, 1, 2) == 3
+
+    # Con delta se suma la diferencia de peso sin llamar la función de peso
+    for key in range(3, 40):
+        bst.put(lists, key, [key])
+    bst.get(lists, 17).extend([0, 0])
+    bst.refresh(lists, 17, 2)
+    bst.get(lists, 30).append(0)
+    bst.refresh(lists, 30)
+    assert bst.range_sum(lists, 17, 17) == 3
+    assert bst.range_sum(lists, 1, 39) == 43
+    assert bst.range_sum(lists, 18, 30) == 14
+
+
+@handle_not_implemented
+def test_iter_items():
+    empty_bst = setup_tests()
+    seven_bst = setup_seven_nodes()
+
+    # Un árbol vacío no produce elementos
+    assert list(bst.iter_items(empty_bst)) == []
+
+    # Sin límites recorre todo el árbol en orden
+    assert list(bst.iter_keys(seven_bst)) == [10, 20, 30, 40, 50, 60, 70]
+    assert list(bst.iter_values(seven_bst, 20, 60)) == [20, 30, 40, 50, 60]
+    assert list(bst.iter_items(seven_bst, 15, 45)) == [(20, 20), (30, 30), (40, 40)]
+    assert list(bst.iter_keys(seven_bst, 65)) == [70]
+    assert list(bst.iter_keys(seven_bst, None, 10)) == [10]
+    assert list(bst.iter_keys(seven_bst, 60, 20)) == []
+
+    # El recorrido se puede detener antes de terminar el rango
+    iterator = bst.iter_keys(seven_bst, 25)
+    assert [next(iterator), next(iterator)] == [30, 40]
+
+
+@handle_not_implemented
+def test_order_statistics():
+    empty_bst = setup_tests()
+    seven_bst = setup_seven_nodes()
+
+    assert bst.floor(seven_bst, 35) == 30
+    assert bst.floor(seven_bst, 5) is None
+    assert bst.ceiling(seven_bst, 35) == 40
+    assert bst.ceiling(seven_bst, 75) is None
+
+    # select es el inverso de rank
+    assert [bst.select(seven_bst, i) for i in range(7)] == [10, 20, 30, 40, 50, 60, 70]
+    assert bst.select(seven_bst, 7) is None
+    assert bst.select(empty_bst, 0) is None
+    assert [bst.rank(seven_bst, k) for k in [5, 10, 35, 70, 80]] == [0, 0, 3, 6, 7]
+
+    assert bst.size_range(seven_bst, 20, 60) == 5
+    assert bst.size_range(seven_bst, 21, 59) == 3
+    assert bst.size_range(seven_bst, 60, 20) == 0
+    assert bst.size_range(empty_bst, 1, 10) == 0
+
+
+@handle_not_implemented
+def test_delete_min_max_update_tree():
+    seven_bst = setup_seven_nodes()
+
+    bst.delete_min(seven_bst)
+    bst.delete_max(seven_bst)
+    assert bst.size(seven_bst) == 5
+    assert bst.get_min(seven_bst) == 20
+    assert bst.get_max(seven_bst) == 60
+    assert list(bst.iter_keys(seven_bst)) == [20, 30, 40, 50, 60]
+
+    # Vaciar el árbol eliminando siempre el máximo
+    for i in range(5):
+        bst.delete_max(seven_bst)
+    assert bst.is_empty(seven_bst)
+
+
+@handle_not_implemented
+def test_node_fields():
+    node = bst_node.new_node(5, "cinco")
+
+    # Los campos se pueden usar por nombre o como atributos
+    assert bst_node.get_key(node) == 5
+    assert bst_node.get_value(node) == "cinco"
+    assert node["size"] == 1 and node.size == 1
+    assert node["left"] is None and node["right"] is None
+    assert node["type"] == "BST"
+
+    node["value"] = "five"
+    assert node.value == "five"
+    assert bst_node.get_key(None) is None
+
+
+@handle_not_implemented
+def test_stats():
+    empty_bst = setup_tests()
+    seven_bst = setup_seven_nodes()
+
+    report = bst.stats(seven_bst)
+    assert report["size"] == 7
+    assert report["height"] == 3
+    assert report["optimal_height"] == 3
+    assert report["depth_histogram"] == {1: 1, 2: 2, 3: 4}
+    assert report["avg_search_path"] == (1 + 2 * 2 + 3 * 4) / 7
+    assert report["operations"] is None
+    assert bst.stats(empty_bst)["height"] == 0
+
+    # La altura se mantiene al insertar y eliminar
+    degenerate = bst.new_map(log_size=10)
+    for key in range(1, 21):
+        bst.put(degenerate, key, key)
+    assert bst.height(degenerate) == 20
+    bst.remove(degenerate, 20)
+    assert bst.height(degenerate) == 19
+
+    # El registro guarda las comparaciones de las últimas operaciones
+    bst.get(degenerate, 19)
+    report = bst.stats(degenerate)
+    assert report["operations"]["count"] == 10
+    assert report["operations"]["by_operation"]["get"]["max_comparisons"] == 19
+
+
+@handle_not_implemented
+def test_split_join():
+    seven_bst = setup_seven_nodes()
+
+    left, right = bst.split(seven_bst, 35)
+    assert list(bst.iter_keys(left)) == [10, 20, 30]
+    assert list(bst.iter_keys(right)) == [40, 50, 60, 70]
+    assert bst.size(left) == 3 and bst.size(right) == 4
+    assert bst.height(right) == 3
+    assert bst.is_empty(seven_bst)
+
+    # Una llave existente queda en el árbol de la derecha
+    small, large = bst.split(right, 60)
+    assert list(bst.iter_keys(small)) == [40, 50]
+    assert list(bst.iter_keys(large)) == [60, 70]
+
+    joined = bst.join(left, bst.join(small, large))
+    assert list(bst.iter_keys(joined)) == [10, 20, 30, 40, 50, 60, 70]
+    assert bst.size(joined) == 7
+    assert bst.rank(joined, 50) == 4
+    assert bst.is_empty(left)
+
+    try:
+        bst.join(joined, setup_seven_nodes())
+        assert False
+    except Exception:
+        pass
+
+
+@handle_not_implemented
+def test_remove_range():
+    seven_bst = setup_seven_nodes()
+
+    bst.remove_range(seven_bst, 25, 55)
+    assert list(bst.iter_keys(seven_bst)) == [10, 20, 60, 70]
+    assert bst.size(seven_bst) == 4
+    assert bst.get(seven_bst, 40) is None
+
+    # Rango vacío o invertido
+    bst.remove_range(seven_bst, 30, 50)
+    bst.remove_range(seven_bst, 70, 10)
+    assert bst.size(seven_bst) == 4
+
+    weighted = bst.new_map(weight_func=lambda value: value)
+    for key in [50, 30, 80, 10, 40, 60, 90, 20, 70]:
+        bst.put(weighted, key, key)
+    bst.remove_range(weighted, 1, 40)
+    assert bst.get_min(weighted) == 50
+    assert bst.range_sum(weighted, 0, 100) == 50 + 60 + 70 + 80 + 90
+
+
+@handle_not_implemented
+def test_native_keys():
+    native = bst.new_map(weight_func=len)
+    compared = bst.new_map(cmp_func=lambda a, b: (a > b) - (a < b),
+                           weight_func=len)
+    assert native["native"] is True
+    assert compared["native"] is False
+    assert bst.new_map(cmp_func=lambda a, b: (a > b) - (a < b),
+                       native=True)["native"] is True
+
+    for key in [50, 30, 80, 10, 40, 60, 90, 20, 70, 30]:
+        bst.put(native, key, [key] * (key // 10))
+        bst.put(compared, key, [key] * (key // 10))
+    bst.put(native, 30, [1])
+    bst.put(compared, 30, [1])
+
+    for tree in (native, compared):
+        assert bst.size(tree) == 9
+        assert bst.get(tree, 30) == [1]
+        assert bst.contains(tree, 60) and not bst.contains(tree, 65)
+        assert bst.range_sum(tree, 20, 60) == 2 + 1 + 4 + 5 + 6
+        assert bst.rank(tree, 55) == 5
+        assert bst.floor(tree, 55) == 50 and bst.ceiling(tree, 55) == 60
+    assert list(bst.iter_items(native)) == list(bst.iter_items(compared))
+    assert bst.height(native) == bst.height(compared)
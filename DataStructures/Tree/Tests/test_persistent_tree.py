@@ -0,0 +1,157 @@
+from DataStructures.Tree import persistent_tree as pt
+from DataStructures.Tree import rbt_node as rbt_node
+from DataStructures.List import array_list as al
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_tree = pt.new_map()
+
+    return empty_tree
+
+
+def setup_sorted_tree(n):
+    sorted_tree = pt.new_map()
+    for i in range(1, n + 1):
+        sorted_tree = pt.put(sorted_tree, i, i * 10)
+
+    return sorted_tree
+
+
+def check_invariants(node):
+    """Verifica las propiedades del árbol y retorna su altura negra."""
+    if node is None:
+        return 0
+    assert not rbt_node.is_red(node["right"]), "Los enlaces rojos se inclinan a la izquierda"
+    if rbt_node.is_red(node):
+        assert not rbt_node.is_red(node["left"]), "No hay dos enlaces rojos seguidos"
+    left_black = check_invariants(node["left"])
+    right_black = check_invariants(node["right"])
+    assert left_black == right_black, "Todos los caminos tienen la misma altura negra"
+    size_left = node["left"]["size"] if node["left"] is not None else 0
+    size_right = node["right"]["size"] if node["right"] is not None else 0
+    assert node["size"] == size_left + size_right + 1
+    return left_black + (0 if rbt_node.is_red(node) else 1)
+
+
+@handle_not_implemented
+def test_new_persistent_tree():
+    empty_tree = pt.new_map()
+
+    assert empty_tree["root"] is None
+    assert empty_tree["_type"] == "PERSISTENT"
+    assert pt.is_empty(empty_tree)
+    assert pt.size(empty_tree) == 0
+
+
+@handle_not_implemented
+def test_put_keeps_versions():
+    empty_tree = setup_tests()
+
+    first = pt.put(empty_tree, 10, "diez")
+    second = pt.put(first, 20, "veinte")
+    third = pt.put(second, 10, "ten")
+
+    assert pt.is_empty(empty_tree)
+    assert pt.size(first) == 1 and pt.get(first, 20) is None
+    assert pt.get(second, 10) == "diez"
+    assert pt.get(third, 10) == "ten"
+    assert third["version"] > second["version"] > first["version"]
+
+    tree = setup_sorted_tree(200)
+    check_invariants(tree["root"])
+    assert pt.height(tree) <= 16
+    assert list(pt.iter_keys(tree, 1, 5)) == [1, 2, 3, 4, 5]
+
+
+@handle_not_implemented
+def test_remove_keeps_versions():
+    tree = setup_sorted_tree(100)
+
+    removed = pt.remove(tree, 50)
+    removed = pt.delete_min(removed)
+    removed = pt.delete_max(removed)
+    removed = pt.remove_range(removed, 10, 19)
+    check_invariants(removed["root"])
+
+    assert pt.size(tree) == 100
+    assert pt.get(tree, 50) == 500
+    assert pt.size(removed) == 87
+    assert pt.get(removed, 50) is None
+    assert pt.get_min(removed) == 2 and pt.get_max(removed) == 99
+    assert pt.remove(removed, 50) is removed
+
+
+@handle_not_implemented
+def test_remove_range_copies_paths():
+    tree = setup_sorted_tree(1000)
+
+    removed = pt.remove_range(tree, 200, 799)
+    check_invariants(removed["root"])
+    assert list(pt.iter_keys(removed, 198, 801)) == [198, 199, 800, 801]
+    assert pt.size(removed) == 400
+    assert pt.size(tree) == 1000 and pt.get(tree, 500) == 5000
+
+    # La parte eliminada no se recorre: solo se copian nodos de los caminos
+    # de la división y de la unión
+    old_nodes = set()
+    stack = [tree["root"]]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            old_nodes.add(id(node))
+            stack.extend((node["left"], node["right"]))
+    new_nodes = 0
+    stack = [removed["root"]]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            new_nodes += id(node) not in old_nodes
+            stack.extend((node["left"], node["right"]))
+    assert new_nodes <= 4 * pt.height(tree)
+
+
+@handle_not_implemented
+def test_shared_subtrees():
+    tree = setup_sorted_tree(1000)
+
+    updated = pt.put(tree, 1001, 10010)
+
+    # Solo se copia el camino hasta la llave nueva
+    old_nodes = set()
+    stack = [tree["root"]]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            old_nodes.add(id(node))
+            stack.extend((node["left"], node["right"]))
+    new_nodes = 0
+    stack = [updated["root"]]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            new_nodes += id(node) not in old_nodes
+            stack.extend((node["left"], node["right"]))
+    assert new_nodes <= 2 * pt.height(updated)
+
+
+@handle_not_implemented
+def test_weights():
+    keys = al.new_list()
+    values = al.new_list()
+    for i in range(1, 11):
+        al.add_last(keys, i)
+        al.add_last(values, [i])
+    tree = pt.build_from_sorted(keys, values, weight_func=len)
+    assert tree["_type"] == "PERSISTENT"
+
+    grown = pt.put(tree, 3, [3, 3, 3])
+    assert pt.range_sum(tree, 1, 10) == 10
+    assert pt.range_sum(grown, 1, 10) == 12
+
+    # Un valor modificado en sitio se comparte; refresh recalcula los pesos
+    # en una versión nueva
+    pt.get(grown, 4).append(4)
+    refreshed = pt.refresh(grown, 4)
+    assert pt.range_sum(refreshed, 1, 10) == 13
+    assert pt.range_sum(tree, 5, 10) == 6
@@ -0,0 +1,293 @@
+import math
+import random
+
+from DataStructures.Tree import red_black_tree as rbt
+from DataStructures.Tree import rbt_node as rbt_node
+from DataStructures.List import array_list as al
+from DataStructures.List import single_linked_list as sl
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_tree = rbt.new_map()
+
+    return empty_tree
+
+
+def setup_sorted_tree(n):
+    sorted_tree = rbt.new_map()
+    for i in range(1, n + 1):
+        rbt.put(sorted_tree, i, i * 10)
+
+    return sorted_tree
+
+
+def check_invariants(node):
+    """Verifica las propiedades del árbol y retorna su altura negra."""
+    if node is None:
+        return 0
+    assert not rbt_node.is_red(node["right"]), "Los enlaces rojos se inclinan a la izquierda"
+    if rbt_node.is_red(node):
+        assert not rbt_node.is_red(node["left"]), "No hay dos enlaces rojos seguidos"
+    if node["left"] is not None:
+        assert node["left"]["key"] < node["key"]
+    if node["right"] is not None:
+        assert node["right"]["key"] > node["key"]
+    left_black = check_invariants(node["left"])
+    right_black = check_invariants(node["right"])
+    assert left_black == right_black, "Todos los caminos tienen la misma altura negra"
+    size_left = node["left"]["size"] if node["left"] is not None else 0
+    size_right = node["right"]["size"] if node["right"] is not None else 0
+    assert node["size"] == size_left + size_right + 1
+    return left_black + (0 if rbt_node.is_red(node) else 1)
+
+
+def list_elements(lst):
+    elements = []
+    for i in range(sl.size(lst)):
+        elements.append(sl.get_element(lst, i))
+    return elements
+
+
+@handle_not_implemented
+def test_new_red_black_tree():
+    empty_rbt = rbt.new_map()
+
+    assert empty_rbt["root"] is None
+    assert rbt.is_empty(empty_rbt)
+    assert rbt.size(empty_rbt) == 0
+    assert rbt.height(empty_rbt) == 0
+
+
+@handle_not_implemented
+def test_put_get():
+    empty_rbt = setup_tests()
+
+    # Verificar que retorna None en árbol vacío
+    assert rbt.get(empty_rbt, 1) is None
+
+    tree = setup_sorted_tree(20)
+    assert rbt.size(tree) == 20
+    assert rbt.get(tree, 7) == 70
+    assert rbt.get(tree, 99) is None
+    assert rbt.contains(tree, 20)
+    assert not rbt.contains(tree, 21)
+
+    # Verificar que put actualiza el valor de una llave existente
+    rbt.put(tree, 7, "nuevo_valor")
+    assert rbt.get(tree, 7) == "nuevo_valor"
+    assert rbt.size(tree) == 20
+    check_invariants(tree["root"])
+
+
+@handle_not_implemented
+def test_balance():
+    # Llaves en orden ascendente: un BST sin balanceo quedaría con altura n
+    tree = setup_sorted_tree(1023)
+
+    assert not rbt_node.is_red(tree["root"])
+    check_invariants(tree["root"])
+    assert rbt.height(tree) <= 2 * math.log2(1024)
+
+    # Llaves en orden descendente
+    tree = setup_tests()
+    for i in range(1000, 0, -1):
+        rbt.put(tree, i, i)
+    check_invariants(tree["root"])
+    assert rbt.height(tree) <= 2 * math.log2(1001)
+
+
+@handle_not_implemented
+def test_remove():
+    tree = setup_sorted_tree(100)
+
+    # Eliminar una llave inexistente no afecta el árbol
+    rbt.remove(tree, 999)
+    assert rbt.size(tree) == 100
+
+    for i in range(1, 101, 2):
+        rbt.remove(tree, i)
+        check_invariants(tree["root"])
+    assert rbt.size(tree) == 50
+    assert rbt.get(tree, 1) is None
+    assert rbt.get(tree, 2) == 20
+
+    for i in range(2, 101, 2):
+        rbt.remove(tree, i)
+    assert rbt.is_empty(tree)
+
+
+@handle_not_implemented
+def test_min_max():
+    empty_rbt = setup_tests()
+    tree = setup_sorted_tree(10)
+
+    assert rbt.get_min(empty_rbt) is None
+    assert rbt.get_max(empty_rbt) is None
+    assert rbt.get_min(tree) == 1
+    assert rbt.get_max(tree) == 10
+
+    rbt.delete_min(tree)
+    rbt.delete_max(tree)
+    check_invariants(tree["root"])
+    assert rbt.get_min(tree) == 2
+    assert rbt.get_max(tree) == 9
+    assert rbt.size(tree) == 8
+
+    # Eliminar en un árbol vacío no causa errores
+    rbt.delete_min(empty_rbt)
+    rbt.delete_max(empty_rbt)
+    assert rbt.is_empty(empty_rbt)
+
+
+@handle_not_implemented
+def test_keys_values():
+    empty_rbt = setup_tests()
+    tree = setup_tests()
+    for key in [50, 20, 70, 10, 30, 60, 80]:
+        rbt.put(tree, key, key * 2)
+
+    assert sl.size(rbt.key_set(empty_rbt)) == 0
+    assert list_elements(rbt.key_set(tree)) == [10, 20, 30, 50, 60, 70, 80]
+    assert list_elements(rbt.value_set(tree)) == [20, 40, 60, 100, 120, 140, 160]
+    assert list_elements(rbt.keys(tree, 20, 60)) == [20, 30, 50, 60]
+    assert list_elements(rbt.values(tree, 15, 55)) == [40, 60, 100]
+
+
+@handle_not_implemented
+def test_range_sum():
+    weighted = rbt.new_map(weight_func=lambda value: value)
+    for key in [50, 20, 70, 10, 30, 60, 80]:
+        rbt.put(weighted, key, key)
+    assert rbt.range_sum(weighted, 20, 60) == 20 + 30 + 50 + 60
+    assert rbt.range_sum(weighted, 60, 20) == 0
+
+    # Los pesos se mantienen con las rotaciones al eliminar
+    rbt.remove(weighted, 50)
+    rbt.delete_min(weighted)
+    assert rbt.range_sum(weighted, 0, 100) == 20 + 30 + 60 + 70 + 80
+
+    # Sin función de peso cuenta las llaves del rango
+    tree = setup_sorted_tree(100)
+    assert rbt.range_sum(tree, 10, 19) == 10
+
+    # refresh recalcula los pesos después de modificar un valor en sitio
+    lists = rbt.new_map(weight_func=len)
+    rbt.put(lists, 1, [1])
+    rbt.put(lists, 2, [2])
+    rbt.get(lists, 2).append(3)
+    rbt.refresh(lists, 2)
+    assert rbt.range_sum(lists, 1, 2) == 3
+
+    # Con delta se suma la diferencia de peso sin llamar la función de peso
+    for key in range(3, 40):
+        rbt.put(lists, key, [key])
+    rbt.get(lists, 17).extend([0, 0])
+    rbt.refresh(lists, 17, 2)
+    rbt.get(lists, 30).append(0)
+    rbt.refresh(lists, 30)
+    assert rbt.range_sum(lists, 17, 17) == 3
+    assert rbt.range_sum(lists, 1, 39) == 43
+    assert rbt.range_sum(lists, 18, 30) == 14
+
+
+@handle_not_implemented
+def test_build_from_sorted():
+    keys = al.new_list()
+    values = al.new_list()
+    for i in range(1, 128):
+        al.add_last(keys, i)
+        al.add_last(values, i * 10)
+
+    built = rbt.build_from_sorted(keys, values)
+
+    assert rbt.size(built) == 127
+    assert rbt.get(built, 64) == 640
+    check_invariants(built["root"])
+
+    empty_rbt = rbt.build_from_sorted(al.new_list(), al.new_list())
+    assert rbt.is_empty(empty_rbt)
+
+
+@handle_not_implemented
+def test_iter_items():
+    empty_rbt = setup_tests()
+    tree = setup_sorted_tree(1000)
+
+    assert list(rbt.iter_items(empty_rbt)) == []
+    assert list(rbt.iter_keys(tree)) == list(range(1, 1001))
+    assert list(rbt.iter_values(tree, 10, 12)) == [100, 110, 120]
+    assert list(rbt.iter_items(tree, 999)) == [(999, 9990), (1000, 10000)]
+
+    # El recorrido se puede detener antes de terminar el rango
+    iterator = rbt.iter_keys(tree, 500)
+    assert [next(iterator), next(iterator)] == [500, 501]
+
+
+@handle_not_implemented
+def test_order_statistics():
+    empty_rbt = setup_tests()
+    tree = setup_tests()
+    for key in range(10, 1001, 10):
+        rbt.put(tree, key, key)
+
+    assert rbt.floor(tree, 35) == 30
+    assert rbt.floor(tree, 5) is None
+    assert rbt.ceiling(tree, 35) == 40
+    assert rbt.ceiling(tree, 1005) is None
+    assert rbt.floor(empty_rbt, 1) is None
+
+    assert rbt.select(tree, 0) == 10
+    assert rbt.select(tree, 99) == 1000
+    assert rbt.select(tree, 100) is None
+    assert rbt.select(tree, -1) is None
+    for pos in range(100):
+        assert rbt.rank(tree, rbt.select(tree, pos)) == pos
+
+    assert rbt.size_range(tree, 15, 55) == 4
+    assert rbt.size_range(tree, 55, 15) == 0
+
+
+@handle_not_implemented
+def test_remove_range():
+    tree = setup_sorted_tree(100)
+
+    rbt.remove_range(tree, 1, 40)
+    rbt.remove_range(tree, 90, 200)
+    assert rbt.size(tree) == 49
+    assert rbt.get_min(tree) == 41
+    assert rbt.get_max(tree) == 89
+    assert rbt.range_sum(tree, 1, 100) == 49
+    check_invariants(tree["root"])
+
+    rbt.remove_range(tree, 60, 50)
+    assert rbt.size(tree) == 49
+
+    # Rangos en el medio de un árbol con llaves en desorden y con pesos
+    weighted = rbt.new_map(weight_func=lambda value: value)
+    for key in random.Random(7).sample(range(500), 500):
+        rbt.put(weighted, key, 1)
+    for lo, hi in [(100, 399), (0, 49), (450, 600), (400, 400), (50, 99)]:
+        rbt.remove_range(weighted, lo, hi)
+        check_invariants(weighted["root"])
+    assert list(rbt.iter_keys(weighted)) == list(range(401, 450))
+    assert rbt.range_sum(weighted, 0, 500) == 49
+    assert rbt.height(weighted) <= 2 * math.log2(49 + 1)
+
+
+@handle_not_implemented
+def test_native_keys():
+    native = rbt.new_map()
+    compared = rbt.new_map(cmp_func=lambda a, b: (a > b) - (a < b))
+    assert native["native"] is True and compared["native"] is False
+
+    for key in range(1, 201):
+        rbt.put(native, key, key)
+        rbt.put(compared, key, key)
+    check_invariants(native["root"])
+
+    assert rbt.height(native) == rbt.height(compared)
+    assert list(rbt.iter_items(native, 50, 60)) == \
+        list(rbt.iter_items(compared, 50, 60))
+    assert rbt.get(native, 150) == 150
+    assert rbt.size_range(native, 10, 19) == 10
@@ -0,0 +1,240 @@
+import types
+
+from DataStructures.Tree import sorted_array_map as sam
+from DataStructures.List import array_list as al
+from DataStructures.List import single_linked_list as sl
+from DataStructures.Utils.utils import handle_not_implemented
+
+
+def setup_tests():
+    empty_map = sam.new_map()
+
+    return empty_map
+
+
+def setup_seven_keys():
+    seven_keys = sam.new_map()
+    for key in [40, 20, 60, 10, 30, 50, 70]:
+        sam.put(seven_keys, key, key)
+
+    return seven_keys
+
+
+def list_elements(lst):
+    elements = []
+    for i in range(sl.size(lst)):
+        elements.append(sl.get_element(lst, i))
+    return elements
+
+
+@handle_not_implemented
+def test_new_sorted_array_map():
+    empty_map = sam.new_map()
+
+    assert sam.is_empty(empty_map)
+    assert sam.size(empty_map) == 0
+    assert sam.height(empty_map) == 0
+    assert sam.get_min(empty_map) is None
+    assert sam.get_max(empty_map) is None
+
+
+@handle_not_implemented
+def test_put_get():
+    seven_keys = setup_seven_keys()
+
+    assert sam.size(seven_keys) == 7
+    assert sam.get(seven_keys, 30) == 30
+    assert sam.get(seven_keys, 35) is None
+    assert sam.contains(seven_keys, 70)
+    assert not sam.contains(seven_keys, 75)
+
+    sam.put(seven_keys, 30, "nuevo_valor")
+    assert sam.get(seven_keys, 30) == "nuevo_valor"
+    assert sam.size(seven_keys) == 7
+    assert sam.get_min(seven_keys) == 10
+    assert sam.get_max(seven_keys) == 70
+
+
+@handle_not_implemented
+def test_remove():
+    seven_keys = setup_seven_keys()
+
+    sam.remove(seven_keys, 999)
+    assert sam.size(seven_keys) == 7
+
+    sam.remove(seven_keys, 40)
+    sam.delete_min(seven_keys)
+    sam.delete_max(seven_keys)
+    assert list(sam.iter_keys(seven_keys)) == [20, 30, 50, 60]
+
+    sam.put(seven_keys, 25, 25)
+    sam.remove(seven_keys, 25)
+    assert sam.get(seven_keys, 25) is None
+    assert sam.size(seven_keys) == 4
+
+
+@handle_not_implemented
+def test_ranges():
+    seven_keys = setup_seven_keys()
+
+    assert list_elements(sam.keys(seven_keys, 20, 60)) == [20, 30, 40, 50, 60]
+    assert list_elements(sam.values(seven_keys, 15, 45)) == [20, 30, 40]
+    assert list_elements(sam.key_set(seven_keys)) == [10, 20, 30, 40, 50, 60, 70]
+    assert list(sam.iter_items(seven_keys, 65)) == [(70, 70)]
+    assert list(sam.iter_keys(seven_keys, 60, 20)) == []
+
+    assert sam.floor(seven_keys, 35) == 30
+    assert sam.ceiling(seven_keys, 35) == 40
+    assert sam.floor(seven_keys, 5) is None
+    assert sam.select(seven_keys, 3) == 40
+    assert sam.select(seven_keys, 7) is None
+    assert sam.rank(seven_keys, 35) == 3
+    assert sam.size_range(seven_keys, 15, 65) == 5
+
+
+@handle_not_implemented
+def test_range_sum():
+    weighted = sam.new_map(weight_func=len)
+    for key in [5, 1, 3]:
+        sam.put(weighted, key, [key] * key)
+    assert sam.range_sum(weighted, 1, 5) == 9
+    assert sam.range_sum(weighted, 2, 4) == 3
+    assert sam.range_sum(weighted, 4, 2) == 0
+
+    # refresh recalcula los pesos después de modificar un valor en sitio
+    sam.get(weighted, 3).append(3)
+    sam.refresh(weighted, 3)
+    assert sam.range_sum(weighted, 2, 4) == 4
+    sam.get(weighted, 3).append(3)
+    sam.refresh(weighted, 3, 1)
+    assert sam.range_sum(weighted, 2, 4) == 5
+    assert sam.range_sum(weighted, 1, 5) == 11
+    sam.get(weighted, 3).pop()
+    sam.refresh(weighted, 3, -1)
+
+    sam.remove(weighted, 1)
+    sam.put(weighted, 0, [0, 0])
+    assert sam.range_sum(weighted, 0, 5) == 11
+    sam.put(weighted, 5, [5])
+    assert sam.range_sum(weighted, 0, 5) == 7
+    sam.remove_range(weighted, 0, 3)
+    assert sam.range_sum(weighted, None, None) == 1
+
+    # Sin función de peso cuenta las llaves del rango
+    assert sam.range_sum(setup_seven_keys(), 20, 60) == 5
+
+
+@handle_not_implemented
+def test_build_from_sorted():
+    keys = al.new_list()
+    values = al.new_list()
+    for i in range(1, 128):
+        al.add_last(keys, i)
+        al.add_last(values, i * 10)
+
+    built = sam.build_from_sorted(keys, values, weight_func=lambda value: value)
+
+    assert sam.size(built) == 127
+    assert sam.get(built, 64) == 640
+    assert sam.height(built) == 7
+    assert sam.range_sum(built, 1, 3) == 60
+
+
+@handle_not_implemented
+def test_remove_range():
+    seven_keys = setup_seven_keys()
+
+    sam.remove_range(seven_keys, 25, 55)
+    assert list(sam.iter_keys(seven_keys)) == [10, 20, 60, 70]
+    assert sam.get(seven_keys, 30) is None
+
+    sam.remove_range(seven_keys, 70, 10)
+    assert sam.size(seven_keys) == 4
+
+
+@handle_not_implemented
+def test_queries_do_not_modify():
+    weighted = sam.new_map(weight_func=len)
+    for key in [40, 20, 60, 10, 30, 50, 70]:
+        sam.put(weighted, key, [key] * (key // 10))
+    fields = ("keys", "values", "weights", "fenwick", "pending_keys",
+              "pending_values", "pending_weights")
+    state = ([list(weighted[field]) for field in fields], weighted["version"])
+    assert weighted["pending_keys"]
+
+    # Ninguna consulta modifica las listas ni las sumas de pesos
+    sam.get_min(weighted)
+    sam.get_max(weighted)
+    sam.floor(weighted, 35)
+    sam.ceiling(weighted, 35)
+    sam.select(weighted, 2)
+    sam.rank(weighted, 45)
+    sam.size_range(weighted, 15, 55)
+    assert sam.range_sum(weighted, 15, 55) == 14
+    list(sam.iter_items(weighted, 20, 60))
+    sam.key_set(weighted)
+    assert ([weighted[field] for field in fields],
+            weighted["version"]) == state
+
+
+@handle_not_implemented
+def test_pending_buffer():
+    # Llaves en desorden: parte en las listas principales, parte en el buffer
+    weighted = sam.new_map(weight_func=len, buffer_size=8)
+    expected = {}
+    for i in range(100):
+        key = (i * 37) % 101
+        sam.put(weighted, key, [key] * (key % 5))
+        expected[key] = key % 5
+        if i % 9 == 0:
+            ordered = sorted(expected)
+            assert list(sam.iter_keys(weighted)) == ordered
+            for pos, key in enumerate(ordered):
+                assert sam.select(weighted, pos) == key
+                assert sam.rank(weighted, key) == pos
+            assert sam.select(weighted, len(ordered)) is None
+            assert len(weighted["pending_keys"]) < 8
+    assert sam.stats(weighted)["pending"] == len(weighted["pending_keys"])
+    assert sam.size(weighted) == 100
+
+    def brute(lo, hi):
+        return sum(w for k, w in expected.items() if lo <= k <= hi)
+
+    for lo, hi in [(0, 100), (10, 20), (33, 33), (50, 5), (-5, 7)]:
+        assert sam.range_sum(weighted, lo, hi) == brute(lo, hi)
+        assert sam.size_range(weighted, lo, hi) == \
+            len([k for k in expected if lo <= k <= hi])
+    assert sam.floor(weighted, 200) == sam.get_max(weighted) == max(expected)
+    assert sam.ceiling(weighted, -1) == sam.get_min(weighted) == min(expected)
+
+    # refresh sobre llaves del buffer y de las listas principales
+    for key in list(weighted["pending_keys"])[:2] + weighted["keys"][:2]:
+        sam.get(weighted, key).append(key)
+        sam.refresh(weighted, key, 1)
+        expected[key] += 1
+    assert sam.range_sum(weighted, None, None) == brute(0, 100)
+
+    sam.remove_range(weighted, 20, 60)
+    for key in range(20, 61):
+        expected.pop(key, None)
+    removed = weighted["pending_keys"][-1]
+    sam.remove(weighted, removed)
+    del expected[removed]
+    assert list(sam.iter_keys(weighted)) == sorted(expected)
+    assert sam.range_sum(weighted, None, None) == brute(0, 100)
+
+
+@handle_not_implemented
+def test_iter_is_lazy():
+    big = sam.new_map(buffer_size=4)
+    for key in range(0, 20000, 2):
+        sam.put(big, key, key)
+    sam.put(big, 5, 5)
+    # El recorrido no copia el rango: es un generador sobre las posiciones
+    it = sam.iter_items(big, 3, None)
+    assert isinstance(it, types.GeneratorType)
+    assert next(it) == (4, 4)
+    assert next(it) == (5, 5)
+    assert next(it) == (6, 6)
+    assert list(sam.iter_values(big, 19990, None)) == [19990, 19992, 19994,
+                                                       19996, 19998]
@@ -9,10 +9,13 @@ This code is based on the implementation proposed by the following authors/books
 from typing import Any, Callable
 
 from DataStructures.List import single_linked_list as sllt
+from DataStructures.List import array_list as alt
 from DataStructures.Utils import error 
 
 # Importar la definición de nodo desde bst_node.py para evitar duplicación.
 from .bst_node import new_node, get_key, get_value
+from .tree_functions import enable_op_log, stats
+from . import tree_functions as tf
 
 
 
@@ -30,8 +33,29 @@ def dflt_tree_node_cmp(key1: Any, key2: Any) -> int:
         return 1
 
 
-def new_map(cmp_func=dflt_tree_node_cmp) -> dict:
+def new_map(cmp_func=dflt_tree_node_cmp, weight_func=None, log_size=0,
+            native=None) -> dict:
     """Crea un nuevo árbol binario de búsqueda (BST).
+
+    Args:
+        cmp_func (Callable): Función de comparación de llaves.
+        weight_func (Callable): Función opcional que recibe el valor de un
+            nodo y retorna su peso (un número). Si se da, cada nodo guarda
+            en ``weight`` la suma de los pesos de su subárbol y
+            ``range_sum`` suma los pesos de un rango en O(altura).
+        log_size (int): Si es mayor que 0, se guarda el número de
+            comparaciones de las últimas log_size operaciones (ver
+            ``enable_op_log`` y ``stats``).
+        native (bool): Si es True, las operaciones comparan las llaves
+            directamente con ``==`` y ``<`` en lugar de llamar a cmp_func
+            (para llaves como enteros, cadenas o fechas). Por defecto se
+            activa solo si se usa la función de comparación por defecto;
+            con otra cmp_func se puede declarar si es equivalente al orden
+            natural de las llaves.
+
+    El árbol lleva en ``version`` un contador que aumenta con cada
+    modificación (``put``, ``remove``, ``refresh``); sirve para saber si
+    un resultado calculado antes sigue vigente.
     
     Returns:
         dict: Diccionario que representa el BST.
@@ -41,15 +65,71 @@ def new_map(cmp_func=dflt_tree_node_cmp) -> dict:
             root=None,
             size=0,
             cmp_func = cmp_func,
+            weight_func = weight_func,
+            version=0,
+            op_log=None,
+            native=native,
             _type="BST"
         )
         if _new_bst["cmp_func"] is None:
             _new_bst["cmp_func"] = dflt_tree_node_cmp
+        if native is None:
+            _new_bst["native"] = _new_bst["cmp_func"] is dflt_tree_node_cmp
+        enable_op_log(_new_bst, log_size)
         return _new_bst
     except Exception as exp:
         error.reraise("bst", "new_tree()", exp)
 
 
+def build_from_sorted(keys: dict, values: dict, cmp_func=dflt_tree_node_cmp,
+                      weight_func=None) -> dict:
+    """Crea un BST perfectamente balanceado a partir de llaves ordenadas.
+
+    El nodo raíz de cada subárbol es la llave de la mitad del rango, por lo
+    que la altura resultante es mínima sin importar el orden de llegada de
+    los datos.
+
+    Args:
+        keys (dict): Lista (array_list) de llaves en orden ascendente y sin repetidos.
+        values (dict): Lista (array_list) con el valor de cada llave, en el mismo orden.
+        cmp_func (Callable): Función de comparación del árbol.
+        weight_func (Callable): Función de peso del árbol (ver ``new_map``).
+
+    Returns:
+        dict: Diccionario que representa el BST.
+
+    Raises:
+        ValueError: Si las listas tienen distinto tamaño o las llaves no están
+            en orden estrictamente ascendente.
+    """
+    try:
+        tree = new_map(cmp_func, weight_func)
+        _cmp = tree["cmp_func"]
+        n = alt.size(keys)
+        if n != alt.size(values):
+            raise ValueError("keys y values deben tener el mismo tamaño")
+        for i in range(1, n):
+            if _cmp(alt.get_element(keys, i - 1), alt.get_element(keys, i)) >= 0:
+                raise ValueError("Las llaves deben estar en orden ascendente y sin repetidos")
+        tree["root"] = _build_from_sorted(keys, values, 0, n - 1, weight_func)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "bst", "build_from_sorted()")
+
+
+def _build_from_sorted(keys: dict, values: dict, lo: int, hi: int,
+                       weight_func: Callable) -> dict:
+    """Función recursiva que construye el subárbol balanceado de keys[lo..hi]."""
+    if lo > hi:
+        return None
+    mid = (lo + hi) // 2
+    node = new_node(alt.get_element(keys, mid), alt.get_element(values, mid))
+    node.left = _build_from_sorted(keys, values, lo, mid - 1, weight_func)
+    node.right = _build_from_sorted(keys, values, mid + 1, hi, weight_func)
+    tf.update_node(node, weight_func)
+    return node
+
+
 def put(tree: dict, k: Any, v: Any) -> dict:
     """Agrega un nuevo nodo al BST.
     
@@ -60,30 +140,34 @@ def put(tree: dict, k: Any, v: Any) -> dict:
     """
     try:
         _root = tree["root"]
-        _cmp = tree["cmp_func"]
-        _root = _put(_root, k, v, _cmp)
-        tree["root"] = _root
+        _cmp, _counter = tf.comparator(tree)
+        if _cmp is None:
+            _put_native(tree, k, v)
+        else:
+            _root = _put(_root, k, v, _cmp, tree.get("weight_func"))
+            tree["root"] = _root
+        tf.touch(tree)
+        tf.record(tree, "put", k, _counter)
         return tree
     except Exception as exp:
         error.reraise("bst", "put()", exp)
 
 
-def _put(node: dict, k: Any, v: Any, cmp_func: Callable) -> dict:
+def _put(node: dict, k: Any, v: Any, cmp_func: Callable,
+         weight_func: Callable = None) -> dict:
     """Función recursiva para insertar un nodo en el BST."""
     try:
         if node is None:
             node = new_node(k, v)
         else:
-            _cmp = cmp_func(k, node["key"])
+            _cmp = cmp_func(k, node.key)
             if _cmp < 0:
-                node["left"] = _put(node["left"], k, v, cmp_func)
+                node.left = _put(node.left, k, v, cmp_func, weight_func)
             elif _cmp > 0:
-                node["right"] = _put(node["right"], k, v, cmp_func)
+                node.right = _put(node.right, k, v, cmp_func, weight_func)
             else:
-                node["value"] = v
-        _left_n = _size(node["left"])
-        _right_n = _size(node["right"])
-        node["size"] = _left_n + _right_n + 1
+                node.value = v
+        tf.update_node(node, weight_func)
         return node
     except Exception as exp:
         error.reraise("bst", "_put()", exp)
@@ -93,9 +177,13 @@ def get(tree: dict, k: Any) -> dict:
     """Recupera un nodo del BST."""
     try:
         _root = tree["root"]
-        _cmp = tree["cmp_func"]
+        _cmp, _counter = tf.comparator(tree)
+        if _cmp is None:
+            result = tf.find_node(_root, k, None)
+            return result.value if result is not None else None
         result = _get(_root, k, _cmp)
-        return result["value"] if result is not None else None
+        tf.record(tree, "get", k, _counter)
+        return result.value if result is not None else None
     except Exception as exp:
         error.reraise("bst", "get()", exp)
 
@@ -105,13 +193,13 @@ def _get(node: dict, k: Any, cmp_func: Callable) -> dict:
     try:
         _node = None
         if node is not None:
-            _cmp = cmp_func(k, node["key"])
+            _cmp = cmp_func(k, node.key)
             if _cmp == 0:
                 _node = node
             elif _cmp < 0:
-                _node = _get(node["left"], k, cmp_func)
+                _node = _get(node.left, k, cmp_func)
             elif _cmp > 0:
-                _node = _get(node["right"], k, cmp_func)
+                _node = _get(node.right, k, cmp_func)
         return _node
     except Exception as exp:
         error.reraise("bst", "_get()", exp)
@@ -121,37 +209,39 @@ def remove(tree: dict, k: Any) -> dict:
     """Elimina un nodo del BST."""
     try:
         _root = tree["root"]
-        _cmp = tree["cmp_func"]
-        tree["root"] = _remove(_root, k, _cmp)
+        _cmp, _counter = tf.comparator(tree)
+        tree["root"] = _remove(_root, k, _cmp or tree["cmp_func"],
+                               tree.get("weight_func"))
+        tf.touch(tree)
+        tf.record(tree, "remove", k, _counter)
         return tree
     except Exception as exp:
         error.reraise("bst", "remove()", exp)
 
 
-def _remove(node: dict, k: Any, cmp_func: Callable) -> dict:
+def _remove(node: dict, k: Any, cmp_func: Callable,
+            weight_func: Callable = None) -> dict:
     """Función recursiva para eliminar un nodo del BST."""
     try:
         if node is None:
             return None
         elif node is not None:
-            _cmp = cmp_func(k, node["key"])
+            _cmp = cmp_func(k, node.key)
             if _cmp == 0:
-                if node["right"] is None:
-                    return node["left"]
-                elif node["left"] is None:
-                    return node["right"]
+                if node.right is None:
+                    return node.left
+                elif node.left is None:
+                    return node.right
                 else:
                     _node = node
-                    node = _min(node["right"])
-                    node["right"] = _delete_min(_node["right"])
-                    node["left"] = _node["left"]
+                    node = tf.min_node(node.right)
+                    node.right = _delete_min(_node.right, weight_func)
+                    node.left = _node.left
             elif _cmp < 0:
-                node["left"] = _remove(node["left"], k, cmp_func)
+                node.left = _remove(node.left, k, cmp_func, weight_func)
             elif _cmp > 0:
-                node["right"] = _remove(node["right"], k, cmp_func)
-        _left_n = _size(node["left"])
-        _right_n = _size(node["right"])
-        node["size"] = _left_n + _right_n + 1
+                node.right = _remove(node.right, k, cmp_func, weight_func)
+        tf.update_node(node, weight_func)
         return node
     except Exception as exp:
         error.reraise("bst", "_remove()", exp)
@@ -161,9 +251,12 @@ def contains(tree: dict, k: Any) -> bool:
     """Verifica si existe un nodo con la llave dada en el BST."""
     try:
         _root = tree["root"]
-        _cmp = tree["cmp_func"]
-        _found = False
-        return _contains(_root, k, _cmp, _found)
+        _cmp, _counter = tf.comparator(tree)
+        if _cmp is None:
+            return tf.find_node(_root, k, None) is not None
+        _found = _contains(_root, k, _cmp, False)
+        tf.record(tree, "contains", k, _counter)
+        return _found
     except Exception as exp:
         error.reraise("bst", "contains()", exp)
 
@@ -174,13 +267,13 @@ def _contains(node: dict, k: Any, cmp_func: Callable, found: bool) -> bool:
         if node is None:
             return found
         if node is not None:
-            _cmp = cmp_func(k, node["key"])
+            _cmp = cmp_func(k, node.key)
             if _cmp == 0:
                 found = True
             elif _cmp < 0:
-                found = _contains(node["left"], k, cmp_func, found)
+                found = _contains(node.left, k, cmp_func, found)
             elif _cmp > 0:
-                found = _contains(node["right"], k, cmp_func, found)
+                found = _contains(node.right, k, cmp_func, found)
         return found
     except Exception as exp:
         error.reraise("bst", "_contains()", exp)
@@ -189,16 +282,57 @@ def _contains(node: dict, k: Any, cmp_func: Callable, found: bool) -> bool:
 def size(tree: dict) -> int:
     """Retorna el número de nodos del BST."""
     try:
-        return _size(tree["root"])
+        return tf.node_size(tree["root"])
     except Exception as exp:
         error.reraise("bst", "size()", exp)
 
 
-def _size(node: dict) -> int:
-    """Función recursiva para contar el tamaño del BST."""
-    if node is None:
-        return 0
-    return node["size"]
+def refresh(tree: dict, k: Any, delta: Any = None) -> dict:
+    """Recalcula los pesos del camino hasta la llave k.
+
+    Se debe llamar después de modificar en sitio el valor guardado con la
+    llave k (por ejemplo, agregar elementos a una lista guardada como
+    valor), para que ``range_sum`` siga siendo correcto y la modificación
+    quede registrada en ``version``. Si la llave no está en el árbol no se
+    recalcula nada.
+
+    Solo cambia el peso del valor de k, así que se suma esa diferencia a
+    los pesos del camino: O(altura), con una sola llamada a la función de
+    peso. delta es la diferencia, si quien modificó el valor la conoce
+    (por ejemplo 1 al agregar un elemento a una lista que pesa su tamaño);
+    así no se llama la función de peso.
+    """
+    try:
+        tf.touch(tree)
+        weight_func = tree.get("weight_func")
+        if weight_func is None:
+            return tree
+        path = tf.find_path(tree["root"], k, tf.native_cmp(tree))
+        if path is not None:
+            if delta is None:
+                delta = tf.value_delta(path[-1], weight_func)
+            tf.add_weight(path, delta)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "bst", "refresh()")
+
+
+def range_sum(tree: dict, lo: Any, hi: Any) -> Any:
+    """Suma los pesos de los nodos con llaves en el rango [lo, hi].
+
+    Usa los pesos acumulados en cada nodo, por lo que recorre solo dos
+    caminos desde la raíz: O(altura). Si el árbol no tiene función de peso
+    cada nodo pesa 1 y el resultado es el número de llaves en el rango.
+    """
+    try:
+        _cmp = tf.native_cmp(tree)
+        if (hi < lo) if _cmp is None else (_cmp(lo, hi) > 0):
+            return 0
+        weight_func = tree.get("weight_func")
+        return (tf.sum_below(tree["root"], hi, _cmp, weight_func, True)
+                - tf.sum_below(tree["root"], lo, _cmp, weight_func, False))
+    except Exception as exp:
+        error.reraise(exp, "bst", "range_sum()")
 
 
 def is_empty(tree: dict) -> bool:
@@ -212,44 +346,34 @@ def is_empty(tree: dict) -> bool:
 def get_min(tree: dict) -> dict:
     """Recupera la llave mínima del BST."""
     try:
-        _min_node = _min(tree["root"])
+        _min_node = tf.min_node(tree["root"])
         if _min_node is not None:
-            return _min_node["key"]
+            return _min_node.key
         return None
     except Exception as exp:
         error.reraise("bst", "min()", exp)
 
 
-def _min(node: dict) -> dict:
-    """Función recursiva para obtener el nodo con la llave mínima."""
-    try:
-        if node is None:
-            return None
-        elif node["left"] is None:
-            return node
-        else:
-            return _min(node["left"])
-    except Exception as exp:
-        error.reraise("bst", "_min()", exp)
-
-
 def delete_min(tree: dict) -> dict:
     """Elimina el nodo con la llave mínima del BST."""
     try:
-        return _delete_min(tree["root"])
+        if tree["root"] is not None:
+            tree["root"] = _delete_min(tree["root"], tree.get("weight_func"))
+            tf.touch(tree)
+        return tree
     except Exception as exp:
         error.reraise("bst", "delete_min()", exp)
 
 
-def _delete_min(node: dict) -> dict:
+def _delete_min(node: dict, weight_func: Callable = None) -> dict:
     """Función recursiva para eliminar el nodo con la llave mínima."""
     try:
         if node is not None:
-            if node["left"] is None:
-                return node["right"]
+            if node.left is None:
+                return node.right
             else:
-                node["left"] = _delete_min(node["left"])
-            node["size"] = _size(node["left"]) + _size(node["right"]) + 1
+                node.left = _delete_min(node.left, weight_func)
+            tf.update_node(node, weight_func)
         return node
     except Exception as exp:
         error.reraise("bst", "_delete_min()", exp)
@@ -258,112 +382,328 @@ def _delete_min(node: dict) -> dict:
 def get_max(tree: dict) -> dict:
     """Recupera la llave máxima del BST."""
     try:
-        _max_node = _max(tree["root"])
+        _max_node = tf.max_node(tree["root"])
         if _max_node is not None:
-            return _max_node["key"]
+            return _max_node.key
         return None
     except Exception as exp:
         error.reraise("bst", "max()", exp)
 
 
-def _max(node: dict) -> dict:
-    """Función recursiva para obtener el nodo con la llave máxima."""
+def delete_max(tree: dict) -> dict:
+    """Elimina el nodo con la llave máxima del BST."""
     try:
-        if node is None:
-            return None
-        elif node["right"] is None:
-            return node
-        else:
-            return _max(node["right"])
+        if tree["root"] is not None:
+            tree["root"] = _delete_max(tree["root"], tree.get("weight_func"))
+            tf.touch(tree)
+        return tree
     except Exception as exp:
-        error.reraise("bst", "_max()", exp)
+        error.reraise(exp, "bst", "delete_max()")
 
 
-def delete_max(tree: dict) -> dict:
-    """Elimina el nodo con la llave máxima del BST."""
+def _delete_max(node: dict, weight_func: Callable = None) -> dict:
+    """Función recursiva para eliminar el nodo con la llave máxima."""
     try:
-        return _delete_max(tree["root"])
+        if node is not None:
+            if node.right is None:
+                return node.left
+            else:
+                node.right = _delete_max(node.right, weight_func)
+            tf.update_node(node, weight_func)
+        return node
     except Exception as exp:
-        error.reraise("bst", "delete_max()", exp)
+        error.reraise(exp, "bst", "_delete_max()")
 
 
-def _delete_max(node: dict) -> dict:
-    """Función recursiva para eliminar el nodo con la llave máxima."""
+def floor(tree: dict, k: Any) -> Any:
+    """Retorna la mayor llave del BST menor o igual a k (None si no hay)."""
     try:
-        # Implementación pendiente
-        pass
+        return tf.floor_key(tree["root"], k, tf.native_cmp(tree))
     except Exception as exp:
-        error.reraise("bst", "_delete_max()", exp)
+        error.reraise(exp, "bst", "floor()")
 
 
-def height(tree: dict) -> int:
-    """Retorna la altura del BST."""
+def ceiling(tree: dict, k: Any) -> Any:
+    """Retorna la menor llave del BST mayor o igual a k (None si no hay)."""
     try:
-        return _height(tree["root"])
+        return tf.ceiling_key(tree["root"], k, tf.native_cmp(tree))
     except Exception as exp:
-        error.reraise("bst", "height()", exp)
+        error.reraise(exp, "bst", "ceiling()")
 
 
-def _height(node: dict) -> int:
+def select(tree: dict, pos: int) -> Any:
+    """Retorna la llave en la posición pos (desde 0) del orden de las llaves.
+
+    Retorna None si pos no está entre 0 y size(tree) - 1.
+    """
     try:
-        if node is None:
-            return -1
-        else:
-            left_h = _height(node["left"])
-            right_h = _height(node["right"])
-            return max(left_h, right_h) + 1
+        return tf.select_key(tree["root"], pos)
+    except Exception as exp:
+        error.reraise(exp, "bst", "select()")
+
+
+def rank(tree: dict, k: Any) -> int:
+    """Retorna el número de llaves del BST estrictamente menores a k."""
+    try:
+        return tf.sum_below(tree["root"], k, tf.native_cmp(tree), None, False)
     except Exception as exp:
-        error.reraise("bst", "_height()", exp)
+        error.reraise(exp, "bst", "rank()")
+
+
+def size_range(tree: dict, lo: Any, hi: Any) -> int:
+    """Retorna el número de llaves en el rango [lo, hi] en O(altura)."""
+    try:
+        _cmp = tf.native_cmp(tree)
+        if (hi < lo) if _cmp is None else (_cmp(lo, hi) > 0):
+            return 0
+        return (tf.sum_below(tree["root"], hi, _cmp, None, True)
+                - tf.sum_below(tree["root"], lo, _cmp, None, False))
+    except Exception as exp:
+        error.reraise(exp, "bst", "size_range()")
+
+
+def split(tree: dict, k: Any) -> tuple:
+    """Divide el BST en dos: las llaves menores a k y las mayores o iguales.
+
+    Solo se recorre el camino de la raíz hasta k, por lo que es O(altura).
+    Los nodos pasan a los árboles resultantes y el árbol original queda
+    vacío.
+
+    Returns:
+        tuple: (árbol con las llaves < k, árbol con las llaves >= k)
+    """
+    try:
+        weight_func = tree.get("weight_func")
+        _left, _right = _split(tree["root"], k, tree["cmp_func"],
+                               weight_func, False)
+        tree["root"] = None
+        tf.touch(tree)
+        left = new_map(tree["cmp_func"], weight_func, native=tree.get("native"))
+        left["root"] = _left
+        right = new_map(tree["cmp_func"], weight_func, native=tree.get("native"))
+        right["root"] = _right
+        return left, right
+    except Exception as exp:
+        error.reraise(exp, "bst", "split()")
+
+
+def _split(node: dict, k: Any, cmp_func: Callable, weight_func: Callable,
+           inclusive: bool) -> tuple:
+    """Función recursiva que divide el subárbol en las llaves menores a k
+    (o iguales si inclusive) y el resto."""
+    if node is None:
+        return None, None
+    _cmp = cmp_func(k, node.key)
+    if _cmp > 0 or (_cmp == 0 and inclusive):
+        _left, _right = _split(node.right, k, cmp_func, weight_func, inclusive)
+        node.right = _left
+        tf.update_node(node, weight_func)
+        return node, _right
+    _left, _right = _split(node.left, k, cmp_func, weight_func, inclusive)
+    node.left = _right
+    tf.update_node(node, weight_func)
+    return _left, node
+
+
+def join(left: dict, right: dict) -> dict:
+    """Une dos BST en uno. Todas las llaves de left deben ser menores que
+    las de right.
+
+    La llave máxima de left pasa a ser la raíz, con left y right como
+    subárboles: O(altura). Los dos árboles originales quedan vacíos.
+
+    Raises:
+        ValueError: Si alguna llave de left no es menor que todas las de right.
+    """
+    try:
+        _cmp = left["cmp_func"]
+        if (left["root"] is not None and right["root"] is not None
+                and _cmp(tf.max_node(left["root"]).key, tf.min_node(right["root"]).key) >= 0):
+            raise ValueError("Las llaves de left deben ser menores que las de right")
+        weight_func = left.get("weight_func")
+        tree = new_map(_cmp, weight_func, native=left.get("native"))
+        tree["root"] = _join(left["root"], right["root"], weight_func)
+        for _tree in (left, right):
+            _tree["root"] = None
+            tf.touch(_tree)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "bst", "join()")
+
+
+def _join(left: dict, right: dict, weight_func: Callable) -> dict:
+    """Une dos subárboles cuyas llaves ya están separadas."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    node = tf.max_node(left)
+    node.left = _delete_max(left, weight_func)
+    node.right = right
+    tf.update_node(node, weight_func)
+    return node
+
+
+def remove_range(tree: dict, lo: Any, hi: Any) -> dict:
+    """Elimina del BST todas las llaves del rango [lo, hi].
+
+    El árbol se divide en lo y en hi y se unen las dos partes de los
+    extremos; la parte del medio se descarta completa. Es O(altura) sin
+    importar cuántas llaves se eliminen.
+    """
+    try:
+        _cmp = tree["cmp_func"]
+        if _cmp(lo, hi) > 0:
+            return tree
+        weight_func = tree.get("weight_func")
+        _left, _rest = _split(tree["root"], lo, _cmp, weight_func, False)
+        _middle, _right = _split(_rest, hi, _cmp, weight_func, True)
+        tree["root"] = _join(_left, _right, weight_func)
+        tf.touch(tree)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "bst", "remove_range()")
+
+
+def height(tree: dict) -> int:
+    """Retorna la altura del BST: el número de nodos del camino más largo
+    desde la raíz (0 si el árbol está vacío).
+
+    Cada nodo guarda la altura de su subárbol, por lo que es O(1).
+    """
+    try:
+        return tf.node_height(tree["root"])
+    except Exception as exp:
+        error.reraise(exp, "bst", "height()")
 
 
 def keys(tree: dict, lo, hi) -> dict:
     try:
         keys_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
-        _keys(tree["root"], keys_lt, tree["cmp_func"], lo, hi)
+        if tf.native_cmp(tree) is None:
+            for k in iter_keys(tree, lo, hi):
+                sllt.add_last(keys_lt, k)
+            return keys_lt
+        tf.add_range(tree["root"], keys_lt, tree["cmp_func"], lo, hi, "key")
         return keys_lt
     except Exception as exp:
         error.reraise("bst", "keys()", exp)
 
 def key_set(tree: dict) -> dict:
-    keys_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
-    height = _height(tree["root"])
-    _keys(tree["root"], keys_lt, tree["cmp_func"], 0, height)
-    return keys_lt
-
-
-def _keys(node: dict, keys_lt: dict, cmp_func: Callable, lo: Any, hi: Any ) -> None:
-    if node is None:
-        return
-    if cmp_func(lo, node["key"]) < 0:
-        _keys(node["left"], keys_lt, cmp_func, lo, hi)
-    if cmp_func(lo, node["key"]) <= 0 and cmp_func(hi, node["key"]) >= 0:
-        sllt.add_last(keys_lt, node["key"])
-    if cmp_func(hi, node["key"]) > 0:
-        _keys(node["right"], keys_lt, cmp_func, lo, hi)
+    """Retorna una lista con todas las llaves del BST, en orden."""
+    try:
+        keys_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
+        for k in iter_keys(tree):
+            sllt.add_last(keys_lt, k)
+        return keys_lt
+    except Exception as exp:
+        error.reraise(exp, "bst", "key_set()")
 
 
 def values(tree: dict, lo: Any, hi: Any ) -> dict:
     """Retorna una lista de valores del BST."""
     try:
         values_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
-        _values(tree["root"], values_lt, tree["cmp_func"], lo, hi)
+        if tf.native_cmp(tree) is None:
+            for v in iter_values(tree, lo, hi):
+                sllt.add_last(values_lt, v)
+            return values_lt
+        tf.add_range(tree["root"], values_lt, tree["cmp_func"], lo, hi, "value")
         return values_lt
     except Exception as exp:
         error.reraise("bst", "values()", exp)
         
 def value_set(tree: dict) -> dict:
-    values_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
-    height = _height(tree["root"])
-    _values(tree["root"], values_lt, tree["cmp_func"], 0, height)
-    return values_lt
+    """Retorna una lista con todos los valores del BST, en orden de llave."""
+    try:
+        values_lt = sllt.new_list(cmpfunction = tree["cmp_func"])
+        for v in iter_values(tree):
+            sllt.add_last(values_lt, v)
+        return values_lt
+    except Exception as exp:
+        error.reraise(exp, "bst", "value_set()")
 
 
-def _values(node: dict, values_lt: dict, cmp_func: Callable, lo: Any, hi: Any) -> None:
-    if node is None:
+def iter_keys(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las llaves del rango [lo, hi] sin crear una lista.
+
+    Ver ``iter_items``.
+    """
+    return map(tf.node_key, _iter_nodes(tree, lo, hi))
+
+
+def iter_values(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden de llave los valores del rango [lo, hi] sin crear
+    una lista.
+
+    Ver ``iter_items``.
+    """
+    return map(tf.node_value, _iter_nodes(tree, lo, hi))
+
+
+def iter_items(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las parejas (llave, valor) del rango [lo, hi].
+
+    Es un iterador: los elementos se producen a medida que se piden y el
+    recorrido se puede detener en cualquier momento (por ejemplo, después
+    de los primeros n elementos) sin visitar el resto del rango. Usa una
+    pila explícita en lugar de recursión. Si lo o hi son None, el rango no
+    tiene límite por ese lado.
+
+    El árbol no se debe modificar mientras se recorre.
+    """
+    return map(tf.node_item, _iter_nodes(tree, lo, hi))
+
+
+def _iter_nodes(tree: dict, lo: Any, hi: Any):
+    """Generador de los nodos del rango [lo, hi], en orden."""
+    try:
+        yield from tf.iter_nodes(tree["root"], lo, hi, tf.native_cmp(tree))
+    except Exception as exp:
+        error.reraise(exp, "bst", "iter_items()")
+
+
+# Comparación directa de llaves nativas
+
+
+def _put_native(tree: dict, k: Any, v: Any) -> None:
+    """Inserción iterativa comparando las llaves directamente.
+
+    Guarda el camino recorrido y al final lo actualiza sin recalcular cada
+    nodo desde sus hijos: una hoja nueva suma 1 al tamaño y su peso al
+    peso de cada nodo del camino, y un valor reemplazado suma la
+    diferencia de pesos. Solo la altura se recalcula.
+    """
+    weight_func = tree.get("weight_func")
+    path = []
+    node = tree["root"]
+    while node is not None:
+        key = node.key
+        if k == key:
+            if weight_func is not None:
+                delta = weight_func(v) - weight_func(node.value)
+                node.weight += delta
+                for _node in path:
+                    _node.weight += delta
+            node.value = v
+            return
+        path.append(node)
+        node = node.left if k < key else node.right
+    node = new_node(k, v)
+    if weight_func is not None:
+        node.weight = weight_func(v)
+    if not path:
+        tree["root"] = node
         return
-    if cmp_func(lo, node["key"]) < 0:
-        _values(node["left"], values_lt, cmp_func, lo, hi)
-    if cmp_func(lo, node["key"]) <= 0 and cmp_func(hi, node["key"]) >= 0:
-        sllt.add_last(values_lt, node["value"])
-    if cmp_func(hi, node["key"]) > 0:
-        _values(node["right"], values_lt, cmp_func, lo, hi)
\ No newline at end of file
+    if k < path[-1].key:
+        path[-1].left = node
+    else:
+        path[-1].right = node
+    _height = 1
+    for _node in reversed(path):
+        _node.size += 1
+        if weight_func is not None:
+            _node.weight += node.weight
+        _height += 1
+        if _node.height < _height:
+            _node.height = _height
@@ -1,8 +1,66 @@
 """
 Estructura que contiene la información a guardar en un ``nodo`` de un árbol binario
+
+Los nodos son objetos de la clase ``BSTNode``, que guarda sus campos en
+``__slots__`` (sin un diccionario por nodo). Los campos se pueden leer y
+modificar como atributos (``node.left``) o por nombre, igual que un
+diccionario (``node["left"]``).
 """
 
 
+class BSTNode:
+    """
+    Nodo de un árbol binario de búsqueda.
+
+    Atributos:
+    - **key**: Llave del nodo
+    - **value**: Valor del nodo
+    - **size**: Número de nodos del subárbol que empieza en el nodo
+    - **height**: Altura del subárbol que empieza en el nodo (1 si es una
+      hoja)
+    - **left**: Hijo izquierdo del nodo
+    - **right**: Hijo derecho del nodo
+    - **weight**: Suma de los pesos del subárbol (ver
+      ``binary_search_tree.new_map``)
+    - **type**: Tipo de árbol ("BST"). Es igual para todos los nodos
+    """
+
+    __slots__ = ("key", "value", "size", "height", "left", "right", "weight")
+
+    type = "BST"
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.size = 1
+        self.height = 1
+        self.left = None
+        self.right = None
+        self.weight = 0
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __setitem__(self, field, value):
+        try:
+            setattr(self, field, value)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def __contains__(self, field):
+        return field == "type" or field in self.__slots__
+
+    def __repr__(self):
+        return "%s(key=%r, value=%r, size=%r)" % (
+            type(self).__name__, self.key, self.value, self.size)
+
+
 def new_node(key, value):
     """
     Crea una nueva entrada (de tipo :ref:`bst_node<bst-node>`) de un árbol binario con una llave y un valor dados.
@@ -11,9 +69,10 @@ def new_node(key, value):
     - **key**: Llave del nodo
     - **value**: Valor del nodo
     - **size**: Tamaño del nodo. Inicializado en 1
+    - **height**: Altura del nodo. Inicializada en 1
     - **left**: Hijo izquierdo del nodo. Inicializado en ``None``
     - **right**: Hijo derecho del nodo. Inicializado en ``None``
-    - **type**: Tipo de árbol. Inicializado en "BST"
+    - **type**: Tipo de árbol. Siempre "BST"
 
     :param key: Llave del nodo
     :type key: any
@@ -23,15 +82,7 @@ def new_node(key, value):
     :returns: Nodo creado
     :rtype: bst_node
     """
-    node = {
-        "key": key,
-        "value": value,
-        "size": 1,
-        "left": None,
-        "right": None,
-        "type": "BST",
-    }
-    return node
+    return BSTNode(key, value)
 
 
 def get_value(my_node):
@@ -46,7 +97,7 @@ def get_value(my_node):
     """
     value = None
     if my_node is not None:
-        value = my_node["value"]
+        value = my_node.value
     return value
 
 
@@ -62,5 +113,5 @@ def get_key(my_node):
     """
     key = None
     if my_node is not None:
-        key = my_node["key"]
+        key = my_node.key
     return key
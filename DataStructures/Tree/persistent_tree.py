@@ -0,0 +1,385 @@
+"""
+Module to handle a persistent (path-copying) left-leaning red-black tree.
+
+Ofrece la misma interfaz que ``red_black_tree``, pero los árboles no se
+modifican nunca: ``put``, ``remove``, ``refresh``, ``delete_min``,
+``delete_max`` y ``remove_range`` retornan un árbol nuevo y el árbol
+original sigue siendo válido. Solo se copian los nodos del camino que
+cambia (O(log n) nodos por operación); el resto de los subárboles se
+comparte entre las versiones.
+
+Esto permite que un lector consulte una versión del árbol mientras otro
+hilo sigue agregando datos, sin bloqueos ni copias completas::
+
+    tree = pt.put(tree, k, v)   # el árbol anterior no cambia
+
+Los valores guardados sí se comparten entre versiones: si se modifican en
+sitio, el cambio se ve en todas.
+
+Las consultas son las mismas de ``red_black_tree`` (los nodos tienen la
+misma forma).
+
+This code is based on the implementation proposed by the following authors/books:
+    #. Algorithms, 4th Edition, Robert Sedgewick and Kevin Wayne.
+    #. Purely Functional Data Structures, Chris Okasaki.
+"""
+
+from typing import Any, Callable
+
+from DataStructures.Utils import error
+
+from .rbt_node import new_node, is_red, RED, BLACK
+from .tree_functions import enable_op_log, stats
+from . import tree_functions as tf
+from .red_black_tree import dflt_tree_node_cmp
+from .red_black_tree import (get, contains, size, height, is_empty, get_min,
+                             get_max, floor, ceiling, select, rank,
+                             size_range, range_sum, keys, values, key_set,
+                             value_set, iter_keys, iter_values, iter_items)
+from . import red_black_tree as rbt
+
+
+def new_map(cmp_func=dflt_tree_node_cmp, weight_func=None, log_size=0,
+            native=None) -> dict:
+    """Crea un nuevo árbol persistente vacío.
+
+    Los parámetros son los de ``red_black_tree.new_map``. El campo
+    ``version`` de cada árbol nuevo es el de su antecesor más uno.
+
+    Returns:
+        dict: Diccionario que representa el árbol.
+    """
+    try:
+        tree = rbt.new_map(cmp_func, weight_func, log_size, native)
+        tree["_type"] = "PERSISTENT"
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "persistent", "new_map()")
+
+
+def build_from_sorted(keys: dict, values: dict, cmp_func=dflt_tree_node_cmp,
+                      weight_func=None) -> dict:
+    """Crea un árbol persistente a partir de llaves ordenadas (ver
+    ``red_black_tree.build_from_sorted``)."""
+    try:
+        tree = rbt.build_from_sorted(keys, values, cmp_func, weight_func)
+        tree["_type"] = "PERSISTENT"
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "persistent", "build_from_sorted()")
+
+
+def _derive(tree: dict, root: dict) -> dict:
+    """Retorna una nueva versión del árbol con otra raíz."""
+    _tree = dict(tree)
+    _tree["root"] = root
+    _tree["version"] = tree.get("version", 0) + 1
+    return _tree
+
+
+def _copy(node: dict) -> dict:
+    """Copia un nodo (no sus hijos) para poder modificarlo."""
+    _node = new_node(node.key, node.value, node.color)
+    _node.size = node.size
+    _node.height = node.height
+    _node.weight = node.weight
+    _node.left = node.left
+    _node.right = node.right
+    return _node
+
+
+# Funciones de balanceo. El nodo que reciben debe ser una copia; los hijos
+# que modifican se copian aquí.
+
+
+def _rotate_left(node: dict, weight_func: Callable = None) -> dict:
+    """Rota a la izquierda un enlace rojo que se inclina a la derecha."""
+    _right = _copy(node.right)
+    node.right = _right.left
+    _right.left = node
+    _right.color = node.color
+    node.color = RED
+    tf.update_node(node, weight_func)
+    tf.update_node(_right, weight_func)
+    return _right
+
+
+def _rotate_right(node: dict, weight_func: Callable = None) -> dict:
+    """Rota a la derecha un enlace rojo que se inclina a la izquierda."""
+    _left = _copy(node.left)
+    node.left = _left.right
+    _left.right = node
+    _left.color = node.color
+    node.color = RED
+    tf.update_node(node, weight_func)
+    tf.update_node(_left, weight_func)
+    return _left
+
+
+def _flip_colors(node: dict) -> None:
+    """Invierte los colores del nodo y de copias de sus dos hijos."""
+    node.color = BLACK if node.color == RED else RED
+    node.left = _copy(node.left)
+    node.right = _copy(node.right)
+    for _child in (node.left, node.right):
+        _child.color = BLACK if _child.color == RED else RED
+
+
+def _balance(node: dict, weight_func: Callable = None) -> dict:
+    """Restaura las propiedades del árbol rojo-negro en el nodo."""
+    if is_red(node.right) and not is_red(node.left):
+        node = _rotate_left(node, weight_func)
+    if is_red(node.left) and is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+    if is_red(node.left) and is_red(node.right):
+        _flip_colors(node)
+    tf.update_node(node, weight_func)
+    return node
+
+
+def _move_red_left(node: dict, weight_func: Callable = None) -> dict:
+    """Hace rojo el hijo izquierdo (o uno de sus hijos) antes de bajar por él."""
+    _flip_colors(node)
+    if is_red(node.right.left):
+        node.right = _rotate_right(node.right, weight_func)
+        node = _rotate_left(node, weight_func)
+        _flip_colors(node)
+    return node
+
+
+def _move_red_right(node: dict, weight_func: Callable = None) -> dict:
+    """Hace rojo el hijo derecho (o uno de sus hijos) antes de bajar por él."""
+    _flip_colors(node)
+    if is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+        _flip_colors(node)
+    return node
+
+
+def put(tree: dict, k: Any, v: Any) -> dict:
+    """Retorna un árbol nuevo con la pareja llave-valor agregada (o con el
+    valor reemplazado si la llave existe). El árbol recibido no cambia.
+    """
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        _root = _put(tree["root"], k, v, _cmp, tree.get("weight_func"))
+        _root.color = BLACK
+        tf.record(tree, "put", k, _counter)
+        return _derive(tree, _root)
+    except Exception as exp:
+        error.reraise(exp, "persistent", "put()")
+
+
+def _put(node: dict, k: Any, v: Any, cmp_func: Callable,
+         weight_func: Callable = None) -> dict:
+    """Función recursiva que inserta copiando el camino. Si cmp_func es
+    None las llaves se comparan directamente."""
+    if node is None:
+        node = new_node(k, v, RED)
+        tf.update_node(node, weight_func)
+        return node
+    node = _copy(node)
+    if cmp_func is None:
+        _cmp = 0 if k == node.key else (-1 if k < node.key else 1)
+    else:
+        _cmp = cmp_func(k, node.key)
+    if _cmp < 0:
+        node.left = _put(node.left, k, v, cmp_func, weight_func)
+    elif _cmp > 0:
+        node.right = _put(node.right, k, v, cmp_func, weight_func)
+    else:
+        node.value = v
+    if is_red(node.right) and not is_red(node.left):
+        node = _rotate_left(node, weight_func)
+    if is_red(node.left) and is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+    if is_red(node.left) and is_red(node.right):
+        _flip_colors(node)
+    tf.update_node(node, weight_func)
+    return node
+
+
+def remove(tree: dict, k: Any) -> dict:
+    """Retorna un árbol nuevo sin la llave k. Si la llave no está, retorna
+    el mismo árbol."""
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        _cmp = _cmp or tree["cmp_func"]
+        _root = tree["root"]
+        if tf.find_node(_root, k, _cmp) is None:
+            tf.record(tree, "remove", k, _counter)
+            return tree
+        _root = _copy(_root)
+        if not is_red(_root.left) and not is_red(_root.right):
+            _root.color = RED
+        _root = _remove(_root, k, _cmp, tree.get("weight_func"))
+        if _root is not None:
+            _root.color = BLACK
+        tf.record(tree, "remove", k, _counter)
+        return _derive(tree, _root)
+    except Exception as exp:
+        error.reraise(exp, "persistent", "remove()")
+
+
+def _remove(node: dict, k: Any, cmp_func: Callable,
+            weight_func: Callable = None) -> dict:
+    """Función recursiva que elimina una llave que está en el subárbol,
+    copiando el camino."""
+    node = _copy(node)
+    if cmp_func(k, node.key) < 0:
+        if not is_red(node.left) and not is_red(node.left.left):
+            node = _move_red_left(node, weight_func)
+        node.left = _remove(node.left, k, cmp_func, weight_func)
+    else:
+        if is_red(node.left):
+            node = _rotate_right(node, weight_func)
+        if cmp_func(k, node.key) == 0 and node.right is None:
+            return None
+        if not is_red(node.right) and not is_red(node.right.left):
+            node = _move_red_right(node, weight_func)
+        if cmp_func(k, node.key) == 0:
+            _successor = tf.min_node(node.right)
+            node.key = _successor.key
+            node.value = _successor.value
+            node.right = _delete_min(node.right, weight_func)
+        else:
+            node.right = _remove(node.right, k, cmp_func, weight_func)
+    return _balance(node, weight_func)
+
+
+def refresh(tree: dict, k: Any, delta: Any = None) -> dict:
+    """Retorna un árbol nuevo con los pesos del camino hasta la llave k
+    recalculados (ver ``binary_search_tree.refresh``, también para
+    delta).
+
+    El valor de k se comparte con el árbol original, así que si se
+    modificó en sitio el cambio también se ve allí; para que las versiones
+    anteriores no cambien se debe guardar una copia del valor con ``put``.
+    """
+    try:
+        weight_func = tree.get("weight_func")
+        _cmp = tree["cmp_func"]
+        path = tf.find_path(tree["root"], k, _cmp)
+        if path is None:
+            return _derive(tree, tree["root"])
+        if weight_func is not None and delta is None:
+            delta = tf.value_delta(path[-1], weight_func)
+        _child = None
+        for _node in reversed(path):
+            _node = _copy(_node)
+            if _child is not None:
+                if _cmp(_child.key, _node.key) < 0:
+                    _node.left = _child
+                else:
+                    _node.right = _child
+            if weight_func is not None:
+                _node.weight += delta
+            _child = _node
+        return _derive(tree, _child)
+    except Exception as exp:
+        error.reraise(exp, "persistent", "refresh()")
+
+
+def delete_min(tree: dict) -> dict:
+    """Retorna un árbol nuevo sin la llave mínima."""
+    try:
+        _root = tree["root"]
+        if _root is None:
+            return tree
+        _root = _copy(_root)
+        if not is_red(_root.left) and not is_red(_root.right):
+            _root.color = RED
+        _root = _delete_min(_root, tree.get("weight_func"))
+        if _root is not None:
+            _root.color = BLACK
+        return _derive(tree, _root)
+    except Exception as exp:
+        error.reraise(exp, "persistent", "delete_min()")
+
+
+def _delete_min(node: dict, weight_func: Callable = None) -> dict:
+    """Función recursiva que elimina la llave mínima copiando el camino."""
+    if node.left is None:
+        return None
+    node = _copy(node)
+    if not is_red(node.left) and not is_red(node.left.left):
+        node = _move_red_left(node, weight_func)
+    node.left = _delete_min(node.left, weight_func)
+    return _balance(node, weight_func)
+
+
+def delete_max(tree: dict) -> dict:
+    """Retorna un árbol nuevo sin la llave máxima."""
+    try:
+        _root = tree["root"]
+        if _root is None:
+            return tree
+        _root = _copy(_root)
+        if not is_red(_root.left) and not is_red(_root.right):
+            _root.color = RED
+        _root = _delete_max(_root, tree.get("weight_func"))
+        if _root is not None:
+            _root.color = BLACK
+        return _derive(tree, _root)
+    except Exception as exp:
+        error.reraise(exp, "persistent", "delete_max()")
+
+
+def _delete_max(node: dict, weight_func: Callable = None) -> dict:
+    """Función recursiva que elimina la llave máxima copiando el camino."""
+    node = _copy(node)
+    if is_red(node.left):
+        node = _rotate_right(node, weight_func)
+    if node.right is None:
+        return None
+    if not is_red(node.right) and not is_red(node.right.left):
+        node = _move_red_right(node, weight_func)
+    node.right = _delete_max(node.right, weight_func)
+    return _balance(node, weight_func)
+
+
+def remove_range(tree: dict, lo: Any, hi: Any) -> dict:
+    """Retorna un árbol nuevo sin las llaves del rango [lo, hi].
+
+    Como en ``red_black_tree.remove_range``, el árbol se divide en lo y en
+    hi y se unen las partes de los extremos, copiando solo los nodos de
+    los caminos que cambian: O(log n) sin importar cuántas llaves se
+    eliminen.
+    """
+    try:
+        _cmp = tree["cmp_func"]
+        if tree["root"] is None or _cmp(lo, hi) > 0:
+            return tree
+        weight_func = tree.get("weight_func")
+        _root = tree["root"]
+        _left, _left_bh, _rest, _rest_bh = tf.split_llrb(
+            _root, tf.black_height(_root), lo, _cmp, False, weight_func,
+            _balance, _copy)
+        _, _, _right, _ = tf.split_llrb(_rest, _rest_bh, hi, _cmp, True,
+                                        weight_func, _balance, _copy)
+        return _derive(tree, _concat(_left, _left_bh, _right, weight_func))
+    except Exception as exp:
+        error.reraise(exp, "persistent", "remove_range()")
+
+
+def _concat(left: dict, left_bh: int, right: dict,
+            weight_func: Callable = None) -> dict:
+    """Une dos subárboles cuyas llaves ya están separadas, copiando los
+    nodos que cambian (ver ``red_black_tree._concat``)."""
+    if right is None or left is None:
+        _root = left if right is None else right
+    else:
+        _middle = _copy(tf.min_node(right))
+        right = _copy(right)
+        if not is_red(right.left) and not is_red(right.right):
+            right.color = RED
+        right = _delete_min(right, weight_func)
+        if right is not None:
+            right.color = BLACK
+        _root, _ = tf.join_llrb(left, left_bh, _middle, right,
+                                tf.black_height(right), weight_func,
+                                _balance, _copy)
+    if _root is not None and _root.color != BLACK:
+        _root = _copy(_root)
+        _root.color = BLACK
+    return _root
@@ -0,0 +1,114 @@
+"""
+Estructura que contiene la información a guardar en un ``nodo`` de un árbol rojo-negro
+
+Como en ``bst_node``, los nodos guardan sus campos en ``__slots__`` y se
+pueden usar como atributos (``node.color``) o por nombre
+(``node["color"]``).
+"""
+
+from .bst_node import BSTNode
+
+RED = 0
+BLACK = 1
+
+
+class RBTNode(BSTNode):
+    """
+    Nodo de un árbol rojo-negro: un nodo de árbol binario con el color
+    (``RED`` o ``BLACK``) del enlace que llega a él.
+    """
+
+    __slots__ = ("color",)
+
+    type = "RBT"
+
+    def __init__(self, key, value, color=RED):
+        BSTNode.__init__(self, key, value)
+        self.color = color
+
+    def __contains__(self, field):
+        return field == "color" or BSTNode.__contains__(self, field)
+
+
+def new_node(key, value, color=RED):
+    """
+    Crea una nueva entrada (de tipo :ref:`rbt_node<rbt-node>`) de un árbol rojo-negro con una llave y un valor dados.
+
+    Se crea un nodo con los siguientes atributos:
+    - **key**: Llave del nodo
+    - **value**: Valor del nodo
+    - **size**: Tamaño del nodo. Inicializado en 1
+    - **height**: Altura del nodo. Inicializada en 1
+    - **color**: Color del enlace que llega al nodo. Inicializado en ``RED``
+    - **left**: Hijo izquierdo del nodo. Inicializado en ``None``
+    - **right**: Hijo derecho del nodo. Inicializado en ``None``
+    - **type**: Tipo de árbol. Siempre "RBT"
+
+    :param key: Llave del nodo
+    :type key: any
+    :param value: Valor del nodo
+    :type value: any
+    :param color: Color del nodo (``RED`` o ``BLACK``)
+    :type color: int
+
+    :returns: Nodo creado
+    :rtype: rbt_node
+    """
+    return RBTNode(key, value, color)
+
+
+def is_red(my_node):
+    """
+    Indica si el nodo es rojo. Un nodo vacío (``None``) es negro.
+
+    :param my_node: El nodo a examinar
+    :type my_node: rbt_node
+
+    :returns: ``True`` si el nodo es rojo
+    :rtype: bool
+    """
+    return my_node is not None and my_node.color == RED
+
+
+def change_color(my_node, color):
+    """
+    Cambia el color de un nodo.
+
+    :param my_node: El nodo a modificar
+    :type my_node: rbt_node
+    :param color: El nuevo color (``RED`` o ``BLACK``)
+    :type color: int
+    """
+    my_node.color = color
+
+
+def get_value(my_node):
+    """
+    Obtiene el valor ``value`` de un nodo recibido.
+
+    :param my_node: El nodo con la información
+    :type my_node: rbt_node
+
+    :returns: El valor almacenado en el nodo
+    :rtype: any
+    """
+    value = None
+    if my_node is not None:
+        value = my_node.value
+    return value
+
+
+def get_key(my_node):
+    """
+    Obtiene la llave ``key`` de un nodo recibido.
+
+    :param my_node: El nodo con la información
+    :type my_node: rbt_node
+
+    :returns: La llave almacenada en el nodo
+    :rtype: any
+    """
+    key = None
+    if my_node is not None:
+        key = my_node.key
+    return key
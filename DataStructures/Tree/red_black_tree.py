@@ -0,0 +1,670 @@
+"""
+Module to handle a left-leaning red-black tree (rbt) data structure.
+
+Ofrece la misma interfaz que ``binary_search_tree``, pero el árbol se
+mantiene balanceado: su altura es a lo sumo 2·log2(n) sin importar el orden
+en que lleguen las llaves (por ejemplo, fechas ordenadas).
+
+This code is based on the implementation proposed by the following authors/books:
+    #. Algorithms, 4th Edition, Robert Sedgewick and Kevin Wayne.
+"""
+
+from typing import Any, Callable
+
+from DataStructures.List import single_linked_list as sllt
+from DataStructures.List import array_list as alt
+from DataStructures.Utils import error
+
+from .rbt_node import new_node, is_red, change_color, RED, BLACK
+from .tree_functions import enable_op_log, stats
+from . import tree_functions as tf
+
+
+def dflt_tree_node_cmp(key1: Any, key2: Any) -> int:
+    """Función de comparación por defecto para los nodos del RBT.
+
+    Returns:
+        int: -1 si key1 < key2, 0 si key1 == key2, 1 si key1 > key2
+    """
+    if key1 == key2:
+        return 0
+    elif key1 < key2:
+        return -1
+    else:
+        return 1
+
+
+def new_map(cmp_func=dflt_tree_node_cmp, weight_func=None, log_size=0,
+            native=None) -> dict:
+    """Crea un nuevo árbol rojo-negro (RBT).
+
+    Args:
+        cmp_func (Callable): Función de comparación de llaves.
+        weight_func (Callable): Función opcional que recibe el valor de un
+            nodo y retorna su peso (ver ``binary_search_tree.new_map``).
+        log_size (int): Tamaño del registro de operaciones (ver
+            ``binary_search_tree.enable_op_log`` y ``stats``).
+        native (bool): Comparar las llaves directamente con ``==`` y ``<``
+            (ver ``binary_search_tree.new_map``). Por defecto solo con la
+            función de comparación por defecto.
+
+    El árbol lleva en ``version`` un contador que aumenta con cada
+    modificación (``put``, ``remove``, ``refresh``, ``delete_min``,
+    ``delete_max``).
+
+    Returns:
+        dict: Diccionario que representa el RBT.
+    """
+    try:
+        _new_rbt = dict(
+            root=None,
+            size=0,
+            cmp_func=cmp_func,
+            weight_func=weight_func,
+            version=0,
+            op_log=None,
+            native=native,
+            _type="RBT"
+        )
+        if _new_rbt["cmp_func"] is None:
+            _new_rbt["cmp_func"] = dflt_tree_node_cmp
+        if native is None:
+            _new_rbt["native"] = _new_rbt["cmp_func"] is dflt_tree_node_cmp
+        enable_op_log(_new_rbt, log_size)
+        return _new_rbt
+    except Exception as exp:
+        error.reraise(exp, "rbt", "new_map()")
+
+
+def build_from_sorted(keys: dict, values: dict, cmp_func=dflt_tree_node_cmp,
+                      weight_func=None) -> dict:
+    """Crea un RBT a partir de llaves ordenadas.
+
+    Args:
+        keys (dict): Lista (array_list) de llaves en orden ascendente y sin repetidos.
+        values (dict): Lista (array_list) con el valor de cada llave, en el mismo orden.
+        cmp_func (Callable): Función de comparación del árbol.
+        weight_func (Callable): Función de peso del árbol.
+
+    Returns:
+        dict: Diccionario que representa el RBT.
+
+    Raises:
+        ValueError: Si las listas tienen distinto tamaño o las llaves no están
+            en orden estrictamente ascendente.
+    """
+    try:
+        tree = new_map(cmp_func, weight_func)
+        _cmp = tree["cmp_func"]
+        n = alt.size(keys)
+        if n != alt.size(values):
+            raise ValueError("keys y values deben tener el mismo tamaño")
+        for i in range(1, n):
+            if _cmp(alt.get_element(keys, i - 1), alt.get_element(keys, i)) >= 0:
+                raise ValueError("Las llaves deben estar en orden ascendente y sin repetidos")
+        _root = None
+        _native = tf.native_cmp(tree) is None
+        for i in range(n):
+            if _native:
+                _root = _put_native(_root, alt.get_element(keys, i),
+                                    alt.get_element(values, i), weight_func)
+            else:
+                _root = _put(_root, alt.get_element(keys, i),
+                             alt.get_element(values, i), _cmp, weight_func)
+            change_color(_root, BLACK)
+        tree["root"] = _root
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "build_from_sorted()")
+
+
+# Funciones de balanceo
+
+
+def _rotate_left(node: dict, weight_func: Callable = None) -> dict:
+    """Rota a la izquierda un enlace rojo que se inclina a la derecha."""
+    _right = node.right
+    node.right = _right.left
+    _right.left = node
+    _right.color = node.color
+    node.color = RED
+    tf.update_node(node, weight_func)
+    tf.update_node(_right, weight_func)
+    return _right
+
+
+def _rotate_right(node: dict, weight_func: Callable = None) -> dict:
+    """Rota a la derecha un enlace rojo que se inclina a la izquierda."""
+    _left = node.left
+    node.left = _left.right
+    _left.right = node
+    _left.color = node.color
+    node.color = RED
+    tf.update_node(node, weight_func)
+    tf.update_node(_left, weight_func)
+    return _left
+
+
+def _flip_colors(node: dict) -> None:
+    """Invierte los colores del nodo y de sus dos hijos."""
+    node.color = BLACK if node.color == RED else RED
+    for _child in (node.left, node.right):
+        _child.color = BLACK if _child.color == RED else RED
+
+
+def _balance(node: dict, weight_func: Callable = None) -> dict:
+    """Restaura las propiedades del árbol rojo-negro en el nodo."""
+    if is_red(node.right) and not is_red(node.left):
+        node = _rotate_left(node, weight_func)
+    if is_red(node.left) and is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+    if is_red(node.left) and is_red(node.right):
+        _flip_colors(node)
+    tf.update_node(node, weight_func)
+    return node
+
+
+def _move_red_left(node: dict, weight_func: Callable = None) -> dict:
+    """Hace rojo el hijo izquierdo (o uno de sus hijos) antes de bajar por él."""
+    _flip_colors(node)
+    if is_red(node.right.left):
+        node.right = _rotate_right(node.right, weight_func)
+        node = _rotate_left(node, weight_func)
+        _flip_colors(node)
+    return node
+
+
+def _move_red_right(node: dict, weight_func: Callable = None) -> dict:
+    """Hace rojo el hijo derecho (o uno de sus hijos) antes de bajar por él."""
+    _flip_colors(node)
+    if is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+        _flip_colors(node)
+    return node
+
+
+def put(tree: dict, k: Any, v: Any) -> dict:
+    """Agrega una pareja llave-valor al RBT. Si la llave existe, reemplaza el valor.
+
+    Args:
+        tree (dict): Árbol en el que se inserta.
+        k (Any): Llave del nodo.
+        v (Any): Valor del nodo.
+    """
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        if _cmp is None:
+            _root = _put_native(tree["root"], k, v, tree.get("weight_func"))
+        else:
+            _root = _put(tree["root"], k, v, _cmp, tree.get("weight_func"))
+        change_color(_root, BLACK)
+        tree["root"] = _root
+        tf.touch(tree)
+        tf.record(tree, "put", k, _counter)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "put()")
+
+
+def _put(node: dict, k: Any, v: Any, cmp_func: Callable,
+         weight_func: Callable = None) -> dict:
+    """Función recursiva para insertar un nodo en el RBT."""
+    if node is None:
+        node = new_node(k, v, RED)
+        tf.update_node(node, weight_func)
+        return node
+    _cmp = cmp_func(k, node.key)
+    if _cmp < 0:
+        node.left = _put(node.left, k, v, cmp_func, weight_func)
+    elif _cmp > 0:
+        node.right = _put(node.right, k, v, cmp_func, weight_func)
+    else:
+        node.value = v
+    if is_red(node.right) and not is_red(node.left):
+        node = _rotate_left(node, weight_func)
+    if is_red(node.left) and is_red(node.left.left):
+        node = _rotate_right(node, weight_func)
+    if is_red(node.left) and is_red(node.right):
+        _flip_colors(node)
+    tf.update_node(node, weight_func)
+    return node
+
+
+def _put_native(node: dict, k: Any, v: Any,
+                weight_func: Callable = None) -> dict:
+    """Versión de ``_put`` para llaves nativas: compara las llaves
+    directamente y revisa los colores y recalcula tamaño, altura y peso
+    sin llamar a funciones auxiliares (salvo en las rotaciones)."""
+    if node is None:
+        node = new_node(k, v, RED)
+        if weight_func is not None:
+            node.weight = weight_func(v)
+        return node
+    key = node.key
+    if k == key:
+        node.value = v
+    elif k < key:
+        node.left = _put_native(node.left, k, v, weight_func)
+    else:
+        node.right = _put_native(node.right, k, v, weight_func)
+    _left = node.left
+    _right = node.right
+    if (_right is not None and _right.color == RED
+            and (_left is None or _left.color != RED)):
+        node = _rotate_left(node, weight_func)
+        _left, _right = node.left, node.right
+    if (_left is not None and _left.color == RED
+            and _left.left is not None and _left.left.color == RED):
+        node = _rotate_right(node, weight_func)
+        _left, _right = node.left, node.right
+    if (_left is not None and _left.color == RED
+            and _right is not None and _right.color == RED):
+        _flip_colors(node)
+    _size, _height, _weight = 1, 0, 0
+    if _left is not None:
+        _size += _left.size
+        _height = _left.height
+        _weight = _left.weight
+    if _right is not None:
+        _size += _right.size
+        if _right.height > _height:
+            _height = _right.height
+        _weight += _right.weight
+    node.size = _size
+    node.height = _height + 1
+    if weight_func is not None:
+        node.weight = weight_func(node.value) + _weight
+    return node
+
+
+def get(tree: dict, k: Any) -> Any:
+    """Recupera el valor asociado a una llave del RBT (None si no está)."""
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        _node = tf.find_node(tree["root"], k, _cmp)
+        tf.record(tree, "get", k, _counter)
+        return _node.value if _node is not None else None
+    except Exception as exp:
+        error.reraise(exp, "rbt", "get()")
+
+
+def contains(tree: dict, k: Any) -> bool:
+    """Verifica si existe un nodo con la llave dada en el RBT."""
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        _found = tf.find_node(tree["root"], k, _cmp) is not None
+        tf.record(tree, "contains", k, _counter)
+        return _found
+    except Exception as exp:
+        error.reraise(exp, "rbt", "contains()")
+
+
+def remove(tree: dict, k: Any) -> dict:
+    """Elimina la llave k del RBT. Si la llave no está, el árbol no cambia."""
+    try:
+        _cmp, _counter = tf.comparator(tree)
+        _root = tree["root"]
+        if tf.find_node(_root, k, _cmp) is None:
+            tf.record(tree, "remove", k, _counter)
+            return tree
+        weight_func = tree.get("weight_func")
+        if not is_red(_root.left) and not is_red(_root.right):
+            change_color(_root, RED)
+        _root = _remove(_root, k, _cmp or tree["cmp_func"], weight_func)
+        if _root is not None:
+            change_color(_root, BLACK)
+        tree["root"] = _root
+        tf.touch(tree)
+        tf.record(tree, "remove", k, _counter)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "remove()")
+
+
+def _remove(node: dict, k: Any, cmp_func: Callable,
+            weight_func: Callable = None) -> dict:
+    """Función recursiva para eliminar una llave que está en el subárbol."""
+    if cmp_func(k, node.key) < 0:
+        if not is_red(node.left) and not is_red(node.left.left):
+            node = _move_red_left(node, weight_func)
+        node.left = _remove(node.left, k, cmp_func, weight_func)
+    else:
+        if is_red(node.left):
+            node = _rotate_right(node, weight_func)
+        if cmp_func(k, node.key) == 0 and node.right is None:
+            return None
+        if not is_red(node.right) and not is_red(node.right.left):
+            node = _move_red_right(node, weight_func)
+        if cmp_func(k, node.key) == 0:
+            _successor = tf.min_node(node.right)
+            node.key = _successor.key
+            node.value = _successor.value
+            node.right = _delete_min(node.right, weight_func)
+        else:
+            node.right = _remove(node.right, k, cmp_func, weight_func)
+    return _balance(node, weight_func)
+
+
+def size(tree: dict) -> int:
+    """Retorna el número de nodos del RBT."""
+    try:
+        return tf.node_size(tree["root"])
+    except Exception as exp:
+        error.reraise(exp, "rbt", "size()")
+
+
+def refresh(tree: dict, k: Any, delta: Any = None) -> dict:
+    """Recalcula los pesos del camino hasta la llave k.
+
+    Se debe llamar después de modificar en sitio el valor guardado con la
+    llave k (ver ``binary_search_tree.refresh``). delta es la diferencia
+    de peso del valor, si se conoce.
+    """
+    try:
+        tf.touch(tree)
+        weight_func = tree.get("weight_func")
+        if weight_func is None:
+            return tree
+        path = tf.find_path(tree["root"], k, tf.native_cmp(tree))
+        if path is not None:
+            if delta is None:
+                delta = tf.value_delta(path[-1], weight_func)
+            tf.add_weight(path, delta)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "refresh()")
+
+
+def range_sum(tree: dict, lo: Any, hi: Any) -> Any:
+    """Suma los pesos de los nodos con llaves en el rango [lo, hi] en O(log n).
+
+    Si el árbol no tiene función de peso, retorna el número de llaves en el
+    rango.
+    """
+    try:
+        _cmp = tf.native_cmp(tree)
+        if (hi < lo) if _cmp is None else (_cmp(lo, hi) > 0):
+            return 0
+        weight_func = tree.get("weight_func")
+        return (tf.sum_below(tree["root"], hi, _cmp, weight_func, True)
+                - tf.sum_below(tree["root"], lo, _cmp, weight_func, False))
+    except Exception as exp:
+        error.reraise(exp, "rbt", "range_sum()")
+
+
+def is_empty(tree: dict) -> bool:
+    """Verifica si el RBT está vacío."""
+    try:
+        return tree["root"] is None
+    except Exception as exp:
+        error.reraise(exp, "rbt", "is_empty()")
+
+
+def get_min(tree: dict) -> Any:
+    """Recupera la llave mínima del RBT."""
+    try:
+        _min_node = tf.min_node(tree["root"])
+        if _min_node is not None:
+            return _min_node.key
+        return None
+    except Exception as exp:
+        error.reraise(exp, "rbt", "get_min()")
+
+
+def get_max(tree: dict) -> Any:
+    """Recupera la llave máxima del RBT."""
+    try:
+        _max_node = tf.max_node(tree["root"])
+        if _max_node is not None:
+            return _max_node.key
+        return None
+    except Exception as exp:
+        error.reraise(exp, "rbt", "get_max()")
+
+
+def delete_min(tree: dict) -> dict:
+    """Elimina el nodo con la llave mínima del RBT."""
+    try:
+        _root = tree["root"]
+        if _root is None:
+            return tree
+        if not is_red(_root.left) and not is_red(_root.right):
+            change_color(_root, RED)
+        _root = _delete_min(_root, tree.get("weight_func"))
+        if _root is not None:
+            change_color(_root, BLACK)
+        tree["root"] = _root
+        tf.touch(tree)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "delete_min()")
+
+
+def _delete_min(node: dict, weight_func: Callable = None) -> dict:
+    """Función recursiva para eliminar el nodo con la llave mínima."""
+    if node.left is None:
+        return None
+    if not is_red(node.left) and not is_red(node.left.left):
+        node = _move_red_left(node, weight_func)
+    node.left = _delete_min(node.left, weight_func)
+    return _balance(node, weight_func)
+
+
+def delete_max(tree: dict) -> dict:
+    """Elimina el nodo con la llave máxima del RBT."""
+    try:
+        _root = tree["root"]
+        if _root is None:
+            return tree
+        if not is_red(_root.left) and not is_red(_root.right):
+            change_color(_root, RED)
+        _root = _delete_max(_root, tree.get("weight_func"))
+        if _root is not None:
+            change_color(_root, BLACK)
+        tree["root"] = _root
+        tf.touch(tree)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "delete_max()")
+
+
+def _delete_max(node: dict, weight_func: Callable = None) -> dict:
+    """Función recursiva para eliminar el nodo con la llave máxima."""
+    if is_red(node.left):
+        node = _rotate_right(node, weight_func)
+    if node.right is None:
+        return None
+    if not is_red(node.right) and not is_red(node.right.left):
+        node = _move_red_right(node, weight_func)
+    node.right = _delete_max(node.right, weight_func)
+    return _balance(node, weight_func)
+
+
+def floor(tree: dict, k: Any) -> Any:
+    """Retorna la mayor llave del RBT menor o igual a k (None si no hay)."""
+    try:
+        return tf.floor_key(tree["root"], k, tf.native_cmp(tree))
+    except Exception as exp:
+        error.reraise(exp, "rbt", "floor()")
+
+
+def ceiling(tree: dict, k: Any) -> Any:
+    """Retorna la menor llave del RBT mayor o igual a k (None si no hay)."""
+    try:
+        return tf.ceiling_key(tree["root"], k, tf.native_cmp(tree))
+    except Exception as exp:
+        error.reraise(exp, "rbt", "ceiling()")
+
+
+def select(tree: dict, pos: int) -> Any:
+    """Retorna la llave en la posición pos (desde 0) del orden de las llaves.
+
+    Retorna None si pos no está entre 0 y size(tree) - 1.
+    """
+    try:
+        return tf.select_key(tree["root"], pos)
+    except Exception as exp:
+        error.reraise(exp, "rbt", "select()")
+
+
+def rank(tree: dict, k: Any) -> int:
+    """Retorna el número de llaves del RBT estrictamente menores a k."""
+    try:
+        return tf.sum_below(tree["root"], k, tf.native_cmp(tree), None, False)
+    except Exception as exp:
+        error.reraise(exp, "rbt", "rank()")
+
+
+def size_range(tree: dict, lo: Any, hi: Any) -> int:
+    """Retorna el número de llaves en el rango [lo, hi] en O(log n)."""
+    try:
+        _cmp = tf.native_cmp(tree)
+        if (hi < lo) if _cmp is None else (_cmp(lo, hi) > 0):
+            return 0
+        return (tf.sum_below(tree["root"], hi, _cmp, None, True)
+                - tf.sum_below(tree["root"], lo, _cmp, None, False))
+    except Exception as exp:
+        error.reraise(exp, "rbt", "size_range()")
+
+
+def remove_range(tree: dict, lo: Any, hi: Any) -> dict:
+    """Elimina del RBT todas las llaves del rango [lo, hi].
+
+    Como en ``binary_search_tree.remove_range``, el árbol se divide en lo
+    y en hi (``tree_functions.split_llrb``) y se unen las dos partes de
+    los extremos; la parte del medio se descarta completa. Es O(log n)
+    sin importar cuántas llaves se eliminen.
+    """
+    try:
+        _cmp = tree["cmp_func"]
+        if tree["root"] is None or _cmp(lo, hi) > 0:
+            return tree
+        weight_func = tree.get("weight_func")
+        _root = tree["root"]
+        _left, _left_bh, _rest, _rest_bh = tf.split_llrb(
+            _root, tf.black_height(_root), lo, _cmp, False, weight_func,
+            _balance)
+        _, _, _right, _ = tf.split_llrb(_rest, _rest_bh, hi, _cmp, True,
+                                        weight_func, _balance)
+        tree["root"] = _concat(_left, _left_bh, _right, weight_func)
+        tf.touch(tree)
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "rbt", "remove_range()")
+
+
+def _concat(left: dict, left_bh: int, right: dict,
+            weight_func: Callable = None) -> dict:
+    """Une dos subárboles cuyas llaves ya están separadas: la llave mínima
+    de right pasa a ser la llave intermedia de ``tree_functions.join_llrb``."""
+    if right is None or left is None:
+        _root = left if right is None else right
+    else:
+        _middle = tf.min_node(right)
+        if not is_red(right.left) and not is_red(right.right):
+            change_color(right, RED)
+        right = _delete_min(right, weight_func)
+        if right is not None:
+            change_color(right, BLACK)
+        _root, _ = tf.join_llrb(left, left_bh, _middle, right,
+                                tf.black_height(right), weight_func, _balance)
+    if _root is not None:
+        change_color(_root, BLACK)
+    return _root
+
+
+def height(tree: dict) -> int:
+    """Retorna la altura del RBT: el número de nodos del camino más largo
+    desde la raíz (0 si el árbol está vacío). Es O(1): cada nodo guarda la
+    altura de su subárbol."""
+    try:
+        return tf.node_height(tree["root"])
+    except Exception as exp:
+        error.reraise(exp, "rbt", "height()")
+
+
+def keys(tree: dict, lo: Any, hi: Any) -> dict:
+    """Retorna una lista con las llaves del rango [lo, hi], en orden."""
+    try:
+        keys_lt = sllt.new_list(cmpfunction=tree["cmp_func"])
+        if tf.native_cmp(tree) is None:
+            for k in iter_keys(tree, lo, hi):
+                sllt.add_last(keys_lt, k)
+            return keys_lt
+        tf.add_range(tree["root"], keys_lt, tree["cmp_func"], lo, hi, "key")
+        return keys_lt
+    except Exception as exp:
+        error.reraise(exp, "rbt", "keys()")
+
+
+def key_set(tree: dict) -> dict:
+    """Retorna una lista con todas las llaves del RBT, en orden."""
+    try:
+        keys_lt = sllt.new_list(cmpfunction=tree["cmp_func"])
+        tf.add_all(tree["root"], keys_lt, "key")
+        return keys_lt
+    except Exception as exp:
+        error.reraise(exp, "rbt", "key_set()")
+
+
+def values(tree: dict, lo: Any, hi: Any) -> dict:
+    """Retorna una lista con los valores de las llaves del rango [lo, hi]."""
+    try:
+        values_lt = sllt.new_list(cmpfunction=tree["cmp_func"])
+        if tf.native_cmp(tree) is None:
+            for v in iter_values(tree, lo, hi):
+                sllt.add_last(values_lt, v)
+            return values_lt
+        tf.add_range(tree["root"], values_lt, tree["cmp_func"], lo, hi, "value")
+        return values_lt
+    except Exception as exp:
+        error.reraise(exp, "rbt", "values()")
+
+
+def value_set(tree: dict) -> dict:
+    """Retorna una lista con todos los valores del RBT, en orden de llave."""
+    try:
+        values_lt = sllt.new_list(cmpfunction=tree["cmp_func"])
+        tf.add_all(tree["root"], values_lt, "value")
+        return values_lt
+    except Exception as exp:
+        error.reraise(exp, "rbt", "value_set()")
+
+
+def iter_keys(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las llaves del rango [lo, hi] sin crear una lista.
+
+    Ver ``iter_items``.
+    """
+    return map(tf.node_key, _iter_nodes(tree, lo, hi))
+
+
+def iter_values(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden de llave los valores del rango [lo, hi] sin crear
+    una lista.
+
+    Ver ``iter_items``.
+    """
+    return map(tf.node_value, _iter_nodes(tree, lo, hi))
+
+
+def iter_items(tree: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las parejas (llave, valor) del rango [lo, hi].
+
+    Es un iterador: los elementos se producen a medida que se piden y el
+    recorrido se puede detener en cualquier momento (por ejemplo, después
+    de los primeros n elementos) sin visitar el resto del rango. Usa una
+    pila explícita en lugar de recursión. Si lo o hi son None, el rango no
+    tiene límite por ese lado.
+
+    El árbol no se debe modificar mientras se recorre.
+    """
+    return map(tf.node_item, _iter_nodes(tree, lo, hi))
+
+
+def _iter_nodes(tree: dict, lo: Any, hi: Any):
+    """Generador de los nodos del rango [lo, hi], en orden."""
+    try:
+        yield from tf.iter_nodes(tree["root"], lo, hi, tf.native_cmp(tree))
+    except Exception as exp:
+        error.reraise(exp, "rbt", "iter_items()")
@@ -0,0 +1,661 @@
+"""
+Module to handle an ordered map stored in sorted arrays.
+
+Ofrece la misma interfaz que ``binary_search_tree``, pero las llaves y los
+valores se guardan en listas ordenadas por llave (en lugar de nodos
+enlazados) y las búsquedas se hacen con búsqueda binaria (``bisect``). Un
+rango de llaves es una porción contigua de las listas, por lo que recorrerlo
+no tiene que seguir apuntadores.
+
+Las llaves se guardan en dos partes, cada una ordenada:
+
+- Las listas principales (``keys``, ``values``). Una llave mayor que todas
+  las de estas listas (el caso común de un índice cuyas llaves llegan en
+  orden) se agrega al final.
+- Un buffer de llaves nuevas (``pending_keys``, ``pending_values``) para
+  las demás. Insertar en el buffer mueve a lo sumo ``buffer_size`` llaves;
+  cuando se llena, se mezcla con las listas principales de una sola vez
+  (O(n) cada ``buffer_size`` llaves nuevas).
+
+Las consultas buscan en las dos partes y nunca modifican el mapa, así que
+pueden hacerse en paralelo mientras no haya una modificación en curso.
+
+Si se da una función de peso, se guarda el peso de cada llave
+(``weights`` y ``pending_weights``) y, para las listas principales, un
+árbol de Fenwick (``fenwick``) con sus sumas: ``refresh`` y ``range_sum``
+son O(log n) más, en el buffer, una suma de a lo sumo ``buffer_size``
+pesos.
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import cmp_to_key
+from typing import Any, Callable
+
+from DataStructures.List import single_linked_list as sllt
+from DataStructures.List import array_list as alt
+from DataStructures.Utils import error
+
+
+# Número máximo de llaves que se guardan en el buffer antes de mezclarlas
+BUFFER_SIZE = 1024
+
+
+def dflt_tree_node_cmp(key1: Any, key2: Any) -> int:
+    """Función de comparación por defecto de las llaves.
+
+    Returns:
+        int: -1 si key1 < key2, 0 si key1 == key2, 1 si key1 > key2
+    """
+    if key1 == key2:
+        return 0
+    elif key1 < key2:
+        return -1
+    else:
+        return 1
+
+
+def new_map(cmp_func=dflt_tree_node_cmp, weight_func=None,
+            buffer_size=BUFFER_SIZE) -> dict:
+    """Crea un nuevo mapa ordenado sobre arreglos.
+
+    Args:
+        cmp_func (Callable): Función de comparación de llaves.
+        weight_func (Callable): Función opcional que recibe un valor y
+            retorna su peso (ver ``binary_search_tree.new_map``).
+        buffer_size (int): Número de llaves que se guardan en el buffer
+            antes de mezclarlas con las listas principales.
+
+    El mapa lleva en ``version`` un contador que aumenta con cada
+    modificación.
+
+    Returns:
+        dict: Diccionario que representa el mapa.
+    """
+    try:
+        if cmp_func is None:
+            cmp_func = dflt_tree_node_cmp
+        weighted = weight_func is not None
+        _new_map = dict(
+            keys=[],
+            values=[],
+            weights=[] if weighted else None,
+            fenwick=[0] if weighted else None,
+            pending_keys=[],
+            pending_values=[],
+            pending_weights=[] if weighted else None,
+            sort_key=None if cmp_func is dflt_tree_node_cmp else cmp_to_key(cmp_func),
+            buffer_size=buffer_size,
+            cmp_func=cmp_func,
+            weight_func=weight_func,
+            version=0,
+            _type="SORTED_ARRAY"
+        )
+        return _new_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "new_map()")
+
+
+def build_from_sorted(keys: dict, values: dict, cmp_func=dflt_tree_node_cmp,
+                      weight_func=None) -> dict:
+    """Crea un mapa a partir de llaves ordenadas (copia las dos listas).
+
+    Raises:
+        ValueError: Si las listas tienen distinto tamaño o las llaves no están
+            en orden estrictamente ascendente.
+    """
+    try:
+        sorted_map = new_map(cmp_func, weight_func)
+        _cmp = sorted_map["cmp_func"]
+        n = alt.size(keys)
+        if n != alt.size(values):
+            raise ValueError("keys y values deben tener el mismo tamaño")
+        _keys = [alt.get_element(keys, i) for i in range(n)]
+        for i in range(1, n):
+            if _cmp(_keys[i - 1], _keys[i]) >= 0:
+                raise ValueError("Las llaves deben estar en orden ascendente y sin repetidos")
+        sorted_map["keys"] = _keys
+        sorted_map["values"] = [alt.get_element(values, i) for i in range(n)]
+        if weight_func is not None:
+            sorted_map["weights"] = list(map(weight_func, sorted_map["values"]))
+            sorted_map["fenwick"] = _fenwick_build(sorted_map["weights"])
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "build_from_sorted()")
+
+
+# Funciones internas
+
+
+def _touch(sorted_map: dict) -> None:
+    """Registra una modificación del mapa."""
+    sorted_map["version"] += 1
+
+
+def _search(sorted_map: dict, _keys: list, k: Any, right: bool = False) -> int:
+    """Posición de k en una lista ordenada de llaves del mapa (bisect_left
+    o bisect_right)."""
+    sort_key = sorted_map["sort_key"]
+    search = bisect_right if right else bisect_left
+    if sort_key is None:
+        return search(_keys, k)
+    return search(_keys, sort_key(k), key=sort_key)
+
+
+def _find(sorted_map: dict, k: Any, right: bool = False) -> int:
+    """Posición de k en las listas principales."""
+    return _search(sorted_map, sorted_map["keys"], k, right)
+
+
+def _find_pending(sorted_map: dict, k: Any, right: bool = False) -> int:
+    """Posición de k en el buffer."""
+    return _search(sorted_map, sorted_map["pending_keys"], k, right)
+
+
+def _index(sorted_map: dict, _keys: list, k: Any) -> int:
+    """Posición de k en una lista ordenada de llaves del mapa, o -1 si no
+    está."""
+    pos = _search(sorted_map, _keys, k)
+    if pos < len(_keys) and sorted_map["cmp_func"](_keys[pos], k) == 0:
+        return pos
+    return -1
+
+
+def _fenwick_build(weights: list) -> list:
+    """Construye en O(n) el árbol de Fenwick de una lista de pesos. La
+    posición i (desde 1) guarda la suma de los pesos de (i - lowbit(i), i]."""
+    fenwick = [0]
+    fenwick.extend(weights)
+    n = len(weights)
+    for i in range(1, n + 1):
+        parent = i + (i & -i)
+        if parent <= n:
+            fenwick[parent] += fenwick[i]
+    return fenwick
+
+
+def _fenwick_sum(fenwick: list, end: int) -> Any:
+    """Suma de los pesos de las posiciones [0, end)."""
+    total = 0
+    while end > 0:
+        total += fenwick[end]
+        end -= end & -end
+    return total
+
+
+def _fenwick_add(fenwick: list, pos: int, delta: Any) -> None:
+    """Suma delta al peso de la posición pos (desde 0)."""
+    i = pos + 1
+    n = len(fenwick)
+    while i < n:
+        fenwick[i] += delta
+        i += i & -i
+
+
+def _fenwick_append(fenwick: list, weight: Any) -> None:
+    """Agrega al final una posición con el peso dado."""
+    i = len(fenwick)
+    fenwick.append(weight + _fenwick_sum(fenwick, i - 1)
+                   - _fenwick_sum(fenwick, i - (i & -i)))
+
+
+def _merge(sorted_map: dict) -> None:
+    """Mezcla el buffer con las listas principales (O(n))."""
+    pending = sorted_map["pending_keys"]
+    if not pending:
+        return
+    parts = [("keys", "pending_keys"), ("values", "pending_values")]
+    if sorted_map["weight_func"] is not None:
+        parts.append(("weights", "pending_weights"))
+    positions = [_find(sorted_map, k) for k in pending]
+    for name, pending_name in parts:
+        main = sorted_map[name]
+        merged = []
+        start = 0
+        for pos, element in zip(positions, sorted_map[pending_name]):
+            merged.extend(main[start:pos])
+            merged.append(element)
+            start = pos
+        merged.extend(main[start:])
+        sorted_map[name] = merged
+        sorted_map[pending_name] = []
+    if sorted_map["weight_func"] is not None:
+        sorted_map["fenwick"] = _fenwick_build(sorted_map["weights"])
+
+
+def _reindex(sorted_map: dict) -> None:
+    """Reconstruye el árbol de Fenwick después de quitar llaves de las
+    listas principales (O(n))."""
+    if sorted_map["weight_func"] is not None:
+        sorted_map["fenwick"] = _fenwick_build(sorted_map["weights"])
+
+
+def _bounds(sorted_map: dict, _keys: list, lo: Any, hi: Any) -> tuple:
+    """Posiciones [inicio, fin) de las llaves del rango [lo, hi] en una
+    lista ordenada de llaves del mapa."""
+    start = 0 if lo is None else _search(sorted_map, _keys, lo)
+    end = len(_keys) if hi is None else _search(sorted_map, _keys, hi, right=True)
+    return start, max(start, end)
+
+
+def _less(sorted_map: dict, key1: Any, key2: Any) -> bool:
+    """Indica si key1 es menor que key2."""
+    if sorted_map["sort_key"] is None:
+        return key1 < key2
+    return sorted_map["cmp_func"](key1, key2) < 0
+
+
+# Funciones del mapa
+
+
+def put(sorted_map: dict, k: Any, v: Any) -> dict:
+    """Agrega una pareja llave-valor al mapa. Si la llave existe, reemplaza el valor.
+
+    Una llave mayor que todas las de las listas principales se agrega al
+    final: O(log n). Las demás llaves nuevas se insertan en el buffer:
+    O(log n + buffer_size), más la mezcla cuando el buffer se llena.
+    """
+    try:
+        weight_func = sorted_map["weight_func"]
+        _keys = sorted_map["keys"]
+        pos = _find(sorted_map, k)
+        if pos < len(_keys) and sorted_map["cmp_func"](_keys[pos], k) == 0:
+            sorted_map["values"][pos] = v
+            if weight_func is not None:
+                weights = sorted_map["weights"]
+                weight = weight_func(v)
+                _fenwick_add(sorted_map["fenwick"], pos, weight - weights[pos])
+                weights[pos] = weight
+            _touch(sorted_map)
+            return sorted_map
+        pending = sorted_map["pending_keys"]
+        ppos = _find_pending(sorted_map, k)
+        if ppos < len(pending) and sorted_map["cmp_func"](pending[ppos], k) == 0:
+            sorted_map["pending_values"][ppos] = v
+            if weight_func is not None:
+                sorted_map["pending_weights"][ppos] = weight_func(v)
+        elif pos == len(_keys):
+            # Caso común: la llave es mayor que todas las de las listas
+            _keys.append(k)
+            sorted_map["values"].append(v)
+            if weight_func is not None:
+                weight = weight_func(v)
+                sorted_map["weights"].append(weight)
+                _fenwick_append(sorted_map["fenwick"], weight)
+        else:
+            pending.insert(ppos, k)
+            sorted_map["pending_values"].insert(ppos, v)
+            if weight_func is not None:
+                sorted_map["pending_weights"].insert(ppos, weight_func(v))
+            if len(pending) >= sorted_map["buffer_size"]:
+                _merge(sorted_map)
+        _touch(sorted_map)
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "put()")
+
+
+def get(sorted_map: dict, k: Any) -> Any:
+    """Recupera el valor asociado a una llave (None si no está)."""
+    try:
+        pos = _index(sorted_map, sorted_map["keys"], k)
+        if pos >= 0:
+            return sorted_map["values"][pos]
+        pos = _index(sorted_map, sorted_map["pending_keys"], k)
+        return sorted_map["pending_values"][pos] if pos >= 0 else None
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "get()")
+
+
+def contains(sorted_map: dict, k: Any) -> bool:
+    """Verifica si la llave está en el mapa."""
+    try:
+        return (_index(sorted_map, sorted_map["keys"], k) >= 0
+                or _index(sorted_map, sorted_map["pending_keys"], k) >= 0)
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "contains()")
+
+
+def remove(sorted_map: dict, k: Any) -> dict:
+    """Elimina la llave k del mapa. Si la llave no está, el mapa no cambia.
+
+    Quitar una llave de las listas principales es O(n).
+    """
+    try:
+        pos = _index(sorted_map, sorted_map["keys"], k)
+        if pos >= 0:
+            names = ("keys", "values", "weights")
+            _reindex_after = True
+        else:
+            pos = _index(sorted_map, sorted_map["pending_keys"], k)
+            if pos < 0:
+                return sorted_map
+            names = ("pending_keys", "pending_values", "pending_weights")
+            _reindex_after = False
+        for name in names:
+            if sorted_map[name] is not None:
+                del sorted_map[name][pos]
+        if _reindex_after:
+            _reindex(sorted_map)
+        _touch(sorted_map)
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "remove()")
+
+
+def remove_range(sorted_map: dict, lo: Any, hi: Any) -> dict:
+    """Elimina todas las llaves del rango [lo, hi]: una porción contigua de
+    las listas principales y otra del buffer. O(n)."""
+    try:
+        start, end = _bounds(sorted_map, sorted_map["keys"], lo, hi)
+        pstart, pend = _bounds(sorted_map, sorted_map["pending_keys"], lo, hi)
+        if start == end and pstart == pend:
+            return sorted_map
+        for name in ("keys", "values", "weights"):
+            if sorted_map[name] is not None:
+                del sorted_map[name][start:end]
+        for name in ("pending_keys", "pending_values", "pending_weights"):
+            if sorted_map[name] is not None:
+                del sorted_map[name][pstart:pend]
+        if start < end:
+            _reindex(sorted_map)
+        _touch(sorted_map)
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "remove_range()")
+
+
+def refresh(sorted_map: dict, k: Any, delta: Any = None) -> dict:
+    """Indica que el valor de la llave k se modificó en sitio, para que
+    ``range_sum`` vuelva a calcular su peso: O(log n). delta es la
+    diferencia de peso del valor, si se conoce (ver
+    ``binary_search_tree.refresh``)."""
+    try:
+        _touch(sorted_map)
+        weight_func = sorted_map["weight_func"]
+        if weight_func is None:
+            return sorted_map
+        pos = _index(sorted_map, sorted_map["keys"], k)
+        if pos >= 0:
+            weights = sorted_map["weights"]
+            if delta is None:
+                delta = weight_func(sorted_map["values"][pos]) - weights[pos]
+            weights[pos] += delta
+            _fenwick_add(sorted_map["fenwick"], pos, delta)
+            return sorted_map
+        pos = _index(sorted_map, sorted_map["pending_keys"], k)
+        if pos >= 0:
+            weights = sorted_map["pending_weights"]
+            if delta is None:
+                weights[pos] = weight_func(sorted_map["pending_values"][pos])
+            else:
+                weights[pos] += delta
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "refresh()")
+
+
+def size(sorted_map: dict) -> int:
+    """Retorna el número de llaves del mapa."""
+    try:
+        return len(sorted_map["keys"]) + len(sorted_map["pending_keys"])
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "size()")
+
+
+def is_empty(sorted_map: dict) -> bool:
+    """Verifica si el mapa está vacío."""
+    try:
+        return size(sorted_map) == 0
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "is_empty()")
+
+
+def height(sorted_map: dict) -> int:
+    """Retorna el número máximo de comparaciones de una búsqueda binaria,
+    que equivale a la altura de un árbol perfectamente balanceado con las
+    mismas llaves (0 si el mapa está vacío)."""
+    try:
+        return size(sorted_map).bit_length()
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "height()")
+
+
+def stats(sorted_map: dict) -> dict:
+    """Retorna un reporte del mapa con los mismos campos principales de
+    ``binary_search_tree.stats``: en un arreglo ordenado toda búsqueda hace
+    a lo sumo ``height`` comparaciones. ``pending`` es el número de llaves
+    en el buffer."""
+    try:
+        n = size(sorted_map)
+        return {
+            "size": n,
+            "height": n.bit_length(),
+            "optimal_height": n.bit_length(),
+            "max_search_path": n.bit_length(),
+            "pending": len(sorted_map["pending_keys"]),
+        }
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "stats()")
+
+
+def get_min(sorted_map: dict) -> Any:
+    """Recupera la llave mínima del mapa."""
+    try:
+        _keys = sorted_map["keys"]
+        pending = sorted_map["pending_keys"]
+        if not pending:
+            return _keys[0] if _keys else None
+        if not _keys or _less(sorted_map, pending[0], _keys[0]):
+            return pending[0]
+        return _keys[0]
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "get_min()")
+
+
+def get_max(sorted_map: dict) -> Any:
+    """Recupera la llave máxima del mapa."""
+    try:
+        _keys = sorted_map["keys"]
+        pending = sorted_map["pending_keys"]
+        if not pending:
+            return _keys[-1] if _keys else None
+        if not _keys or _less(sorted_map, _keys[-1], pending[-1]):
+            return pending[-1]
+        return _keys[-1]
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "get_max()")
+
+
+def delete_min(sorted_map: dict) -> dict:
+    """Elimina la llave mínima del mapa."""
+    try:
+        if not is_empty(sorted_map):
+            remove(sorted_map, get_min(sorted_map))
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "delete_min()")
+
+
+def delete_max(sorted_map: dict) -> dict:
+    """Elimina la llave máxima del mapa."""
+    try:
+        if not is_empty(sorted_map):
+            remove(sorted_map, get_max(sorted_map))
+        return sorted_map
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "delete_max()")
+
+
+def floor(sorted_map: dict, k: Any) -> Any:
+    """Retorna la mayor llave menor o igual a k (None si no hay)."""
+    try:
+        pos = _find(sorted_map, k, right=True)
+        found = sorted_map["keys"][pos - 1] if pos > 0 else None
+        ppos = _find_pending(sorted_map, k, right=True)
+        if ppos > 0:
+            candidate = sorted_map["pending_keys"][ppos - 1]
+            if found is None or _less(sorted_map, found, candidate):
+                found = candidate
+        return found
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "floor()")
+
+
+def ceiling(sorted_map: dict, k: Any) -> Any:
+    """Retorna la menor llave mayor o igual a k (None si no hay)."""
+    try:
+        _keys = sorted_map["keys"]
+        pending = sorted_map["pending_keys"]
+        pos = _find(sorted_map, k)
+        found = _keys[pos] if pos < len(_keys) else None
+        ppos = _find_pending(sorted_map, k)
+        if ppos < len(pending):
+            candidate = pending[ppos]
+            if found is None or _less(sorted_map, candidate, found):
+                found = candidate
+        return found
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "ceiling()")
+
+
+def select(sorted_map: dict, pos: int) -> Any:
+    """Retorna la llave en la posición pos (desde 0) o None si no existe.
+
+    La llave t del buffer está en la posición t + (llaves principales
+    menores a ella), que crece con t: una búsqueda binaria sobre el buffer
+    dice cuántas de sus llaves quedan antes de pos.
+    """
+    try:
+        if pos < 0 or pos >= size(sorted_map):
+            return None
+        _keys = sorted_map["keys"]
+        pending = sorted_map["pending_keys"]
+        if not pending:
+            return _keys[pos]
+        before = bisect_right(range(len(pending)), pos,
+                              key=lambda t: t + _find(sorted_map, pending[t]))
+        if before > 0 and before - 1 + _find(sorted_map, pending[before - 1]) == pos:
+            return pending[before - 1]
+        return _keys[pos - before]
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "select()")
+
+
+def rank(sorted_map: dict, k: Any) -> int:
+    """Retorna el número de llaves estrictamente menores a k."""
+    try:
+        return _find(sorted_map, k) + _find_pending(sorted_map, k)
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "rank()")
+
+
+def size_range(sorted_map: dict, lo: Any, hi: Any) -> int:
+    """Retorna el número de llaves en el rango [lo, hi]."""
+    try:
+        start, end = _bounds(sorted_map, sorted_map["keys"], lo, hi)
+        pstart, pend = _bounds(sorted_map, sorted_map["pending_keys"], lo, hi)
+        return end - start + pend - pstart
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "size_range()")
+
+
+def range_sum(sorted_map: dict, lo: Any, hi: Any) -> Any:
+    """Suma los pesos de las llaves en el rango [lo, hi].
+
+    Si el mapa no tiene función de peso, retorna el número de llaves en el
+    rango.
+    """
+    try:
+        fenwick = sorted_map["fenwick"]
+        if fenwick is None:
+            return size_range(sorted_map, lo, hi)
+        start, end = _bounds(sorted_map, sorted_map["keys"], lo, hi)
+        pstart, pend = _bounds(sorted_map, sorted_map["pending_keys"], lo, hi)
+        total = _fenwick_sum(fenwick, end) - _fenwick_sum(fenwick, start)
+        if pstart < pend:
+            total += sum(sorted_map["pending_weights"][pstart:pend])
+        return total
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "range_sum()")
+
+
+def _to_list(elements, cmp_func: Callable) -> dict:
+    result_lt = sllt.new_list(cmpfunction=cmp_func)
+    for element in elements:
+        sllt.add_last(result_lt, element)
+    return result_lt
+
+
+def keys(sorted_map: dict, lo: Any, hi: Any) -> dict:
+    """Retorna una lista con las llaves del rango [lo, hi], en orden."""
+    try:
+        return _to_list(iter_keys(sorted_map, lo, hi), sorted_map["cmp_func"])
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "keys()")
+
+
+def values(sorted_map: dict, lo: Any, hi: Any) -> dict:
+    """Retorna una lista con los valores de las llaves del rango [lo, hi]."""
+    try:
+        return _to_list(iter_values(sorted_map, lo, hi), sorted_map["cmp_func"])
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "values()")
+
+
+def key_set(sorted_map: dict) -> dict:
+    """Retorna una lista con todas las llaves del mapa, en orden."""
+    try:
+        return keys(sorted_map, None, None)
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "key_set()")
+
+
+def value_set(sorted_map: dict) -> dict:
+    """Retorna una lista con todos los valores del mapa, en orden de llave."""
+    try:
+        return values(sorted_map, None, None)
+    except Exception as exp:
+        error.reraise(exp, "sorted_array", "value_set()")
+
+
+def iter_keys(sorted_map: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las llaves del rango [lo, hi] (ver ``iter_items``)."""
+    return (k for k, _ in iter_items(sorted_map, lo, hi))
+
+
+def iter_values(sorted_map: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden de llave los valores del rango [lo, hi] (ver ``iter_items``)."""
+    return (v for _, v in iter_items(sorted_map, lo, hi))
+
+
+def iter_items(sorted_map: dict, lo: Any = None, hi: Any = None):
+    """Recorre en orden las parejas (llave, valor) del rango [lo, hi].
+
+    Es un iterador: el rango se ubica con búsqueda binaria en las listas
+    principales y en el buffer, y las parejas se producen a medida que se
+    piden, mezclando las dos partes por posición y sin copiarlas. Si lo o
+    hi son None, el rango no tiene límite por ese lado. El mapa no se debe
+    modificar mientras se recorre.
+    """
+    start, end = _bounds(sorted_map, sorted_map["keys"], lo, hi)
+    pstart, pend = _bounds(sorted_map, sorted_map["pending_keys"], lo, hi)
+    return _iter_range(sorted_map, start, end, pstart, pend)
+
+
+def _iter_range(sorted_map: dict, start: int, end: int, pstart: int, pend: int):
+    """Produce en orden las parejas de las posiciones [start, end) de las
+    listas principales y [pstart, pend) del buffer."""
+    _keys, _values = sorted_map["keys"], sorted_map["values"]
+    pending, pending_values = sorted_map["pending_keys"], sorted_map["pending_values"]
+    i, j = start, pstart
+    while i < end and j < pend:
+        if _less(sorted_map, pending[j], _keys[i]):
+            yield pending[j], pending_values[j]
+            j += 1
+        else:
+            yield _keys[i], _values[i]
+            i += 1
+    for i in range(i, end):
+        yield _keys[i], _values[i]
+    for j in range(j, pend):
+        yield pending[j], pending_values[j]
@@ -0,0 +1,510 @@
+"""
+Funciones auxiliares de los árboles de búsqueda (``binary_search_tree``,
+``red_black_tree`` y ``persistent_tree``).
+
+Los tres árboles usan nodos con la misma forma (``bst_node``): llave,
+valor, hijos y el tamaño, la altura y el peso de su subárbol. Aquí están
+los recorridos que no dependen de cómo se balancea el árbol (búsquedas,
+rangos, sumas de pesos, posiciones), el registro de operaciones y las
+estadísticas de la forma del árbol.
+
+Las funciones que reciben cmp_func comparan las llaves directamente con
+``==`` y ``<`` si cmp_func es None (ver ``native_cmp``).
+
+Las funciones ``split_llrb`` y ``join_llrb`` son para los árboles
+rojo-negro inclinados a la izquierda: reciben la función de balanceo del
+árbol y, en el árbol persistente, la función que copia un nodo antes de
+modificarlo.
+"""
+
+from collections import deque
+from operator import attrgetter
+from typing import Any, Callable
+
+from DataStructures.List import single_linked_list as sllt
+from DataStructures.Utils import error
+
+from .rbt_node import is_red, RED, BLACK
+
+
+# Datos guardados en cada nodo
+
+
+def node_size(node) -> int:
+    """Retorna el número de nodos del subárbol (0 si es vacío)."""
+    if node is None:
+        return 0
+    return node.size
+
+
+def node_weight(node) -> Any:
+    """Retorna la suma de los pesos del subárbol (0 si es vacío)."""
+    if node is None:
+        return 0
+    return node.weight
+
+
+def node_height(node) -> int:
+    """Retorna la altura guardada en el nodo (0 si es vacío)."""
+    if node is None:
+        return 0
+    return node.height
+
+
+def update_node(node, weight_func: Callable = None) -> None:
+    """Recalcula el tamaño, la altura y el peso del subárbol a partir de sus hijos."""
+    node.size = node_size(node.left) + node_size(node.right) + 1
+    _left_h = node_height(node.left)
+    _right_h = node_height(node.right)
+    node.height = (_left_h if _left_h > _right_h else _right_h) + 1
+    if weight_func is not None:
+        node.weight = (weight_func(node.value) + node_weight(node.left)
+                       + node_weight(node.right))
+
+
+def touch(tree: dict) -> None:
+    """Registra una modificación del árbol (ver ``version``)."""
+    tree["version"] = tree.get("version", 0) + 1
+
+
+node_key = attrgetter("key")
+node_value = attrgetter("value")
+node_item = attrgetter("key", "value")
+
+
+# Comparación de llaves
+
+
+def native_cmp(tree: dict) -> Callable:
+    """Retorna None si el árbol compara sus llaves directamente (ver
+    ``binary_search_tree.new_map``) o su función de comparación si no."""
+    if tree.get("native"):
+        return None
+    return tree["cmp_func"]
+
+
+def comparator(tree: dict) -> tuple:
+    """Retorna la función de comparación para una operación y, si el
+    registro de operaciones está activo, el contador de comparaciones.
+
+    La función es None si el árbol compara sus llaves directamente; el
+    registro de operaciones cuenta llamadas a cmp_func, así que cuando
+    está activo siempre se usa la función.
+    """
+    cmp_func = tree["cmp_func"]
+    if tree.get("op_log") is None:
+        return native_cmp(tree), None
+    counter = [0]
+
+    def _counting(key1, key2):
+        counter[0] += 1
+        return cmp_func(key1, key2)
+
+    return _counting, counter
+
+
+def record(tree: dict, operation: str, k: Any, counter: list) -> None:
+    """Agrega una operación al registro (si está activo)."""
+    if counter is not None:
+        tree["op_log"].append((operation, k, counter[0]))
+
+
+# Búsquedas
+
+
+def find_node(node, k: Any, cmp_func: Callable):
+    """Busca el nodo con la llave k en el subárbol (None si no está)."""
+    if cmp_func is None:
+        while node is not None:
+            key = node.key
+            if k == key:
+                return node
+            node = node.left if k < key else node.right
+        return None
+    while node is not None:
+        _cmp = cmp_func(k, node.key)
+        if _cmp == 0:
+            return node
+        node = node.left if _cmp < 0 else node.right
+    return None
+
+
+def find_path(node, k: Any, cmp_func: Callable) -> list:
+    """Retorna los nodos del camino desde node hasta el nodo con la llave
+    k (incluido), o None si k no está en el subárbol."""
+    path = []
+    while node is not None:
+        path.append(node)
+        if cmp_func is None:
+            key = node.key
+            if k == key:
+                return path
+            node = node.left if k < key else node.right
+            continue
+        _cmp = cmp_func(k, node.key)
+        if _cmp == 0:
+            return path
+        node = node.left if _cmp < 0 else node.right
+    return None
+
+
+def value_delta(node, weight_func: Callable) -> Any:
+    """Retorna cuánto cambió el peso del valor del nodo desde que se
+    calculó el peso del subárbol (por ejemplo, después de modificar el
+    valor en sitio)."""
+    return weight_func(node.value) - (node.weight - node_weight(node.left)
+                                      - node_weight(node.right))
+
+
+def add_weight(path: list, delta: Any) -> None:
+    """Suma delta al peso de los nodos del camino. Sirve cuando cambia el
+    peso de un solo valor: el tamaño y la altura de los nodos no cambian,
+    así que no hace falta recalcularlos."""
+    if delta:
+        for node in path:
+            node.weight += delta
+
+
+def min_node(node):
+    """Retorna el nodo con la llave mínima del subárbol."""
+    if node is None:
+        return None
+    while node.left is not None:
+        node = node.left
+    return node
+
+
+def max_node(node):
+    """Retorna el nodo con la llave máxima del subárbol."""
+    if node is None:
+        return None
+    while node.right is not None:
+        node = node.right
+    return node
+
+
+def floor_key(node, k: Any, cmp_func: Callable) -> Any:
+    """Retorna la mayor llave del subárbol menor o igual a k (None si no hay)."""
+    _floor = None
+    while node is not None:
+        if cmp_func is None:
+            _cmp = 0 if k == node.key else (-1 if k < node.key else 1)
+        else:
+            _cmp = cmp_func(k, node.key)
+        if _cmp == 0:
+            return node.key
+        if _cmp < 0:
+            node = node.left
+        else:
+            _floor = node.key
+            node = node.right
+    return _floor
+
+
+def ceiling_key(node, k: Any, cmp_func: Callable) -> Any:
+    """Retorna la menor llave del subárbol mayor o igual a k (None si no hay)."""
+    _ceiling = None
+    while node is not None:
+        if cmp_func is None:
+            _cmp = 0 if k == node.key else (-1 if k < node.key else 1)
+        else:
+            _cmp = cmp_func(k, node.key)
+        if _cmp == 0:
+            return node.key
+        if _cmp > 0:
+            node = node.right
+        else:
+            _ceiling = node.key
+            node = node.left
+    return _ceiling
+
+
+def select_key(node, pos: int) -> Any:
+    """Retorna la llave en la posición pos (desde 0) del subárbol, o None
+    si pos no está entre 0 y su tamaño - 1."""
+    if pos < 0 or pos >= node_size(node):
+        return None
+    while node is not None:
+        _left = node_size(node.left)
+        if pos < _left:
+            node = node.left
+        elif pos > _left:
+            pos -= _left + 1
+            node = node.right
+        else:
+            return node.key
+    return None
+
+
+# Rangos
+
+
+def sum_below(node, k: Any, cmp_func: Callable, weight_func: Callable,
+              inclusive: bool) -> Any:
+    """Suma los pesos de las llaves menores a k (o iguales si inclusive).
+
+    Usa los pesos acumulados en los nodos: recorre un solo camino. Si
+    weight_func es None cada nodo pesa 1 (cuenta las llaves).
+    """
+    total = 0
+    while node is not None:
+        if cmp_func is None:
+            key = node.key
+            _cmp = 0 if k == key else (-1 if k < key else 1)
+        else:
+            _cmp = cmp_func(k, node.key)
+        if _cmp < 0:
+            node = node.left
+            continue
+        if weight_func is None:
+            _left, _own = node_size(node.left), 1
+        else:
+            _left, _own = node_weight(node.left), weight_func(node.value)
+        if _cmp > 0:
+            total += _left + _own
+            node = node.right
+        else:
+            total += _left + (_own if inclusive else 0)
+            break
+    return total
+
+
+def iter_nodes(node, lo: Any, hi: Any, cmp_func: Callable):
+    """Generador de los nodos del subárbol con llaves en el rango [lo, hi],
+    en orden. Usa una pila explícita en lugar de recursión; si lo o hi son
+    None, el rango no tiene límite por ese lado."""
+    stack = []
+    while stack or node is not None:
+        if node is not None:
+            if lo is not None and (lo > node.key if cmp_func is None
+                                   else cmp_func(lo, node.key) > 0):
+                # El nodo y su subárbol izquierdo están antes de lo
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        else:
+            node = stack.pop()
+            if hi is not None and (hi < node.key if cmp_func is None
+                                   else cmp_func(hi, node.key) < 0):
+                return
+            yield node
+            node = node.right
+
+
+def add_range(node, result_lt: dict, cmp_func: Callable, lo: Any, hi: Any,
+              field: str) -> None:
+    """Agrega a la lista el campo dado (``"key"`` o ``"value"``) de los
+    nodos con llaves en el rango [lo, hi], en orden."""
+    if node is None:
+        return
+    if cmp_func(lo, node.key) < 0:
+        add_range(node.left, result_lt, cmp_func, lo, hi, field)
+    if cmp_func(lo, node.key) <= 0 and cmp_func(hi, node.key) >= 0:
+        sllt.add_last(result_lt, getattr(node, field))
+    if cmp_func(hi, node.key) > 0:
+        add_range(node.right, result_lt, cmp_func, lo, hi, field)
+
+
+def add_all(node, result_lt: dict, field: str) -> None:
+    """Agrega a la lista el campo dado de todos los nodos del subárbol, en orden."""
+    if node is None:
+        return
+    add_all(node.left, result_lt, field)
+    sllt.add_last(result_lt, getattr(node, field))
+    add_all(node.right, result_lt, field)
+
+
+# División y unión de árboles rojo-negro
+
+
+def black_height(node) -> int:
+    """Número de nodos negros de cualquier camino desde node hasta un
+    subárbol vacío (cuenta node si es negro)."""
+    height = 0
+    while node is not None:
+        if node.color == BLACK:
+            height += 1
+        node = node.left
+    return height
+
+
+def join_llrb(left, left_bh: int, node, right, right_bh: int,
+              weight_func: Callable, balance: Callable,
+              copy: Callable = None) -> tuple:
+    """Une los subárboles left y right usando node como llave intermedia
+    (las llaves de left son menores que la de node y las de right
+    mayores). left_bh y right_bh son sus alturas negras.
+
+    Baja por el borde derecho (o izquierdo) del subárbol más alto hasta
+    la altura negra del otro, cuelga ahí node como enlace rojo y balancea
+    el camino de regreso: O(|left_bh - right_bh| + 1). node se modifica
+    (en el árbol persistente debe ser una copia).
+
+    Returns:
+        tuple: (raíz negra del árbol unido, su altura negra)
+    """
+    if is_red(left):
+        left = copy(left) if copy is not None else left
+        left.color = BLACK
+        left_bh += 1
+    if is_red(right):
+        right = copy(right) if copy is not None else right
+        right.color = BLACK
+        right_bh += 1
+    if left_bh >= right_bh:
+        root = _join_right(left, left_bh, node, right, right_bh,
+                           weight_func, balance, copy)
+    else:
+        root = _join_left(right, right_bh, node, left, left_bh,
+                          weight_func, balance, copy)
+    root_bh = max(left_bh, right_bh)
+    if is_red(root):
+        root = copy(root) if copy is not None else root
+        root.color = BLACK
+        root_bh += 1
+    return root, root_bh
+
+
+def _join_right(tree, tree_bh: int, node, right, right_bh: int,
+                weight_func: Callable, balance: Callable, copy: Callable):
+    """Cuelga node (con right como hijo derecho) en el borde derecho de
+    tree, cuyos nodos son negros (los enlaces rojos se inclinan a la
+    izquierda)."""
+    if tree_bh == right_bh:
+        node.color = RED
+        node.left = tree
+        node.right = right
+        update_node(node, weight_func)
+        return node
+    tree = copy(tree) if copy is not None else tree
+    tree.right = _join_right(tree.right, tree_bh - 1, node, right, right_bh,
+                             weight_func, balance, copy)
+    return balance(tree, weight_func)
+
+
+def _join_left(tree, tree_bh: int, node, left, left_bh: int,
+               weight_func: Callable, balance: Callable, copy: Callable):
+    """Cuelga node (con left como hijo izquierdo) en el borde izquierdo de
+    tree, sobre el primer nodo negro con la altura negra de left."""
+    if tree_bh == left_bh and not is_red(tree):
+        node.color = RED
+        node.left = left
+        node.right = tree
+        update_node(node, weight_func)
+        return node
+    tree = copy(tree) if copy is not None else tree
+    child_bh = tree_bh if is_red(tree) else tree_bh - 1
+    tree.left = _join_left(tree.left, child_bh, node, left, left_bh,
+                           weight_func, balance, copy)
+    return balance(tree, weight_func)
+
+
+def split_llrb(node, node_bh: int, k: Any, cmp_func: Callable,
+               inclusive: bool, weight_func: Callable, balance: Callable,
+               copy: Callable = None) -> tuple:
+    """Divide el subárbol en las llaves menores a k (o iguales si
+    inclusive) y el resto.
+
+    Baja por el camino hasta k y en cada nivel une, con ``join_llrb``,
+    las partes que quedan a cada lado. Las alturas negras de las uniones
+    crecen a lo largo del camino, así que el costo total es O(altura).
+
+    Returns:
+        tuple: (menores, su altura negra, resto, su altura negra)
+    """
+    if node is None:
+        return None, 0, None, 0
+    child_bh = node_bh if is_red(node) else node_bh - 1
+    _cmp = cmp_func(k, node.key)
+    middle = copy(node) if copy is not None else node
+    if _cmp > 0 or (_cmp == 0 and inclusive):
+        _left, _left_bh, _right, _right_bh = split_llrb(
+            node.right, child_bh, k, cmp_func, inclusive, weight_func,
+            balance, copy)
+        _left, _left_bh = join_llrb(node.left, child_bh, middle, _left,
+                                    _left_bh, weight_func, balance, copy)
+        return _left, _left_bh, _right, _right_bh
+    _left, _left_bh, _right, _right_bh = split_llrb(
+        node.left, child_bh, k, cmp_func, inclusive, weight_func, balance,
+        copy)
+    _right, _right_bh = join_llrb(_right, _right_bh, middle, node.right,
+                                  child_bh, weight_func, balance, copy)
+    return _left, _left_bh, _right, _right_bh
+
+
+# Estadísticas de la forma del árbol
+
+
+def enable_op_log(tree: dict, log_size: int = 1000) -> dict:
+    """Guarda el número de comparaciones de las últimas log_size
+    operaciones (put, get, remove, contains) del árbol.
+
+    Con log_size igual a 0 se deja de registrar. Registrar tiene un costo
+    en cada operación, por eso está apagado por defecto.
+    """
+    try:
+        tree["op_log"] = deque(maxlen=log_size) if log_size > 0 else None
+        return tree
+    except Exception as exp:
+        error.reraise(exp, "tree_functions", "enable_op_log()")
+
+
+def stats(tree: dict) -> dict:
+    """Retorna un reporte de la forma del árbol.
+
+    Incluye el número de llaves, la altura, la altura mínima posible con
+    ese número de llaves, un histograma de profundidades (cuántos nodos hay
+    en cada nivel, la raíz está en el nivel 1) y la longitud promedio y
+    máxima del camino de una búsqueda exitosa (número de nodos visitados).
+    Si el registro de operaciones está activo (ver ``enable_op_log``),
+    incluye también las comparaciones de las últimas operaciones.
+
+    Recorre todo el árbol: O(n).
+    """
+    try:
+        histogram = {}
+        total_depth = 0
+        stack = []
+        if tree["root"] is not None:
+            stack.append((tree["root"], 1))
+        while stack:
+            node, depth = stack.pop()
+            histogram[depth] = histogram.get(depth, 0) + 1
+            total_depth += depth
+            if node.left is not None:
+                stack.append((node.left, depth + 1))
+            if node.right is not None:
+                stack.append((node.right, depth + 1))
+        n = node_size(tree["root"])
+        report = {
+            "size": n,
+            "height": node_height(tree["root"]),
+            "optimal_height": n.bit_length(),
+            "depth_histogram": dict(sorted(histogram.items())),
+            "avg_search_path": total_depth / n if n > 0 else 0.0,
+            "max_search_path": max(histogram) if histogram else 0,
+            "operations": None,
+        }
+        op_log = tree.get("op_log")
+        if op_log is not None:
+            by_operation = {}
+            for operation, k, comparisons in op_log:
+                entry = by_operation.setdefault(operation, [0, 0, 0])
+                entry[0] += 1
+                entry[1] += comparisons
+                entry[2] = max(entry[2], comparisons)
+            report["operations"] = {
+                "count": len(op_log),
+                "avg_comparisons": (sum(op[2] for op in op_log) / len(op_log)
+                                    if op_log else 0.0),
+                "max_comparisons": max((op[2] for op in op_log), default=0),
+                "by_operation": {
+                    operation: {"count": entry[0],
+                                "avg_comparisons": entry[1] / entry[0],
+                                "max_comparisons": entry[2]}
+                    for operation, entry in by_operation.items()},
+            }
+        return report
+    except Exception as exp:
+        error.reraise(exp, "tree_functions", "stats()")